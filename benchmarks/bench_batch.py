@@ -0,0 +1,65 @@
+"""
+Compare `tokenize_batch` with a `tokenize` call per text, on
+short strings (query or title-like pieces of a few words) cut
+from the synthetic corpora of `generators.py`.
+
+Usage
+-----
+
+> python benchmarks/bench_batch.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from ciseau import tokenize, tokenize_batch
+from generators import GENERATORS
+
+WORDS_PER_TEXT = [(2, 4), (4, 8), (8, 16)]
+
+
+def short_texts(text, min_words, max_words, seed=0):
+    rng = random.Random(seed)
+    words = text.split()
+    texts = []
+    position = 0
+    while position < len(words):
+        num_words = rng.randint(min_words, max_words)
+        texts.append(" ".join(words[position:position + num_words]))
+        position += num_words
+    return texts
+
+
+def best_time(function, repeats=5):
+    best = None
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    print("%-20s %8s %8s %16s %14s %8s" % (
+        "corpus", "words", "texts", "tokenize (us)", "batch (us)", "speedup"
+    ))
+    for name, generator in sorted(GENERATORS.items()):
+        text = generator(200000)
+        for min_words, max_words in WORDS_PER_TEXT:
+            texts = short_texts(text, min_words, max_words)
+            if [tokenize(piece) for piece in texts] != tokenize_batch(texts):
+                raise AssertionError("tokenize_batch differs from tokenize on %s" % (name,))
+            single = best_time(lambda: [tokenize(piece) for piece in texts])
+            batch = best_time(lambda: tokenize_batch(texts))
+            print("%-20s %8s %8d %16.2f %14.2f %7.2fx" % (
+                name, "%d-%d" % (min_words, max_words), len(texts),
+                1e6 * single / len(texts), 1e6 * batch / len(texts), single / batch
+            ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Measure the cold start cost of ciseau: the time taken by
+`import ciseau` in a fresh interpreter, and by the first call to
+each entry point (which imports and compiles what it needs).
+Every measurement runs in a new process, and the best of
+several runs is reported.
+
+Usage
+-----
+
+> python benchmarks/bench_import.py
+"""
+import os
+import subprocess
+import sys
+
+PACKAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+TEXT = "Mr. Smith visited [[Paris|the capital]] in 2019. He liked it."
+
+STATEMENTS = [
+    ("import ciseau", ""),
+    ("first tokenize", "ciseau.tokenize(%r)" % (TEXT,)),
+    ("first sent_tokenize", "ciseau.sent_tokenize(%r)" % (TEXT,)),
+    ("first to_raw_text", "ciseau.to_raw_text(%r)" % (TEXT,)),
+    ("first tokenize_many", "ciseau.tokenize_many([%r], processes=1)" % (TEXT,))
+]
+
+PROGRAM = """
+import time
+t0 = time.perf_counter()
+import ciseau
+%s
+print(time.perf_counter() - t0)
+"""
+
+
+def time_cold_start(statement, repeats=7):
+    best = float("inf")
+    for _ in range(repeats):
+        out = subprocess.check_output(
+            [sys.executable, "-c", PROGRAM % (statement,)],
+            cwd=PACKAGE_DIR
+        )
+        best = min(best, float(out.decode("utf-8").strip()))
+    return best
+
+
+def main():
+    print("%-22s %12s" % ("", "ms"))
+    for name, statement in STATEMENTS:
+        print("%-22s %12.1f" % (name, 1e3 * time_cold_start(statement)))
+
+
+if __name__ == "__main__":
+    main()
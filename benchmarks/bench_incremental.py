@@ -0,0 +1,46 @@
+"""
+Compare the time of `retokenize` after a small edit with a full
+`sent_tokenize_document` of the edited text, on the synthetic
+corpora of `generators.py`.
+
+Usage
+-----
+
+> python benchmarks/bench_incremental.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from ciseau import sent_tokenize_document, retokenize
+from generators import GENERATORS
+
+EDITS = ["a", "the ", " ", ". It ", ", "]
+
+
+def time_edits(text, num_edits, seed=0):
+    rng = random.Random(seed)
+    document = sent_tokenize_document(text)
+    t0 = time.perf_counter()
+    for _ in range(num_edits):
+        start = rng.randrange(len(document.text))
+        document = retokenize(document, start, start + rng.choice([0, 1]), rng.choice(EDITS))
+    return (time.perf_counter() - t0) / num_edits, document
+
+
+def main():
+    print("%-20s %10s %12s %12s" % ("corpus", "sentences", "full (ms)", "edit (ms)"))
+    for name, generator in sorted(GENERATORS.items()):
+        text = generator(200000)
+        edit, document = time_edits(text, 50)
+        t0 = time.perf_counter()
+        sent_tokenize_document(document.text)
+        full = time.perf_counter() - t0
+        print("%-20s %10d %12.1f %12.2f" % (name, len(document), 1e3 * full, 1e3 * edit))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Measure how `group_quoted_tokens` scales with the number of
+tokens in a document. The time per token should stay roughly
+constant as documents grow (linear total runtime).
+
+Usage
+-----
+
+> python benchmarks/bench_quoted_expressions.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from ciseau.quoted_expressions import group_quoted_tokens
+
+
+def quote_heavy_tokens(num_tokens):
+    """
+    Build a token list that mixes properly paired quotes,
+    parentheticals, and ambiguous spaced '"' symbols (the
+    case that requires counting the remaining quotes).
+    """
+    pattern = [
+        "He ", "said ", '" ', "hello ", '" ', "and ", "(", "left", ") ",
+        "then ", '"', "bye", '" ', "again", ". "
+    ]
+    tokens = []
+    while len(tokens) < num_tokens:
+        tokens.extend(pattern)
+    return tokens[:num_tokens]
+
+
+def time_grouping(tokens, repeats=3):
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        group_quoted_tokens(tokens)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    print("%10s %12s %16s" % ("tokens", "seconds", "usec / token"))
+    for num_tokens in (1000, 4000, 16000, 64000, 256000):
+        elapsed = time_grouping(quote_heavy_tokens(num_tokens))
+        print("%10d %12.4f %16.3f" % (num_tokens, elapsed, 1e6 * elapsed / num_tokens))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Compare what worker processes send back to the parent with
+`sent_tokenize_many` (pickled token strings) and with
+`sent_tokenize_compact_many` (offsets written to shared memory),
+along with the time of both, on documents cut from the synthetic
+corpora of `generators.py`.
+
+Usage
+-----
+
+> python benchmarks/bench_shared.py [processes]
+"""
+import os
+import pickle
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from ciseau import sent_tokenize_many, sent_tokenize_compact_many
+from ciseau.parallel import (
+    _tokenize_batch,
+    _sent_tokenize_offsets_batch,
+    batch_texts
+)
+from generators import GENERATORS
+
+DOCUMENT_CHARACTERS = 2000
+CHUNKSIZE = 64
+
+
+def documents(text):
+    return [text[start:start + DOCUMENT_CHARACTERS]
+            for start in range(0, len(text), DOCUMENT_CHARACTERS)]
+
+
+def result_bytes(texts):
+    # bytes sent back for each batch: pickled sentences, and the
+    # pickled message along with the shared memory block:
+    strings = 0
+    offsets = 0
+    for batch in batch_texts(texts, CHUNKSIZE):
+        strings += len(pickle.dumps(_tokenize_batch("sent_tokenize", {}, batch)))
+        key, data = _sent_tokenize_offsets_batch({}, (0, None, "I", batch))
+        offsets += len(pickle.dumps((key, None))) + len(data)
+    return strings, offsets
+
+
+def best_time(function, repeats=3):
+    best = None
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    processes = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+    print("%-20s %10s %14s %14s %12s %12s" % (
+        "corpus", "tokens", "strings (B/t)", "offsets (B/t)", "many (s)", "compact (s)"
+    ))
+    for name, generator in sorted(GENERATORS.items()):
+        texts = documents(generator(2000000))
+        num_tokens = sum(
+            sentences.num_tokens()
+            for sentences in sent_tokenize_compact_many(texts, processes=1)
+        )
+        strings, offsets = result_bytes(texts)
+        many = best_time(lambda: sum(
+            1 for _ in sent_tokenize_many(texts, processes=processes, chunksize=CHUNKSIZE)
+        ))
+        compact = best_time(lambda: sum(
+            1 for _ in sent_tokenize_compact_many(texts, processes=processes,
+                                                  chunksize=CHUNKSIZE)
+        ))
+        print("%-20s %10d %14.2f %14.2f %12.3f %12.3f" % (
+            name, num_tokens, strings / num_tokens, offsets / num_tokens, many, compact
+        ))
+
+
+if __name__ == "__main__":
+    main()
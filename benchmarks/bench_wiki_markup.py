@@ -0,0 +1,52 @@
+"""
+Measure the time spent in each markup removal step of
+`to_raw_text`, on the wikipedia-like article used by the
+tests (repeated to make timings stable).
+
+Usage
+-----
+
+> python benchmarks/bench_wiki_markup.py
+"""
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from ciseau.wiki_markup_processing import raw_text_steps
+from ciseau.sentence_tokenizer import sent_tokenize
+
+
+def load_article(repeats=20):
+    with io.open(os.path.join(ROOT, "tests", "data", "wiki_article.txt"), encoding="utf-8") as fin:
+        return fin.read() * repeats
+
+
+def time_steps(text, repeats=3):
+    best = [float("inf")] * len(raw_text_steps)
+    for _ in range(repeats):
+        out = text
+        for i, (_, regex, replacement) in enumerate(raw_text_steps):
+            t0 = time.perf_counter()
+            out = regex.sub(replacement, out)
+            best[i] = min(best[i], time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    text = load_article()
+    best, out = time_steps(text)
+    print("%10s  %s" % ("msec", "step"))
+    for (name, _, _), elapsed in zip(raw_text_steps, best):
+        print("%10.3f  %s" % (1e3 * elapsed, name))
+    t0 = time.perf_counter()
+    sent_tokenize(out)
+    print("%10.3f  markup removal (%d characters)" % (1e3 * sum(best), len(text)))
+    print("%10.3f  sent_tokenize" % (1e3 * (time.perf_counter() - t0)))
+
+
+if __name__ == "__main__":
+    main()
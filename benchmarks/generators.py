@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+Synthetic text generators for the benchmarks. Each generator
+is deterministic for a given seed and returns a string of at
+least `size` characters, built to stress a different part of
+the tokenizer.
+"""
+import random
+
+WORDS = (
+    "the of and in to a was is for on as by with he that at from his it an "
+    "were are which this also be has or had first one their its new after "
+    "but who not they have her she two been other when there all during "
+    "into school time may years more most only over city some world would "
+    "where later up such used many can state about national out known "
+    "university united then made government market report company people"
+).split()
+NAMES = (
+    "Paris France London John Smith Thames Europe Berlin Germany Einstein "
+    "Marie Curie Nobel Reuters Washington Obama Merkel Tokyo Beijing"
+).split()
+ABBREVIATIONS = [
+    "Mr.", "Mrs.", "Dr.", "Prof.", "St.", "Gen.", "Sen.", "Jan.", "Feb.",
+    "Aug.", "Sept.", "No.", "vs.", "etc.", "e.g.", "i.e.", "U.S.", "U.K.",
+    "Inc.", "Corp.", "Ltd.", "a.m.", "p.m.", "J.", "R.", "Ph.D."
+]
+TLDS = ["com", "org", "net", "io", "co.uk", "de", "fr"]
+
+
+def _words(rng, count):
+    return " ".join(
+        rng.choice(NAMES) if rng.random() < 0.12 else rng.choice(WORDS)
+        for _ in range(count)
+    )
+
+
+def _sentence(rng, parts):
+    words = [_words(rng, rng.randint(3, 8)).capitalize()]
+    for _ in range(rng.randint(1, 4)):
+        words.append(parts(rng))
+    return " ".join(words) + rng.choice([".", ".", ".", "!", "?"])
+
+
+def _build(rng, size, sentence, separator=" "):
+    pieces = []
+    length = 0
+    while length < size:
+        piece = sentence(rng)
+        pieces.append(piece)
+        length += len(piece) + len(separator)
+        if rng.random() < 0.15:
+            pieces.append("\n\n")
+    return separator.join(pieces)
+
+
+def _news_part(rng):
+    choice = rng.random()
+    if choice < 0.15:
+        return "%d,%03d" % (rng.randint(1, 999), rng.randint(0, 999))
+    if choice < 0.25:
+        return "%d.%d%%" % (rng.randint(0, 99), rng.randint(0, 9))
+    if choice < 0.35:
+        return "(%s)" % _words(rng, rng.randint(1, 4))
+    if choice < 0.45:
+        return "%s, %s said," % (_words(rng, 2), rng.choice(NAMES))
+    if choice < 0.5:
+        return "%s's %s" % (rng.choice(NAMES), rng.choice(WORDS))
+    return _words(rng, rng.randint(2, 7)) + rng.choice(["", ",", ";", " --"])
+
+
+def news_text(size, seed=0):
+    """
+    Newswire-like prose: numbers, percentages, parentheticals,
+    possessives and reported speech.
+    """
+    rng = random.Random(seed)
+    return _build(rng, size, lambda rng: _sentence(rng, _news_part))
+
+
+def _quote_part(rng):
+    words = _words(rng, rng.randint(1, 5))
+    choice = rng.random()
+    if choice < 0.2:
+        return u'"%s"' % words
+    if choice < 0.35:
+        return u"“%s”" % words
+    if choice < 0.45:
+        return u"‘%s’" % words
+    if choice < 0.55:
+        return u"'%s'" % words
+    if choice < 0.62:
+        return u"« %s »" % words
+    if choice < 0.72:
+        return u"``%s''" % words
+    if choice < 0.82:
+        return u'(%s "%s" %s)' % (_words(rng, 2), words, _words(rng, 1))
+    if choice < 0.9:
+        return u'" %s' % words
+    return words
+
+
+def quote_heavy_text(size, seed=0):
+    """
+    Dialogue with many (sometimes unbalanced) straight, curly
+    and angled quotes nested in parentheticals.
+    """
+    rng = random.Random(seed)
+    return _build(rng, size, lambda rng: _sentence(rng, _quote_part))
+
+
+def _url_part(rng):
+    choice = rng.random()
+    domain = "%s%s.%s" % (rng.choice(WORDS), rng.choice(WORDS), rng.choice(TLDS))
+    if choice < 0.3:
+        return "http://www.%s/%s/%s?id=%d" % (domain, rng.choice(WORDS), rng.choice(WORDS), rng.randint(1, 9999))
+    if choice < 0.45:
+        return "https://%s/%s.html" % (domain, rng.choice(WORDS))
+    if choice < 0.6:
+        return "%s@%s" % (rng.choice(WORDS), domain)
+    if choice < 0.75:
+        return "%s_%d.%s" % (rng.choice(WORDS), rng.randint(1, 99), rng.choice(["pdf", "txt", "csv", "py"]))
+    if choice < 0.85:
+        return "www.%s" % domain
+    return _words(rng, rng.randint(2, 5))
+
+
+def url_heavy_text(size, seed=0):
+    """
+    Technical prose with urls, email addresses, domains and
+    file names.
+    """
+    rng = random.Random(seed)
+    return _build(rng, size, lambda rng: _sentence(rng, _url_part))
+
+
+def _abbreviation_part(rng):
+    choice = rng.random()
+    if choice < 0.35:
+        return "%s %s" % (rng.choice(ABBREVIATIONS), rng.choice(NAMES))
+    if choice < 0.5:
+        return "%s %s" % (rng.choice(ABBREVIATIONS), rng.choice(WORDS))
+    if choice < 0.6:
+        return "on %s %d" % (rng.choice(["Jan.", "Feb.", "Aug.", "Sept.", "Oct."]), rng.randint(1, 28))
+    if choice < 0.7:
+        return "%s. %s. %s" % (rng.choice("ABCDEFGHJKLMNPRST"), rng.choice("ABCDEFGHJKLMNPRST"), rng.choice(NAMES))
+    if choice < 0.8:
+        return "at %d p.m." % rng.randint(1, 12)
+    return _words(rng, rng.randint(2, 5))
+
+
+def abbreviation_heavy_text(size, seed=0):
+    """
+    Prose full of titles, initials, dates and latin
+    abbreviations whose periods do not end sentences.
+    """
+    rng = random.Random(seed)
+    return _build(rng, size, lambda rng: _sentence(rng, _abbreviation_part))
+
+
+def _wiki_part(rng):
+    choice = rng.random()
+    if choice < 0.12:
+        return "[[%s]]" % rng.choice(NAMES)
+    if choice < 0.22:
+        return "[[%s|%s]]" % (_words(rng, 2), _words(rng, rng.randint(1, 3)))
+    if choice < 0.27:
+        return "'''%s'''" % _words(rng, rng.randint(1, 3))
+    if choice < 0.32:
+        return "''%s''" % _words(rng, rng.randint(1, 3))
+    if choice < 0.38:
+        return "<ref>{{cite web|url=http://www.example.com/%s|title=%s|accessdate=%d-%02d-%02d}}</ref>" % (
+            rng.choice(WORDS), _words(rng, 3), rng.randint(1990, 2015), rng.randint(1, 12), rng.randint(1, 28)
+        )
+    if choice < 0.42:
+        return "<ref name=\"%s%d\" />" % (rng.choice(WORDS), rng.randint(1, 9))
+    if choice < 0.46:
+        return "in %d" % rng.randint(1000, 2015)
+    if choice < 0.49:
+        return "{{convert|%d|km|mi}}" % rng.randint(1, 500)
+    if choice < 0.52:
+        return "[http://www.%s.org/%s %s]" % (rng.choice(WORDS), rng.choice(WORDS), _words(rng, 2))
+    if choice < 0.54:
+        return "<math>x^%d + y < z</math>" % rng.randint(2, 9)
+    if choice < 0.57:
+        return "&nbsp;%d&nbsp;km" % rng.randint(1, 99)
+    return _words(rng, rng.randint(1, 4))
+
+
+def _wiki_block(rng):
+    choice = rng.random()
+    if choice < 0.1:
+        return "\n== %s ==\n" % _words(rng, 2).title()
+    if choice < 0.2:
+        return "\n".join("* " + _sentence(rng, _wiki_part) for _ in range(rng.randint(2, 5)))
+    if choice < 0.25:
+        return "{| class=\"wikitable\"\n|-\n! %s !! %s\n|-\n| %s || %d\n|}" % (
+            _words(rng, 1), _words(rng, 1), rng.choice(NAMES), rng.randint(1, 1000)
+        )
+    if choice < 0.3:
+        return "{{Infobox %s\n| name = %s\n| born = %d\n}}" % (
+            rng.choice(WORDS), rng.choice(NAMES), rng.randint(1800, 2000)
+        )
+    if choice < 0.33:
+        return "[[Category:%s]]" % _words(rng, 2)
+    return " ".join(_sentence(rng, _wiki_part) for _ in range(rng.randint(2, 6)))
+
+
+def wiki_markup_text(size, seed=0):
+    """
+    Wikipedia article source: links, emphasis, references,
+    templates, tables, lists and headings.
+    """
+    rng = random.Random(seed)
+    return _build(rng, size, _wiki_block, separator="\n\n")
+
+
+GENERATORS = {
+    "news": news_text,
+    "quote_heavy": quote_heavy_text,
+    "url_heavy": url_heavy_text,
+    "abbreviation_heavy": abbreviation_heavy_text,
+    "wiki_markup": wiki_markup_text
+}
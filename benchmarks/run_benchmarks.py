@@ -0,0 +1,235 @@
+"""
+Throughput and memory benchmarks for the public entry points of
+ciseau, on synthetic corpora (see `generators.py`).
+
+For every corpus and entry point this reports characters and
+tokens processed per second (best of several runs), and the peak
+memory allocated during a call (measured with tracemalloc). The
+results are compared against a stored baseline, and the script
+exits with status 1 when something got slower or hungrier than
+the tolerance allows.
+
+Throughput depends on the machine and its load, so a fixed
+calibration workload is timed between runs; speeds are compared
+after scaling by it.
+
+Usage
+-----
+
+> python benchmarks/run_benchmarks.py                  # compare to baseline.json
+> python benchmarks/run_benchmarks.py --save baseline  # record a new baseline
+> python benchmarks/run_benchmarks.py --only wiki_markup/to_raw_text
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import re
+import sys
+import time
+import tracemalloc
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, ".."))
+
+from ciseau import (
+    tokenize,
+    sent_tokenize,
+    tokenize_offsets,
+    sent_tokenize_offsets,
+    iter_sentences,
+    to_raw_text,
+    to_raw_text_markupless,
+    to_raw_text_pairings
+)
+from generators import GENERATORS, news_text
+
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baseline.json")
+# allowed slack on peak memory on top of the relative tolerance:
+MEMORY_SLACK_KB = 64
+
+
+def _count_words(result):
+    return len(result)
+
+
+def _count_sentence_words(result):
+    return sum(len(sentence) for sentence in result)
+
+
+ENTRY_POINTS = [
+    ("tokenize", tokenize, _count_words),
+    ("sent_tokenize", sent_tokenize, _count_sentence_words),
+    ("tokenize_offsets", tokenize_offsets, lambda offsets: len(offsets) // 2),
+    ("sent_tokenize_offsets", sent_tokenize_offsets, lambda result: len(result[0]) // 2),
+    ("iter_sentences", lambda text: list(iter_sentences(text)), _count_sentence_words),
+    ("to_raw_text", to_raw_text, _count_sentence_words),
+    ("to_raw_text_markupless", to_raw_text_markupless, _count_sentence_words),
+    ("to_raw_text_pairings", lambda text: list(to_raw_text_pairings(text)), _count_sentence_words)
+]
+
+
+CALIBRATION_TEXT = news_text(20000, seed=1)
+CALIBRATION_PATTERN = re.compile(r"\w+|[^\w\s]+")
+
+
+def calibration_workload():
+    """
+    Time a fixed mix of regex scanning and python-level work,
+    used to compare speeds measured on different machines (or
+    under different loads).
+    """
+    t0 = time.perf_counter()
+    counts = {}
+    for word in CALIBRATION_PATTERN.findall(CALIBRATION_TEXT):
+        key = word.lower()
+        counts[key] = counts.get(key, 0) + 1
+    return time.perf_counter() - t0
+
+
+def measure(function, count_tokens, text, repeats):
+    """
+    Best wall time of `repeats` calls, their median speed relative
+    to the calibration workload (run before each call, so that both
+    see the same machine load), the number of tokens produced, and
+    the peak memory allocated during one call.
+    """
+    best = float("inf")
+    normalized_speeds = []
+    for _ in range(repeats):
+        gc.collect()
+        calibration = calibration_workload()
+        t0 = time.perf_counter()
+        result = function(text)
+        elapsed = time.perf_counter() - t0
+        best = min(best, elapsed)
+        # characters per unit of calibration work:
+        normalized_speeds.append(len(text) / elapsed * calibration)
+    normalized_speeds.sort()
+    num_tokens = count_tokens(result)
+    del result
+    gc.collect()
+    tracemalloc.start()
+    result = function(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return best, normalized_speeds[len(normalized_speeds) // 2], num_tokens, peak
+
+
+def run(size, repeats, only=None):
+    corpora = dict((name, generator(size)) for name, generator in GENERATORS.items())
+    results = {}
+    for corpus_name in sorted(corpora):
+        text = corpora[corpus_name]
+        for entry_name, function, count_tokens in ENTRY_POINTS:
+            key = "%s/%s" % (corpus_name, entry_name)
+            if only is not None and not any(pattern in key for pattern in only):
+                continue
+            elapsed, normalized_speed, num_tokens, peak = measure(
+                function, count_tokens, text, repeats
+            )
+            results[key] = {
+                "chars_per_sec": len(text) / elapsed,
+                "tokens_per_sec": num_tokens / elapsed,
+                "peak_kb": peak / 1024.0,
+                # comparable across machines:
+                "normalized_speed": normalized_speed
+            }
+    return {
+        "python": platform.python_version(),
+        "size": size,
+        "results": results
+    }
+
+
+def compare(current, baseline, tolerance):
+    """
+    Compare two benchmark runs.
+
+    Returns
+    -------
+        list<str> : description of each regression.
+    """
+    regressions = []
+    same_size = current["size"] == baseline["size"]
+    for key, result in sorted(current["results"].items()):
+        if key not in baseline["results"]:
+            continue
+        reference = baseline["results"][key]
+        ratio = result["normalized_speed"] / reference["normalized_speed"]
+        if ratio < 1.0 - tolerance:
+            regressions.append(
+                "%s: %.0f%% of baseline speed" % (key, 100.0 * ratio)
+            )
+        if same_size and result["peak_kb"] > reference["peak_kb"] * (1.0 + tolerance) + MEMORY_SLACK_KB:
+            regressions.append(
+                "%s: peak memory %.0f KB (baseline %.0f KB)" % (
+                    key, result["peak_kb"], reference["peak_kb"]
+                )
+            )
+    return regressions
+
+
+def print_results(current, baseline=None):
+    print("%-42s %12s %12s %10s %9s" % (
+        "benchmark", "chars/sec", "tokens/sec", "peak KB", "speed"
+    ))
+    for key, result in sorted(current["results"].items()):
+        relative = ""
+        if baseline is not None and key in baseline["results"]:
+            relative = "%8.0f%%" % (
+                100.0 * result["normalized_speed"] / baseline["results"][key]["normalized_speed"]
+            )
+        print("%-42s %12.0f %12.0f %10.0f %9s" % (
+            key, result["chars_per_sec"], result["tokens_per_sec"],
+            result["peak_kb"], relative
+        ))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--size", type=int, default=1 << 16,
+                        help="number of characters per corpus")
+    parser.add_argument("--repeats", type=int, default=7,
+                        help="timed runs per benchmark")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="baseline to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative slowdown or memory growth")
+    parser.add_argument("--save", metavar="PATH", default=None,
+                        help="write the results as a new baseline "
+                             "('baseline' stands for the default one)")
+    parser.add_argument("--only", nargs="+", default=None,
+                        help="only run benchmarks whose name contains one of these")
+    args = parser.parse_args(argv)
+
+    current = run(args.size, args.repeats, args.only)
+    baseline = None
+    if args.save is None and os.path.exists(args.baseline):
+        with open(args.baseline) as fin:
+            baseline = json.load(fin)
+    print_results(current, baseline)
+
+    if args.save is not None:
+        path = DEFAULT_BASELINE if args.save == "baseline" else args.save
+        with open(path, "w") as fout:
+            json.dump(current, fout, indent=2, sort_keys=True)
+            fout.write("\n")
+        print("saved baseline to %s" % path)
+        return 0
+    if baseline is None:
+        print("no baseline found at %s" % args.baseline)
+        return 0
+    regressions = compare(current, baseline, args.tolerance)
+    for regression in regressions:
+        print("REGRESSION %s" % regression)
+    if regressions:
+        return 1
+    print("no regression (tolerance %.0f%%)" % (100 * args.tolerance))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,19 +8,103 @@ Usage
 #=> [["Joey", "was", "a", "great", "sailor", "."]]
 
 """
+import sys
+from importlib import import_module
 
-from .wiki_markup_processing import (
-    to_raw_text,
-    to_raw_text_markupless,
-    to_raw_text_pairings
-)
-from .word_tokenizer import tokenize
-from .sentence_tokenizer import sent_tokenize
+# module defining each public name. On Python 3.7+ a module is only
+# imported when one of its names is first accessed (e.g. the wiki
+# markup expressions, multiprocessing or xml are not loaded by a
+# program that only calls `ciseau.tokenize`):
+_EXPORTS = {
+    "to_raw_text": "wiki_markup_processing",
+    "to_raw_text_markupless": "wiki_markup_processing",
+    "to_raw_text_pairings": "wiki_markup_processing",
+    "to_raw_text_spans": "wiki_markup_processing",
+    "to_raw_text_markupless_spans": "wiki_markup_processing",
+    "tokenize": "word_tokenizer",
+    "tokenize_batch": "word_tokenizer",
+    "sent_tokenize": "sentence_tokenizer",
+    "iter_sentences": "streaming",
+    "tokenize_offsets": "offsets",
+    "sent_tokenize_offsets": "offsets",
+    "tokenize_spans": "offsets",
+    "sent_tokenize_spans": "offsets",
+    "tokenize_many": "parallel",
+    "sent_tokenize_many": "parallel",
+    "sent_tokenize_compact_many": "parallel",
+    "to_raw_text_many": "parallel",
+    "to_raw_text_markupless_many": "parallel",
+    "to_raw_text_pairings_many": "parallel",
+    "iter_dump": "wiki",
+    "profile": "profiling",
+    "TokenizationCache": "caching",
+    "AbbreviationLexicon": "abbreviations",
+    "Tokenizer": "tokenizer",
+    "CompactSentences": "compact",
+    "sent_tokenize_compact": "compact",
+    "TokenizedDocument": "incremental",
+    "sent_tokenize_document": "incremental",
+    "retokenize": "incremental",
+    "Vocabulary": "vocabulary",
+    "tokenize_ids": "vocabulary",
+    "sent_tokenize_ids": "vocabulary"
+}
 
 __all__ = [
     "to_raw_text",
     "to_raw_text_markupless",
     "to_raw_text_pairings",
     "sent_tokenize",
-    "tokenize"
+    "tokenize",
+    "tokenize_batch",
+    "iter_sentences",
+    "tokenize_offsets",
+    "sent_tokenize_offsets",
+    "tokenize_spans",
+    "sent_tokenize_spans",
+    "sent_tokenize_compact",
+    "CompactSentences",
+    "sent_tokenize_document",
+    "retokenize",
+    "TokenizedDocument",
+    "Vocabulary",
+    "tokenize_ids",
+    "sent_tokenize_ids",
+    "to_raw_text_spans",
+    "to_raw_text_markupless_spans",
+    "iter_dump",
+    "profile",
+    "TokenizationCache",
+    "AbbreviationLexicon",
+    "Tokenizer",
+    "tokenize_many",
+    "sent_tokenize_many",
+    "sent_tokenize_compact_many",
+    "to_raw_text_many",
+    "to_raw_text_markupless_many",
+    "to_raw_text_pairings_many"
 ]
+
+
+def _load(name):
+    value = getattr(import_module("." + _EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+if sys.version_info >= (3, 7):
+    from importlib.util import find_spec
+
+    def __getattr__(name):
+        if name in _EXPORTS:
+            return _load(name)
+        # submodules (e.g. `ciseau.constants`) are imported on first access too:
+        if not name.startswith("_") and find_spec("." + name, __name__) is not None:
+            return import_module("." + name, __name__)
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+    def __dir__():
+        return sorted(set(globals()) | set(_EXPORTS))
+else:
+    for _name in _EXPORTS:
+        _load(_name)
@@ -0,0 +1,89 @@
+"""
+Abbreviation lexicons for the shorthand detection of `tokenize`
+(e.g. legal, biomedical or German abbreviations).
+
+Usage
+-----
+
+> lexicon = ciseau.AbbreviationLexicon(["approx", "cf", "Abs."])
+> ciseau.tokenize("See approx. ten cases, cf. Abs. 3.", abbreviations=lexicon)
+> lexicon.save("legal.abbr")
+> lexicon = ciseau.AbbreviationLexicon.load("legal.abbr")
+
+A lexicon is a `HashTable` of lowercased abbreviations, which
+`load` maps in memory (see `ciseau.hash_table`, its magic is
+"CSAB" and it stores the keys alone).
+"""
+from .hash_table import HashTable, build_table
+
+MAGIC = b"CSAB"
+VERSION = 1
+
+
+def normalize_abbreviation(abbreviation):
+    """
+    Form under which an abbreviation is stored and looked up:
+    lowercased, without surrounding whitespace or trailing
+    period ('Dr.' -> 'dr').
+
+    Arguments
+    ---------
+        abbreviation : str
+
+    Returns
+    -------
+        str, or None when the abbreviation holds a period or
+            whitespace (words are split there before shorthand
+            is detected, e.g. 'ph.d', so it could never match).
+    """
+    abbreviation = abbreviation.strip()
+    if abbreviation.endswith("."):
+        abbreviation = abbreviation[:-1]
+    if len(abbreviation) == 0 or "." in abbreviation or len(abbreviation.split()) > 1:
+        return None
+    return abbreviation.lower()
+
+
+class AbbreviationLexicon(HashTable):
+    """
+    Set of abbreviations recognized by `tokenize` (words that
+    keep their period, see `protect_shorthand`).
+
+    Arguments
+    ---------
+        abbreviations : iterable<str>, with or without their
+            period, in any case. Entries holding a period or
+            whitespace are left out (see `normalize_abbreviation`).
+    """
+    MAGIC = MAGIC
+    VERSION = VERSION
+    NAME = "abbreviation lexicon"
+
+    def __init__(self, abbreviations=()):
+        entries = {}
+        for abbreviation in abbreviations:
+            abbreviation = normalize_abbreviation(abbreviation)
+            if abbreviation is None:
+                continue
+            key = abbreviation.encode("utf-8")
+            if len(key) > 0xffff:
+                raise ValueError("abbreviation is too long: %r" % (key[:32],))
+            entries[key] = None
+        self._set_table(build_table(MAGIC, VERSION, entries))
+        self.path = None
+
+    def __contains__(self, word):
+        """
+        Whether a lowercased word (without its period) is
+        an abbreviation.
+        """
+        return self._get(word)
+
+    def __iter__(self):
+        for abbreviation, _ in self._entries():
+            yield abbreviation
+
+    def __repr__(self):
+        return "AbbreviationLexicon(%d abbreviations%s)" % (
+            self._num_entries, "" if self.path is None else ", path=%r" % (self.path,)
+        )
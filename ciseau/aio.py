@@ -0,0 +1,260 @@
+"""
+Awaitable tokenization for asyncio programs.
+
+Usage
+-----
+
+> sentences = await ciseau.aio.sent_tokenize(text)
+> async with ciseau.aio.TokenizationService(processes=4, max_wait=0.005) as service:
+>     words = await service.tokenize(text)
+
+Tokenizing inside a coroutine blocks the event loop, while sending
+each request to an executor on its own costs more than tokenizing
+a short text. Instead, requests made while others are waiting are
+grouped into batches: a batch is sent to the executor (a process
+pool by default) when it holds `max_batch_size` texts, or when its
+first request has waited `max_wait` seconds.
+
+At most `max_pending` requests are waiting or running at once;
+further requests wait for one of them to finish (backpressure). A
+request cancelled before its batch is sent is left out of it.
+"""
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+
+from .parallel import _tokenize_batch, BATCH_CHARACTERS
+
+
+class TokenizationService(object):
+    """
+    Batches concurrent tokenization requests and runs them in
+    an executor.
+
+    Arguments
+    ---------
+        executor : concurrent.futures.Executor or None, process
+            or thread pool to run the batches in (left open by
+            `close`). By default a process pool is started on
+            the first request.
+        processes : int or None, number of worker processes of
+            the default executor (defaults to the number of cpus).
+        max_batch_size : int, number of texts after which a batch
+            is sent without waiting.
+        max_wait : float, seconds a request waits for others to
+            join its batch.
+        max_pending : int, number of requests waiting or running
+            at once.
+    """
+    def __init__(self, executor=None, processes=None, max_batch_size=64, max_wait=0.002,
+                 max_pending=4096):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1 (got %r)" % (max_batch_size,))
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1 (got %r)" % (max_pending,))
+        self.executor = executor
+        self.processes = processes
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.max_pending = max_pending
+        self.num_requests = 0
+        self.num_batches = 0
+        self._owns_executor = executor is None
+        self._closed = False
+        self._loop = None
+
+    def _use_loop(self, loop):
+        # the semaphore, batches and timers belong to an event loop, and
+        # a service can outlive it (e.g. `default_service` across several
+        # `asyncio.run`), so they are created again for each new loop:
+        self._loop = loop
+        self._slots = asyncio.Semaphore(self.max_pending)
+        # texts waiting for a batch (and their number of characters),
+        # for each function and arguments:
+        self._batches = {}
+        self._batch_characters = {}
+        self._timers = {}
+        self._running = set()
+
+    def _get_executor(self):
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(self.processes)
+        return self.executor
+
+    async def submit(self, function_name, text, **kwargs):
+        """
+        Tokenize a text with one of the functions of
+        `ciseau.parallel.TOKENIZERS`, along with the
+        concurrent requests for the same function and
+        arguments.
+
+        Arguments
+        ---------
+            function_name : str, e.g. "sent_tokenize".
+            text : str
+            **kwargs : passed on to the function.
+
+        Returns
+        -------
+            output of the function for this text.
+        """
+        if self._closed:
+            raise RuntimeError("TokenizationService is closed")
+        if not isinstance(text, str):
+            raise TypeError("expected a str, got %r" % (type(text).__name__,))
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._use_loop(loop)
+        async with self._slots:
+            future = loop.create_future()
+            key = (function_name, tuple(sorted(kwargs.items())))
+            batch = self._batches.get(key)
+            if batch is None:
+                batch = self._batches[key] = []
+                self._batch_characters[key] = 0
+                self._timers[key] = loop.call_later(self.max_wait, self._send, key)
+            batch.append((text, future))
+            self._batch_characters[key] += len(text)
+            self.num_requests += 1
+            if (len(batch) >= self.max_batch_size or
+                    self._batch_characters[key] >= BATCH_CHARACTERS):
+                self._send(key)
+            return await future
+
+    def _send(self, key):
+        batch = self._batches.pop(key)
+        del self._batch_characters[key]
+        self._timers.pop(key).cancel()
+        # requests cancelled while they waited are left out:
+        batch = [(text, future) for text, future in batch if not future.done()]
+        if len(batch) == 0:
+            return
+        function_name, kwargs = key
+        loop = asyncio.get_running_loop()
+        try:
+            running = loop.run_in_executor(
+                self._get_executor(), _tokenize_batch, function_name, dict(kwargs),
+                [text for text, _ in batch]
+            )
+        except Exception as error:
+            # e.g. the executor was shut down or a worker process died
+            # (when sent by the timer, nothing else would see the error):
+            for _, future in batch:
+                future.set_exception(error)
+            return
+        self.num_batches += 1
+        self._running.add(running)
+        running.add_done_callback(lambda running: self._finish(running, batch))
+
+    def _finish(self, running, batch):
+        self._running.discard(running)
+        if running.cancelled():
+            for _, future in batch:
+                future.cancel()
+            return
+        error = running.exception()
+        for i, (_, future) in enumerate(batch):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(running.result()[i])
+
+    async def tokenize(self, text, normalize_ascii=True, max_length=None, abbreviations=None):
+        """
+        Awaitable `ciseau.tokenize`.
+        """
+        return await self.submit(
+            "tokenize", text, normalize_ascii=normalize_ascii, max_length=max_length,
+            abbreviations=abbreviations
+        )
+
+    async def sent_tokenize(self, text, keep_whitespace=False, normalize_ascii=True,
+                            max_length=None, abbreviations=None):
+        """
+        Awaitable `ciseau.sent_tokenize`.
+        """
+        return await self.submit(
+            "sent_tokenize", text, keep_whitespace=keep_whitespace,
+            normalize_ascii=normalize_ascii, max_length=max_length,
+            abbreviations=abbreviations
+        )
+
+    async def to_raw_text(self, text, keep_whitespace=False, normalize_ascii=True,
+                          max_length=None):
+        """
+        Awaitable `ciseau.to_raw_text`.
+        """
+        return await self.submit(
+            "to_raw_text", text, keep_whitespace=keep_whitespace,
+            normalize_ascii=normalize_ascii, max_length=max_length
+        )
+
+    async def close(self):
+        """
+        Send the waiting requests, wait for every batch to
+        finish, and shut down the default executor.
+        """
+        self._closed = True
+        if self._loop is asyncio.get_running_loop():
+            for key in list(self._batches):
+                self._send(key)
+            if len(self._running) > 0:
+                await asyncio.wait(list(self._running))
+        if self._owns_executor and self.executor is not None:
+            executor = self.executor
+            self.executor = None
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def __repr__(self):
+        return "TokenizationService(max_batch_size=%d, max_wait=%r, max_pending=%d)" % (
+            self.max_batch_size, self.max_wait, self.max_pending
+        )
+
+
+_default_service = None
+
+
+def default_service():
+    """
+    Service used by the functions of this module (created
+    with default arguments on first use).
+    """
+    global _default_service
+    if _default_service is None:
+        _default_service = TokenizationService()
+    return _default_service
+
+
+async def tokenize(text, normalize_ascii=True, max_length=None, abbreviations=None):
+    """
+    Awaitable `ciseau.tokenize`, batched with concurrent
+    requests (see `TokenizationService`).
+    """
+    return await default_service().tokenize(text, normalize_ascii, max_length, abbreviations)
+
+
+async def sent_tokenize(text, keep_whitespace=False, normalize_ascii=True, max_length=None,
+                        abbreviations=None):
+    """
+    Awaitable `ciseau.sent_tokenize`, batched with concurrent
+    requests (see `TokenizationService`).
+    """
+    return await default_service().sent_tokenize(
+        text, keep_whitespace, normalize_ascii, max_length, abbreviations
+    )
+
+
+async def to_raw_text(text, keep_whitespace=False, normalize_ascii=True, max_length=None):
+    """
+    Awaitable `ciseau.to_raw_text`, batched with concurrent
+    requests (see `TokenizationService`).
+    """
+    return await default_service().to_raw_text(text, keep_whitespace, normalize_ascii,
+                                                max_length)
@@ -0,0 +1,183 @@
+"""
+Memoization of the tokenization of repeated inputs (navigation
+text, boilerplate sentences, short queries, ...).
+
+Usage
+-----
+
+> cache = ciseau.TokenizationCache(max_entries=100000)
+> cache.sent_tokenize("Subscribe to our newsletter.")
+#=> (("Subscribe", "to", "our", "newsletter", "."),)
+> cache.statistics()
+#=> {"hits": 0, "misses": 1, "hit_rate": 0.0, "evictions": 0, "entries": 1, "bytes": 555}
+
+Results are returned as tuples (of tuples for sentences), so
+that callers cannot modify a cached entry. The cache holds at
+most `max_entries` results and/or `max_bytes` bytes (as
+estimated by `sys.getsizeof` for the input and the result),
+and evicts the least recently used entries first. A cache can
+be shared by several threads.
+"""
+import sys
+import threading
+from collections import OrderedDict
+
+from .word_tokenizer import tokenize
+from .sentence_tokenizer import sent_tokenize
+from .wiki_markup_processing import to_raw_text
+
+
+def _sentences_to_tuples(sentences):
+    return tuple(tuple(sentence) for sentence in sentences)
+
+
+def _abbreviations_key(abbreviations):
+    # lexicons are part of the key by identity, and the sets or lists
+    # of abbreviations that `tokenize` also accepts by their content:
+    try:
+        hash(abbreviations)
+    except TypeError:
+        return frozenset(abbreviations)
+    return abbreviations
+
+
+def _size(key, value):
+    # approximate number of bytes held by an entry:
+    size = sys.getsizeof(key) + sys.getsizeof(key[1]) + sys.getsizeof(value)
+    for item in value:
+        size += sys.getsizeof(item)
+        if isinstance(item, tuple):
+            for token in item:
+                size += sys.getsizeof(token)
+    return size
+
+
+class TokenizationCache(object):
+    """
+    Bounded least recently used cache of tokenization results,
+    keyed by function, text and options.
+
+    Arguments
+    ---------
+        max_entries : int or None, number of results to keep
+            (None for no limit on the count).
+        max_bytes : int or None, approximate memory budget of
+            the cached inputs and results (None for no limit).
+            Results larger than the budget are not cached.
+    """
+    def __init__(self, max_entries=4096, max_bytes=None):
+        if max_entries is None and max_bytes is None:
+            raise ValueError(
+                "TokenizationCache needs a bound: max_entries, max_bytes or both."
+            )
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get(self, key, compute):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                # (OrderedDict has no move_to_end on Python 2):
+                del self._entries[key]
+                self._entries[key] = entry
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        # tokenize outside of the lock, so that threads can work
+        # on different inputs concurrently:
+        value = compute()
+        size = _size(key, value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return value
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (value, size)
+                self.bytes += size
+                self._evict()
+        return value
+
+    def _evict(self):
+        while self._entries and (
+                (self.max_entries is not None and len(self._entries) > self.max_entries) or
+                (self.max_bytes is not None and self.bytes > self.max_bytes)):
+            _, (_, size) = self._entries.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+
+    def tokenize(self, text, normalize_ascii=True, max_length=None, abbreviations=None):
+        """
+        Same as `ciseau.tokenize`, returning a tuple of tokens.
+        Lexicons passed as `abbreviations` are part of the key
+        (by identity), and should not change once used. Sets and
+        lists are copied into a frozenset on every call, so large
+        ones are better passed as an `AbbreviationLexicon`.
+        """
+        return self._get(
+            ("tokenize", text, normalize_ascii, None, max_length,
+             _abbreviations_key(abbreviations)),
+            lambda: tuple(tokenize(text, normalize_ascii, max_length, abbreviations))
+        )
+
+    def sent_tokenize(self, text, keep_whitespace=False, normalize_ascii=True, max_length=None,
+                      abbreviations=None):
+        """
+        Same as `ciseau.sent_tokenize`, returning a tuple of
+        sentences, each a tuple of tokens (see `tokenize` for
+        `abbreviations`).
+        """
+        return self._get(
+            ("sent_tokenize", text, normalize_ascii, keep_whitespace, max_length,
+             _abbreviations_key(abbreviations)),
+            lambda: _sentences_to_tuples(
+                sent_tokenize(text, keep_whitespace, normalize_ascii, max_length, abbreviations)
+            )
+        )
+
+    def to_raw_text(self, text, keep_whitespace=False, normalize_ascii=True, max_length=None):
+        """
+        Same as `ciseau.to_raw_text`, returning a tuple of
+        sentences, each a tuple of words.
+        """
+        return self._get(
+            ("to_raw_text", text, normalize_ascii, keep_whitespace, max_length, None),
+            lambda: _sentences_to_tuples(
+                to_raw_text(text, keep_whitespace, normalize_ascii, max_length)
+            )
+        )
+
+    def clear(self):
+        """
+        Drop all cached results (statistics are kept).
+        """
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def statistics(self):
+        """
+        Counters to tune the cache size.
+
+        Returns
+        -------
+            dict : hits, misses, hit_rate, evictions, and the
+                current number of entries and bytes.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": float(self.hits) / lookups if lookups > 0 else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.bytes
+            }
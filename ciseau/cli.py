@@ -0,0 +1,326 @@
+"""
+Command line interface: tokenize files, globs or stdin.
+
+Usage
+-----
+
+> ciseau corpus/*.txt > sentences.txt
+> ciseau --mode wiki --format jsonl -j 8 --lines articles.txt.bz2
+> cat notes.txt | ciseau --mode words --format offsets
+
+Each input file is a document (or each of its lines with
+`--lines`). Documents are tokenized in batches by `-j` worker
+processes, which also format the output, and are written in the
+order of the inputs.
+
+Output formats:
+    lines : one sentence per line, words separated by spaces,
+        and an empty line after each document (in `words` mode,
+        one line of words per document).
+    jsonl : one JSON list per document, holding its sentences
+        (lists of words) or, in `words` mode, its words.
+    offsets : one word per line with its character span in the
+        document ("word<TAB>start<TAB>end"), and an empty line
+        after each sentence (in `words` mode, after each document).
+"""
+import argparse
+import codecs
+import errno
+import glob
+import io
+import json
+import multiprocessing
+import os
+import sys
+from functools import partial
+
+from .word_tokenizer import tokenize
+from .sentence_tokenizer import sent_tokenize
+from .offsets import tokenize_spans, sent_tokenize_spans
+from .wiki_markup_processing import (
+    to_raw_text,
+    to_raw_text_markupless,
+    to_raw_text_spans,
+    to_raw_text_markupless_spans
+)
+from .parallel import batch_texts, _map_batches, BATCHES_PER_PROCESS
+from .abbreviations import AbbreviationLexicon, MAGIC
+from .wiki import open_dump
+
+# tokenization function of each mode (and the version of it
+# returning spans, for the 'offsets' format):
+MODES = {
+    "sentences": (sent_tokenize, sent_tokenize_spans),
+    "words": (tokenize, tokenize_spans),
+    "wiki": (to_raw_text, to_raw_text_spans),
+    "wiki-markupless": (to_raw_text_markupless, to_raw_text_markupless_spans)
+}
+FORMATS = ("lines", "jsonl", "offsets")
+
+# size of the buffer in front of the output file:
+OUTPUT_BUFFER = 1 << 20
+
+
+def format_document(mode, output_format, kwargs, text):
+    """
+    Tokenize a document and format the result.
+
+    Arguments
+    ---------
+        mode : str, a key of `MODES`.
+        output_format : str, one of `FORMATS`.
+        kwargs : dict, passed on to the tokenization function.
+        text : str
+
+    Returns
+    -------
+        str : output for this document (ending with a newline).
+    """
+    function, spans_function = MODES[mode]
+    if mode == "words" and output_format == "offsets":
+        # ends before the trailing whitespace, in the original text:
+        result = [[span for span in tokenize_spans(text, keep_whitespace=False, **kwargs)
+                   if span[0]]]
+    else:
+        if output_format == "offsets":
+            function = spans_function
+        result = function(text, **kwargs)
+        if mode == "words":
+            # tokens hold their trailing whitespace:
+            result = [word.rstrip() for word in result if word.strip()]
+    if output_format == "jsonl":
+        return json.dumps(result, ensure_ascii=False) + "\n"
+    if output_format == "offsets":
+        return "".join(
+            "".join("%s\t%d\t%d\n" % span for span in sentence) + "\n"
+            for sentence in result
+        )
+    if mode == "words":
+        return " ".join(result) + "\n"
+    return "".join(" ".join(sentence) + "\n" for sentence in result) + "\n"
+
+
+def _format_batch(mode, output_format, kwargs, texts):
+    return "".join(format_document(mode, output_format, kwargs, text) for text in texts)
+
+
+def expand_paths(patterns):
+    """
+    Expand glob patterns into the paths they match ('-'
+    stands for stdin).
+
+    Arguments
+    ---------
+        patterns : list<str>
+
+    Returns
+    -------
+        list<str>
+    """
+    paths = []
+    for pattern in patterns:
+        if pattern == "-" or os.path.exists(pattern):
+            paths.append(pattern)
+            continue
+        matches = sorted(glob.glob(pattern))
+        if len(matches) == 0:
+            raise ValueError("no such file: %r" % (pattern,))
+        paths.extend(matches)
+    return paths
+
+
+def _open_input(path, encoding):
+    if path == "-":
+        fin = getattr(sys.stdin, "buffer", sys.stdin)
+    else:
+        # decompresses '.bz2' and '.gz' files on the fly:
+        fin = open_dump(path)
+    if not hasattr(fin, "readable"):
+        # Python 2 files are not `io` objects:
+        return codecs.getreader(encoding)(fin, errors="replace")
+    return io.TextIOWrapper(fin, encoding=encoding, errors="replace")
+
+
+def iter_documents(paths, encoding="utf-8", lines=False):
+    """
+    Read the documents of a list of files.
+
+    Arguments
+    ---------
+        paths : list<str>, files to read ('-' reads stdin).
+        encoding : str
+        lines : bool, each line is a document (otherwise
+            each file).
+
+    Returns
+    -------
+        generator<str>
+    """
+    for path in paths:
+        fin = _open_input(path, encoding)
+        try:
+            if lines:
+                for line in fin:
+                    yield line.rstrip("\r\n")
+            else:
+                yield fin.read()
+        finally:
+            if path != "-":
+                fin.close()
+            elif hasattr(fin, "detach"):
+                # leave stdin open:
+                fin.detach()
+
+
+def load_abbreviations(path, encoding="utf-8"):
+    """
+    Read an abbreviation lexicon saved with
+    `AbbreviationLexicon.save`, or a text file holding
+    one abbreviation per line.
+
+    Arguments
+    ---------
+        path : str
+        encoding : str, encoding of a text file.
+
+    Returns
+    -------
+        AbbreviationLexicon
+    """
+    with open(path, "rb") as fin:
+        is_lexicon = fin.read(len(MAGIC)) == MAGIC
+    if is_lexicon:
+        return AbbreviationLexicon.load(path)
+    with io.open(path, encoding=encoding) as fin:
+        return AbbreviationLexicon(fin)
+
+
+def _open_output(path):
+    if path is None or path == "-":
+        return io.open(
+            sys.stdout.fileno(), "w", encoding="utf-8", buffering=OUTPUT_BUFFER,
+            closefd=False
+        )
+    return io.open(path, "w", encoding="utf-8", buffering=OUTPUT_BUFFER)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="ciseau",
+        description="Word and sentence tokenization of files, globs or stdin."
+    )
+    parser.add_argument(
+        "inputs", nargs="*", default=["-"],
+        help="files or glob patterns to read ('.bz2' and '.gz' files are "
+             "decompressed, '-' or no input reads stdin)."
+    )
+    parser.add_argument(
+        "-m", "--mode", choices=sorted(MODES), default="sentences",
+        help="sentences: sent_tokenize, words: tokenize, wiki: to_raw_text, "
+             "wiki-markupless: to_raw_text_markupless (default: sentences)."
+    )
+    parser.add_argument(
+        "-f", "--format", choices=FORMATS, default="lines", dest="output_format",
+        help="output format (default: lines)."
+    )
+    parser.add_argument(
+        "-o", "--output", default=None,
+        help="file to write to (default: stdout)."
+    )
+    parser.add_argument(
+        "-j", "--processes", type=int, default=1,
+        help="number of worker processes (0 uses all cpus, default: 1)."
+    )
+    parser.add_argument(
+        "--chunksize", type=int, default=64,
+        help="number of documents sent to a worker at once (default: 64)."
+    )
+    parser.add_argument(
+        "--lines", action="store_true",
+        help="treat each input line as a document (instead of each file)."
+    )
+    parser.add_argument(
+        "--encoding", default="utf-8",
+        help="encoding of the inputs (default: utf-8)."
+    )
+    parser.add_argument(
+        "--no-normalize-ascii", action="store_false", dest="normalize_ascii",
+        help="keep rare characters (dashes, ligatures, ...) as they are."
+    )
+    parser.add_argument(
+        "--abbreviations", default=None,
+        help="abbreviations to use instead of the english ones, saved with "
+             "AbbreviationLexicon.save or one per line (sentences and words modes)."
+    )
+    parser.add_argument(
+        "--max-length", type=int, default=None,
+        help="only split longer texts along whitespace and punctuation."
+    )
+    return parser
+
+
+def main(argv=None):
+    """
+    Entry point of the `ciseau` command.
+
+    Arguments
+    ---------
+        argv : list<str> or None, command line arguments
+            (defaults to `sys.argv[1:]`).
+
+    Returns
+    -------
+        int : exit status.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.processes < 0:
+        parser.error("--processes must be positive or 0")
+    kwargs = {"normalize_ascii": args.normalize_ascii}
+    if args.max_length is not None:
+        if args.output_format == "offsets":
+            parser.error("--max-length is not supported with --format offsets")
+        kwargs["max_length"] = args.max_length
+    if args.abbreviations is not None:
+        if args.mode not in ("sentences", "words") or args.output_format == "offsets":
+            parser.error("--abbreviations is only supported by the sentences and "
+                         "words modes, without --format offsets")
+        kwargs["abbreviations"] = load_abbreviations(args.abbreviations, args.encoding)
+    try:
+        paths = expand_paths(args.inputs)
+    except ValueError as error:
+        parser.error(str(error))
+
+    worker = partial(_format_batch, args.mode, args.output_format, kwargs)
+    batches = batch_texts(iter_documents(paths, args.encoding, args.lines), args.chunksize)
+    fout = _open_output(args.output)
+    pool = None
+    try:
+        if args.processes == 1:
+            outputs = (worker(batch) for batch in batches)
+        else:
+            pool = multiprocessing.Pool(args.processes or None)
+            outputs = _map_batches(
+                pool, worker, batches, True, BATCHES_PER_PROCESS * pool._processes
+            )
+        for output in outputs:
+            fout.write(output)
+        fout.flush()
+    except IOError as error:
+        # (BrokenPipeError on Python 3)
+        if error.errno != errno.EPIPE:
+            raise
+        # the reader went away (e.g. `ciseau ... | head`):
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, fout.fileno())
+        return 1
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+        fout.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+"""
+Memory efficient container for the output of `sent_tokenize`.
+
+Usage
+-----
+
+> sentences = ciseau.sent_tokenize_compact(article)
+> len(sentences), sentences[0]
+#=> (312, ["Paris", "is", "the", "capital", "of", "France", "."])
+> data = sentences.to_bytes()
+> ciseau.CompactSentences.from_bytes(data)
+
+Instead of a list per sentence and a string per token, the
+sentences are stored as the tokenized text along with two flat
+arrays: where each token starts, and the index of the first token
+of each sentence. Token strings are only created when a sentence
+is accessed.
+"""
+import struct
+import sys
+from array import array
+from itertools import chain
+
+from .offsets import offset_typecode
+from .word_tokenizer import tokenize
+from .sentence_tokenizer import detect_sentence_boundaries
+
+MAGIC = b"CSTX"
+VERSION = 1
+# magic, version, strip, offset size, number of tokens,
+# number of sentences, number of bytes of the text:
+HEADER = struct.Struct("<4sHBBQQQ")
+
+if hasattr(array, "frombytes"):
+    _array_frombytes = array.frombytes
+    _array_tobytes = array.tobytes
+else:
+    # Python 2 (where fromstring does not take memoryviews):
+    def _array_frombytes(values, data):
+        values.fromstring(memoryview(data).tobytes())
+    _array_tobytes = array.tostring
+
+
+def _little_endian(values):
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return _array_tobytes(values)
+
+
+def _typecode_of_size(itemsize):
+    # ("Q" is missing from Python 2, where "L" can hold 8 bytes):
+    for code in ("I", "Q", "L"):
+        try:
+            if array(code).itemsize == itemsize:
+                return code
+        except ValueError:
+            pass
+    return None
+
+
+class CompactSentences(object):
+    """
+    Sentences of tokens, stored as the tokenized text and
+    flat arrays of offsets (see `sent_tokenize_compact`).
+
+    Arguments
+    ---------
+        text : str, the tokens of all sentences, concatenated.
+        offsets : array<int>, start of each token in `text`,
+            followed by the length of `text`.
+        boundaries : array<int>, index of the first token of
+            each sentence, followed by the number of tokens.
+        strip : bool, whether tokens are returned without
+            their trailing whitespace.
+    """
+    __slots__ = ("text", "offsets", "boundaries", "strip")
+
+    def __init__(self, text, offsets, boundaries, strip=False):
+        self.text = text
+        self.offsets = offsets
+        self.boundaries = boundaries
+        self.strip = strip
+
+    def __len__(self):
+        return len(self.boundaries) - 1
+
+    def num_tokens(self):
+        return len(self.offsets) - 1
+
+    def sentence(self, index):
+        """
+        Tokens of a sentence (strings created on demand).
+
+        Arguments
+        ---------
+            index : int
+
+        Returns
+        -------
+            list<str>
+        """
+        text = self.text
+        offsets = self.offsets
+        tokens = [
+            text[offsets[i]:offsets[i + 1]]
+            for i in range(self.boundaries[index], self.boundaries[index + 1])
+        ]
+        if self.strip:
+            return [token.rstrip() for token in tokens]
+        return tokens
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.sentence(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("sentence index out of range")
+        return self.sentence(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.sentence(index)
+
+    def stripped(self):
+        """
+        Same sentences with tokens stripped of their trailing
+        whitespace, sharing the text and offsets of this one.
+        """
+        return CompactSentences(self.text, self.offsets, self.boundaries, strip=True)
+
+    def with_whitespace(self):
+        """
+        Same sentences with tokens keeping their trailing
+        whitespace, sharing the text and offsets of this one.
+        """
+        return CompactSentences(self.text, self.offsets, self.boundaries, strip=False)
+
+    def to_list(self):
+        """
+        Sentences as `sent_tokenize` returns them.
+
+        Returns
+        -------
+            list<list<str>>
+        """
+        return list(self)
+
+    def to_bytes(self):
+        """
+        Serialize the sentences (see `from_bytes`).
+
+        Returns
+        -------
+            bytes
+        """
+        encoded = self.text.encode("utf-8")
+        return b"".join([
+            HEADER.pack(
+                MAGIC, VERSION, self.strip, self.offsets.itemsize,
+                len(self.offsets), len(self.boundaries), len(encoded)
+            ),
+            _little_endian(self.offsets),
+            _little_endian(self.boundaries),
+            encoded
+        ])
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Deserialize the output of `to_bytes`.
+
+        Arguments
+        ---------
+            data : bytes or buffer
+
+        Returns
+        -------
+            CompactSentences
+        """
+        data = memoryview(data)
+        if len(data) < HEADER.size:
+            raise ValueError("not a serialized CompactSentences (too short)")
+        (magic, version, strip, itemsize, num_offsets,
+         num_boundaries, num_bytes) = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("not a serialized CompactSentences (magic is %r)" % (magic,))
+        if version != VERSION:
+            raise ValueError("unsupported CompactSentences version %d" % (version,))
+        typecode = _typecode_of_size(itemsize)
+        if typecode is None:
+            raise ValueError("unsupported offset size %d" % (itemsize,))
+        position = HEADER.size
+        arrays = []
+        for count in (num_offsets, num_boundaries):
+            values = array(typecode)
+            _array_frombytes(values, data[position:position + itemsize * count])
+            if sys.byteorder != "little":
+                values.byteswap()
+            arrays.append(values)
+            position += itemsize * count
+        if len(data) != position + num_bytes:
+            raise ValueError("corrupted CompactSentences")
+        text = data[position:].tobytes().decode("utf-8")
+        return cls(text, arrays[0], arrays[1], strip=bool(strip))
+
+    def __reduce__(self):
+        # (bound class methods cannot be pickled on Python 2):
+        return (_from_bytes, (self.to_bytes(),))
+
+    def __repr__(self):
+        return "CompactSentences(%d sentences, %d tokens%s)" % (
+            len(self), self.num_tokens(), ", stripped" if self.strip else ""
+        )
+
+
+def compact_sentences(sentences, strip=False):
+    """
+    Store sentences of tokens holding their whitespace (e.g.
+    `sent_tokenize(text, keep_whitespace=True)`) compactly.
+
+    Arguments
+    ---------
+        sentences : list<list<str>>
+        strip : bool, return tokens without their trailing
+            whitespace.
+
+    Returns
+    -------
+        CompactSentences
+    """
+    text = "".join(chain.from_iterable(sentences))
+    typecode = offset_typecode(len(text))
+    offsets = array(typecode, [0])
+    boundaries = array(typecode, [0])
+    position = 0
+    for sentence in sentences:
+        for token in sentence:
+            position += len(token)
+            offsets.append(position)
+        boundaries.append(len(offsets) - 1)
+    return CompactSentences(text, offsets, boundaries, strip)
+
+
+def _from_bytes(data):
+    return CompactSentences.from_bytes(data)
+
+
+def sent_tokenize_compact(text, keep_whitespace=False, normalize_ascii=True,
+                          max_length=None, abbreviations=None):
+    """
+    Same as `sent_tokenize`, returning the sentences in a
+    `CompactSentences` container rather than lists of strings.
+
+    Arguments
+    ---------
+        text : str
+        keep_whitespace : bool, whether tokens keep their
+            trailing whitespace (`stripped` and
+            `with_whitespace` switch between both without
+            copying).
+        normalize_ascii : bool, perform some replacements
+            on rare characters (see `sent_tokenize`).
+        max_length : int or None, see `tokenize`.
+        abbreviations : AbbreviationLexicon or None, see `tokenize`.
+
+    Returns
+    -------
+        CompactSentences
+    """
+    return compact_sentences(
+        detect_sentence_boundaries(tokenize(text, normalize_ascii, max_length, abbreviations)),
+        strip=not keep_whitespace
+    )
@@ -14,6 +14,9 @@ else:
 UNDECIDED = 0
 SHOULD_SPLIT = 1
 SHOULD_NOT_SPLIT = 2
+# single byte versions, for searching or filling a bytearray of decisions:
+SHOULD_SPLIT_BYTE = bytes(bytearray([SHOULD_SPLIT]))
+SHOULD_NOT_SPLIT_BYTE = bytes(bytearray([SHOULD_NOT_SPLIT]))
 
 people = [
     "jr", "mr", "ms", "mrs", "dr", "prof", "esq", "sr",
@@ -50,6 +53,10 @@ ABBR = {}
 for abbreviation_type in [people, army, inst, place, comp, state, month, misc, website, currency]:
     for abbreviation in abbreviation_type:
         ABBR[abbreviation] = True
+# the abbreviations a lowercased word can be equal to:
+ABBREVIATIONS = frozenset(
+    abbreviation for abbreviation in ABBR if abbreviation == abbreviation.lower()
+)
 
 MONTHS = {
     "january", "february", "march", "april", "may",
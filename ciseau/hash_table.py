@@ -0,0 +1,198 @@
+"""
+Frozen hash tables of strings held in a single buffer, shared by
+`AbbreviationLexicon` and `Vocabulary`.
+
+The table is an open addressing hash table written to disk as is.
+Loading a table maps the file in memory instead of reading it, so
+that opening a table of any size is immediate, and pages are only
+read (and shared between processes) as lookups touch them.
+
+File layout (little endian):
+    header : magic, version, number of slots, number of
+        entries (4 bytes each).
+    slots : number of slots x uint32, offset of the entry
+        stored in this slot (0 for an empty slot).
+    entries : value (if the table has values), uint16 length
+        and utf-8 bytes of each key.
+"""
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+
+HEADER = struct.Struct("<4sIII")
+SLOT = struct.Struct("<I")
+LENGTH = struct.Struct("<H")
+
+
+def _hash(key):
+    return zlib.crc32(key) & 0xffffffff
+
+
+def build_table(magic, version, entries, value=None):
+    """
+    Lay out a hash table (see the module documentation for
+    the format).
+
+    Arguments
+    ---------
+        magic : bytes, 4 bytes identifying the kind of table.
+        version : int
+        entries : dict<bytes, object>, utf-8 keys (at most
+            0xffff bytes long) along with their value.
+        value : struct.Struct or None, format of the values
+            (None stores the keys alone).
+
+    Returns
+    -------
+        bytes
+    """
+    # at most half of the slots are used, so that probe sequences stay short:
+    num_slots = 8
+    while num_slots < 2 * len(entries):
+        num_slots *= 2
+    slots = [0] * num_slots
+    blob = bytearray()
+    blob_start = HEADER.size + SLOT.size * num_slots
+    for key in sorted(entries):
+        slot = _hash(key) & (num_slots - 1)
+        while slots[slot] != 0:
+            slot = (slot + 1) & (num_slots - 1)
+        slots[slot] = blob_start + len(blob)
+        if value is not None:
+            blob.extend(value.pack(entries[key]))
+        blob.extend(LENGTH.pack(len(key)))
+        blob.extend(key)
+    return b"".join([
+        HEADER.pack(magic, version, num_slots, len(entries)),
+        struct.pack("<%dI" % (num_slots,), *slots),
+        bytes(blob)
+    ])
+
+
+def _from_bytes(cls, table):
+    table_object = cls.__new__(cls)
+    table_object._set_table(table)
+    table_object.path = None
+    return table_object
+
+
+def _load(cls, path):
+    with open(path, "rb") as fin:
+        table = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+    table_object = _from_bytes(cls, table)
+    table_object.path = path
+    return table_object
+
+
+class HashTable(object):
+    """
+    Base class of the tables built with `build_table`.
+    Subclasses set `MAGIC`, `VERSION`, `VALUE` (see
+    `build_table`) and `NAME` (used in error messages).
+    """
+    MAGIC = None
+    VERSION = 1
+    VALUE = None
+    NAME = "hash table"
+    # number of lookup results remembered by a table:
+    RECENT_LOOKUPS = 4096
+
+    def _set_table(self, table):
+        if len(table) < HEADER.size:
+            raise ValueError("not a %s (too short)" % (self.NAME,))
+        magic, version, num_slots, num_entries = HEADER.unpack_from(table, 0)
+        if magic != self.MAGIC:
+            raise ValueError("not a %s (magic is %r)" % (self.NAME, magic))
+        if version != self.VERSION:
+            raise ValueError("unsupported %s version %d" % (self.NAME, version))
+        if num_slots & (num_slots - 1) != 0 or len(table) < HEADER.size + SLOT.size * num_slots:
+            raise ValueError("corrupted %s" % (self.NAME,))
+        self._table = table
+        self._recent = {}
+        self._mask = num_slots - 1
+        self._num_entries = num_entries
+        self._value_size = 0 if self.VALUE is None else self.VALUE.size
+        if (sys.byteorder == "little" and array("I").itemsize == SLOT.size and
+                hasattr(memoryview, "cast")):
+            # read the slots in place (without copying a mapped file):
+            self._slots = memoryview(table)[
+                HEADER.size:HEADER.size + SLOT.size * num_slots
+            ].cast("I")
+        else:
+            self._slots = list(struct.unpack_from("<%dI" % (num_slots,), table, HEADER.size))
+
+    @classmethod
+    def from_bytes(cls, table):
+        """
+        Table held in the output of `to_bytes`.
+        """
+        return _from_bytes(cls, table)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Map a table saved with `save` in memory.
+
+        Arguments
+        ---------
+            path : str
+        """
+        return _load(cls, path)
+
+    def save(self, path):
+        with open(path, "wb") as fout:
+            fout.write(self._table)
+
+    def to_bytes(self):
+        # (slicing copies a mapped file on Python 2 as well):
+        return bytes(self._table[:])
+
+    def __reduce__(self):
+        # worker processes map the same file rather than receive a copy:
+        if self.path is not None:
+            return (_load, (type(self), self.path))
+        return (_from_bytes, (type(self), self.to_bytes()))
+
+    def _get(self, key):
+        # value of a key (True without values), or False:
+        found = self._recent.get(key)
+        if found is None:
+            found = self._lookup(key)
+            if len(self._recent) >= self.RECENT_LOOKUPS:
+                self._recent.clear()
+            self._recent[key] = found
+        return found
+
+    def _lookup(self, key):
+        encoded = key.encode("utf-8")
+        if len(encoded) > 0xffff:
+            return False
+        # compare the length along with the bytes of the key:
+        entry = LENGTH.pack(len(encoded)) + encoded
+        slot = _hash(encoded) & self._mask
+        while True:
+            offset = self._slots[slot]
+            if offset == 0:
+                return False
+            start = offset + self._value_size
+            if self._table[start:start + len(entry)] == entry:
+                if self.VALUE is None:
+                    return True
+                return self.VALUE.unpack_from(self._table, offset)[0]
+            slot = (slot + 1) & self._mask
+
+    def _entries(self):
+        # (key, value) pairs, in the order of the entries:
+        offset = HEADER.size + SLOT.size * (self._mask + 1)
+        for _ in range(self._num_entries):
+            value = None if self.VALUE is None else self.VALUE.unpack_from(self._table, offset)[0]
+            offset += self._value_size
+            length = LENGTH.unpack_from(self._table, offset)[0]
+            offset += LENGTH.size
+            yield self._table[offset:offset + length].decode("utf-8"), value
+            offset += length
+
+    def __len__(self):
+        return self._num_entries
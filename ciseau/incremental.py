@@ -0,0 +1,303 @@
+"""
+Incremental sentence tokenization of edited documents.
+
+Usage
+-----
+
+> document = ciseau.sent_tokenize_document(article)
+> document = ciseau.retokenize(document, 120, 125, "Paris")
+> document.sentences == ciseau.sent_tokenize(document.text)
+#=> True
+
+After an edit, only a window of sentences around it is tokenized
+again: the edited sentences along with unchanged sentences on each
+side. The window grows until these unchanged sentences come out
+of it as they were (the split decisions around the edit no longer
+depend on the edit), and its new sentences are spliced between
+the sentences before and after it.
+
+Quotes and brackets are paired across the whole document: an
+unmatched symbol changes how the rest of the document is grouped.
+When every symbol of the document and of the window is paired,
+sentence boundaries are detected in the window alone. Otherwise
+they are detected again over all the tokens (only the window is
+tokenized again).
+"""
+from bisect import bisect_left, bisect_right
+from itertools import chain
+
+from .regular_expressions import no_punctuation, word_character
+from .word_tokenizer import tokenize
+from .quoted_expressions import find_quoted_sections, group_sections
+from .sentence_tokenizer import split_sentences, remove_whitespace
+from .offsets import normalized_to_raw_offsets
+
+# unchanged sentences tokenized again on each side of an edit
+# (doubled each time the window is too small):
+CONTEXT_SENTENCES = 1
+
+
+def _sentence_starts(text, sentences, normalize_ascii):
+    # position in `text` of the start of each sentence (with whitespace),
+    # followed by the length of `text`:
+    starts = [0]
+    for sentence in sentences:
+        starts.append(starts[-1] + sum(map(len, sentence)))
+    if normalize_ascii and not no_punctuation.match(text):
+        normalized_to_raw_offsets(text, starts)
+    return starts
+
+
+def _num_quotes(tokens):
+    return sum(1 for token in tokens if token[0] == '"')
+
+
+def _detect_sentences(tokens, quotes_after=0):
+    # same as `detect_sentence_boundaries`, also telling whether every
+    # quote and bracket was paired, and whether the period of the last
+    # token was split off:
+    sections, balanced = find_quoted_sections(tokens, quotes_after)
+    sentences = split_sentences(group_sections(tokens, sections))
+    return sentences, balanced, sum(map(len, sentences)) != len(tokens)
+
+
+class TokenizedDocument(object):
+    """
+    Text along with its sentences, as returned by
+    `sent_tokenize_document` and `retokenize`.
+
+    Arguments
+    ---------
+        text : str
+        sentences : list<list<str>>, same as `sent_tokenize`
+            with the arguments below.
+        spaced_sentences : list<list<str>>, sentences with the
+            whitespace of their tokens (the same list as
+            `sentences` when `keep_whitespace` is True).
+        starts : list<int>, position in `text` of the start of
+            each sentence, followed by the length of `text`.
+        balanced : bool, whether every quote and bracket of
+            the text was paired (see `find_quoted_sections`).
+        split_last_token : bool, whether the trailing period of
+            the last token was split off by
+            `detect_sentence_boundaries`.
+        keep_whitespace : bool
+        normalize_ascii : bool
+        abbreviations : AbbreviationLexicon or None
+    """
+    def __init__(self, text, sentences, spaced_sentences, starts, balanced, split_last_token,
+                 keep_whitespace=False, normalize_ascii=True, abbreviations=None):
+        self.text = text
+        self.sentences = sentences
+        self.spaced_sentences = spaced_sentences
+        self.starts = starts
+        self.balanced = balanced
+        self.split_last_token = split_last_token
+        self.keep_whitespace = keep_whitespace
+        self.normalize_ascii = normalize_ascii
+        self.abbreviations = abbreviations
+
+    def sentence_span(self, index):
+        """
+        Start and end of a sentence (with its trailing
+        whitespace) in `text`.
+        """
+        return self.starts[index], self.starts[index + 1]
+
+    def edit(self, start, end, replacement):
+        """
+        Same as `retokenize(self, start, end, replacement)`.
+        """
+        return retokenize(self, start, end, replacement)
+
+    def __len__(self):
+        return len(self.sentences)
+
+    def __repr__(self):
+        return "TokenizedDocument(%d characters, %d sentences)" % (
+            len(self.text), len(self.sentences)
+        )
+
+
+def sent_tokenize_document(text, keep_whitespace=False, normalize_ascii=True,
+                           abbreviations=None):
+    """
+    Same as `sent_tokenize`, keeping what `retokenize` needs
+    to update the sentences after an edit of the text.
+
+    Arguments
+    ---------
+        text : str
+        keep_whitespace : bool, whether to strip out spaces
+            and newlines.
+        normalize_ascii : bool, perform some replacements
+            on rare characters (see `sent_tokenize`).
+        abbreviations : AbbreviationLexicon or None, words
+            that keep their period (see `tokenize`).
+
+    Returns
+    -------
+        TokenizedDocument
+    """
+    spaced, balanced, split_last_token = _detect_sentences(
+        tokenize(text, normalize_ascii, None, abbreviations)
+    )
+    return TokenizedDocument(
+        text,
+        spaced if keep_whitespace else remove_whitespace(spaced),
+        spaced,
+        _sentence_starts(text, spaced, normalize_ascii),
+        balanced,
+        split_last_token,
+        keep_whitespace,
+        normalize_ascii,
+        abbreviations
+    )
+
+
+def _can_cut_window(document, first, stop):
+    # the window is cut after whitespace (expressions matching runs of
+    # non-whitespace characters do not see the cut), and a word in the
+    # unchanged sentences at its edges stops the expressions looking for
+    # the next word from reaching across them:
+    text = document.text
+    starts = document.starts
+    if first > 0 and not (text[starts[first] - 1].isspace() and
+                          word_character.search(text, starts[first], starts[first + 1])):
+        return False
+    if stop < len(starts) - 1 and not (text[starts[stop] - 1].isspace() and
+                                       word_character.search(text, starts[stop - 1],
+                                                             starts[stop])):
+        return False
+    return True
+
+
+def _retokenize_window(document, text, first, stop, shift):
+    # tokenize sentences first up to stop of the edited `text` again. Returns
+    # the new document, or None when the unchanged sentences at the edges of
+    # the window do not come out as they were:
+    if not _can_cut_window(document, first, stop):
+        return None
+    spaced = document.spaced_sentences
+    starts = document.starts
+    num_sentences = len(spaced)
+    window_start = starts[first]
+    window = text[window_start:starts[stop] + shift]
+    tokens = tokenize(window, document.normalize_ascii, None, document.abbreviations)
+    leading = spaced[first] if first > 0 else []
+    trailing = spaced[stop - 1] if stop < num_sentences else []
+    if (len(tokens) < len(leading) + len(trailing) or
+            tokens[:len(leading)] != leading or
+            tokens[len(tokens) - len(trailing):] != trailing):
+        return None
+
+    # with every symbol paired, no quoted section crosses a sentence
+    # boundary and the window can be grouped alone (as long as the
+    # quotes before it are followed by as many quotes as before, and
+    # quotes at its edges are not decided by their neighbors):
+    window_balanced = (
+        document.balanced and
+        len(tokens) > 0 and
+        (first == 0 or tokens[0][0] != '"') and
+        (stop == num_sentences or tokens[-1][0] != '"')
+    )
+    if window_balanced:
+        num_quotes = _num_quotes(tokens)
+        window_balanced = num_quotes == _num_quotes(chain.from_iterable(spaced[first:stop]))
+    if window_balanced:
+        quotes_after = (
+            _num_quotes(chain.from_iterable(spaced[stop:])) if num_quotes > 0 else 0
+        )
+        window_spaced, window_balanced, split_last_token = _detect_sentences(
+            tokens, quotes_after
+        )
+    if not window_balanced:
+        all_tokens = list(chain(chain.from_iterable(spaced[:first]),
+                                tokens,
+                                chain.from_iterable(spaced[stop:])))
+        if stop < num_sentences and document.split_last_token:
+            # as the last token came out of `tokenize`:
+            all_tokens[-2:] = [all_tokens[-2] + all_tokens[-1]]
+        new_spaced, balanced, split_last_token = _detect_sentences(all_tokens)
+        return TokenizedDocument(
+            text,
+            new_spaced if document.keep_whitespace else remove_whitespace(new_spaced),
+            new_spaced,
+            _sentence_starts(text, new_spaced, document.normalize_ascii),
+            balanced,
+            split_last_token,
+            document.keep_whitespace,
+            document.normalize_ascii,
+            document.abbreviations
+        )
+
+    if ((first > 0 and window_spaced[0] != leading) or
+            (stop < num_sentences and window_spaced[-1] != trailing)):
+        return None
+    window_starts = _sentence_starts(window, window_spaced, document.normalize_ascii)
+    new_starts = starts[:first]
+    new_starts.extend(window_start + position for position in window_starts[:-1])
+    new_starts.extend(position + shift for position in starts[stop:])
+    new_spaced = spaced[:first] + window_spaced + spaced[stop:]
+    if document.keep_whitespace:
+        sentences = new_spaced
+    else:
+        sentences = (
+            document.sentences[:first] +
+            remove_whitespace(window_spaced) +
+            document.sentences[stop:]
+        )
+    return TokenizedDocument(
+        text,
+        sentences,
+        new_spaced,
+        new_starts,
+        True,
+        split_last_token if stop == num_sentences else document.split_last_token,
+        document.keep_whitespace,
+        document.normalize_ascii,
+        document.abbreviations
+    )
+
+
+def retokenize(document, start, end, replacement):
+    """
+    Replace `document.text[start:end]` with `replacement`, and
+    update the sentences by tokenizing the edited sentences
+    again (along with enough of their neighbors for the split
+    decisions to settle). The result is the same as running
+    `sent_tokenize_document` on the new text.
+
+    Arguments
+    ---------
+        document : TokenizedDocument, left unchanged.
+        start : int
+        end : int
+        replacement : str
+
+    Returns
+    -------
+        TokenizedDocument
+    """
+    if not 0 <= start <= end <= len(document.text):
+        raise ValueError(
+            "edit (%d, %d) is outside of the text (length %d)" % (
+                start, end, len(document.text)
+            )
+        )
+    text = document.text[:start] + replacement + document.text[end:]
+    shift = len(replacement) - (end - start)
+    num_sentences = len(document.spaced_sentences)
+    # sentences overlapping the edit, along with the sentence before
+    # it (its last word may continue into the replacement):
+    first = max(bisect_left(document.starts, start, 0, num_sentences) - 1, 0)
+    stop = bisect_right(document.starts, end, 0, num_sentences)
+    context = CONTEXT_SENTENCES
+    while True:
+        window_first = max(first - context, 0)
+        window_stop = min(stop + context, num_sentences)
+        result = _retokenize_window(document, text, window_first, window_stop, shift)
+        if result is not None:
+            return result
+        # the window covering the whole document is always accepted:
+        context *= 2
@@ -0,0 +1,450 @@
+# -*- coding: utf-8 -*-
+"""
+Tokenization that reports where each token lies in the input
+instead of building a string per token.
+
+Usage
+-----
+
+> with open("corpus.txt", "rb") as fin:
+>     data = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+>     offsets, sentences = ciseau.sent_tokenize_offsets(data)
+
+Offsets are stored in a flat `array` of (start, end) pairs:
+token `i` spans `offsets[2 * i]:offsets[2 * i + 1]`. They count
+characters for `str` inputs, and bytes for utf-8 encoded inputs
+(`bytes`, `memoryview`, `mmap`). Positions always refer to the
+input, even when `normalize_ascii` is set.
+"""
+import codecs
+from array import array
+
+from .constants import SHOULD_SPLIT_BYTE
+from .regular_expressions import (
+    no_punctuation,
+    length_changing_characters,
+    non_ascii_characters,
+    template_group_reference,
+    dash_converter
+)
+from .word_tokenizer import normalize_text, find_split_locations, tokenize, is_ascii
+from .sentence_tokenizer import detect_sentence_boundaries
+
+text_type = type(u"")
+
+
+def offset_typecode(size):
+    """
+    Smallest array typecode able to hold offsets up to `size`.
+    """
+    return "I" if size < (1 << 32) else "Q"
+
+
+def decode_input(data):
+    """
+    Decode utf-8 buffers (bytes, memoryview, mmap) in a single
+    pass; strings are returned as-is.
+
+    Arguments
+    ---------
+        data : str or object supporting the buffer protocol.
+
+    Returns
+    -------
+        tuple<str, int or None> : the text, and the number of
+            bytes of the input if it was encoded (None otherwise).
+    """
+    if isinstance(data, text_type):
+        return data, None
+    text = codecs.decode(data, "utf-8")
+    return text, len(memoryview(data))
+
+
+def normalized_to_raw_offsets(text, offsets):
+    """
+    Convert in place a sorted array of offsets into the ascii
+    normalized version of `text` into offsets into `text`.
+
+    Arguments
+    ---------
+        text : str, text before normalization.
+        offsets : array<int>, nondecreasing offsets.
+    """
+    # normalized position minus raw position:
+    shift = 0
+    i = 0
+    num_offsets = len(offsets)
+    for match in length_changing_characters.finditer(text):
+        normalized_start = match.start() + shift
+        while i < num_offsets and offsets[i] <= normalized_start:
+            offsets[i] -= shift
+            i += 1
+        if match.group(0)[0] == "-":
+            # a run of dashes becomes a single dash:
+            shift += 1 - len(match.group(0))
+        else:
+            # œ -> oe, æ -> ae:
+            shift += 1
+    while i < num_offsets:
+        offsets[i] -= shift
+        i += 1
+
+
+def characters_to_bytes_offsets(text, offsets):
+    """
+    Convert in place a sorted array of character offsets
+    into `text` into offsets in its utf-8 encoding.
+
+    Arguments
+    ---------
+        text : str
+        offsets : array<int>, nondecreasing offsets.
+    """
+    # byte position minus character position:
+    shift = 0
+    i = 0
+    num_offsets = len(offsets)
+    for match in non_ascii_characters.finditer(text):
+        start, end = match.span()
+        while i < num_offsets and offsets[i] <= start:
+            offsets[i] += shift
+            i += 1
+        while i < num_offsets and offsets[i] < end:
+            # offset within a run of multi-byte characters:
+            offsets[i] = shift + start + len(text[start:offsets[i]].encode("utf-8"))
+            i += 1
+        shift += len(match.group(0).encode("utf-8")) - (end - start)
+    while i < num_offsets:
+        offsets[i] += shift
+        i += 1
+
+
+def _to_input_offsets(text, offsets, normalized, num_bytes):
+    if normalized:
+        normalized_to_raw_offsets(text, offsets)
+    if num_bytes is not None and num_bytes != len(text):
+        characters_to_bytes_offsets(text, offsets)
+
+
+def _strip_ends(text, offsets):
+    # move each token end before its trailing whitespace:
+    for i in range(1, len(offsets), 2):
+        start = offsets[i - 1]
+        end = offsets[i]
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        offsets[i] = end
+
+
+def _token_offsets(text, normalize_ascii, typecode):
+    # (start, end) offsets of the tokens of `tokenize` (with their
+    # whitespace) in the normalized text, returned along with them
+    # and whether `text` was normalized:
+    offsets = array(typecode)
+    if no_punctuation.match(text):
+        offsets.extend((0, len(text)))
+        return text, offsets, False
+    normalized_text = normalize_text(text) if normalize_ascii else text
+    split_locations = find_split_locations(normalized_text, normalize_ascii)
+    start = 0
+    pos = split_locations.find(SHOULD_SPLIT_BYTE, 1)
+    while pos != -1:
+        offsets.append(start)
+        offsets.append(pos)
+        start = pos
+        pos = split_locations.find(SHOULD_SPLIT_BYTE, pos + 1)
+    offsets.append(start)
+    offsets.append(len(normalized_text))
+    return normalized_text, offsets, normalize_ascii
+
+
+def tokenize_offsets(data, keep_whitespace=True, normalize_ascii=True):
+    """
+    Same as `tokenize`, but return the position of each token
+    in the input rather than the tokens themselves. No string
+    is created per token.
+
+    Arguments:
+    ----------
+        data : str, bytes, memoryview, or mmap (utf-8).
+        keep_whitespace : bool, whether token ends include
+            the whitespace attached to them.
+        normalize_ascii : bool, tokenize as if some non-ascii
+            characters were canonicalized (see `tokenize`).
+
+    Returns:
+    --------
+        array<int> : flat (start, end) pairs for each token,
+            in characters for str inputs, in bytes otherwise.
+    """
+    text, num_bytes = decode_input(data)
+    typecode = offset_typecode(len(text) if num_bytes is None else num_bytes)
+    if len(text) == 0:
+        return array(typecode)
+    normalized_text, offsets, normalized = _token_offsets(text, normalize_ascii, typecode)
+    if not keep_whitespace:
+        _strip_ends(normalized_text, offsets)
+    _to_input_offsets(text, offsets, normalized, num_bytes)
+    return offsets
+
+
+def _sent_tokenize_with_offsets(text, keep_whitespace, normalize_ascii):
+    # sentences (with whitespace) along with the character offsets
+    # of their tokens in `text` and the sentence boundaries:
+    typecode = offset_typecode(len(text))
+    offsets = array(typecode)
+    boundaries = array(typecode, [0])
+    if len(text) == 0:
+        return [], offsets, boundaries
+    sentences = detect_sentence_boundaries(tokenize(text, normalize_ascii))
+    start = 0
+    for sentence in sentences:
+        for word in sentence:
+            offsets.append(start)
+            start += len(word)
+            offsets.append(start if keep_whitespace else start - len(word) + len(word.rstrip()))
+        boundaries.append(len(offsets) // 2)
+    if normalize_ascii and not no_punctuation.match(text):
+        normalized_to_raw_offsets(text, offsets)
+    return sentences, offsets, boundaries
+
+
+def sent_tokenize_offsets(data, keep_whitespace=False, normalize_ascii=True):
+    """
+    Same as `sent_tokenize`, but return the position of each
+    token in the input, along with the index of the first
+    token of each sentence. Token strings are only kept
+    while sentence boundaries are detected.
+
+    Arguments:
+    ----------
+        data : str, bytes, memoryview, or mmap (utf-8).
+        keep_whitespace : bool, whether token ends include
+            the whitespace attached to them.
+        normalize_ascii : bool, tokenize as if some non-ascii
+            characters were canonicalized (see `sent_tokenize`).
+
+    Returns:
+    --------
+        tuple<array<int>, array<int>> : flat (start, end) pairs
+            for each token (in characters for str inputs, in bytes
+            otherwise), and sentence boundaries: sentence `i` holds
+            tokens `boundaries[i]` up to `boundaries[i + 1]`.
+    """
+    text, num_bytes = decode_input(data)
+    _, offsets, boundaries = _sent_tokenize_with_offsets(
+        text, keep_whitespace, normalize_ascii
+    )
+    if num_bytes is not None:
+        typecode = offset_typecode(num_bytes)
+        if typecode != offsets.typecode:
+            offsets = array(typecode, offsets)
+            boundaries = array(typecode, boundaries)
+        if num_bytes != len(text):
+            characters_to_bytes_offsets(text, offsets)
+    return offsets, boundaries
+
+
+def tokenize_spans(text, normalize_ascii=True, keep_whitespace=True):
+    """
+    Same as `tokenize`, but pair each token with its
+    position in `text` (unaffected by `normalize_ascii`).
+
+    Arguments:
+    ----------
+        text : str
+        normalize_ascii : bool, perform some replacements
+            on non-ascii characters to canonicalize the
+            string (defaults to True).
+        keep_whitespace : bool, whether tokens (and their
+            ends) include the whitespace attached to them.
+
+    Returns:
+    --------
+        list<tuple<str, int, int>> : each token with its
+            start and end character offsets in `text`.
+    """
+    if len(text) == 0:
+        return []
+    normalized_text, offsets, normalized = _token_offsets(
+        text, normalize_ascii, offset_typecode(len(text))
+    )
+    if normalized and not is_ascii(text):
+        # one character for another, as `tokenize` does:
+        normalized_text = dash_converter.sub("-", normalized_text)
+    if not keep_whitespace:
+        _strip_ends(normalized_text, offsets)
+    tokens = [normalized_text[offsets[i]:offsets[i + 1]] for i in range(0, len(offsets), 2)]
+    _to_input_offsets(text, offsets, normalized, None)
+    return [
+        (token, offsets[2 * i], offsets[2 * i + 1])
+        for i, token in enumerate(tokens)
+    ]
+
+
+def spans_from_offsets(sentences, offsets, boundaries, keep_whitespace):
+    """
+    Pair the tokens of each sentence with their (start, end)
+    offsets.
+
+    Arguments:
+    ----------
+        sentences : list<list<str>>, tokens with whitespace.
+        offsets : array<int>, flat (start, end) pairs.
+        boundaries : array<int>, index of the first token of
+            each sentence.
+        keep_whitespace : bool, whether to strip out spaces
+            and newlines from the tokens.
+
+    Returns:
+    --------
+        list<list<tuple<str, int, int>>>
+    """
+    return [
+        [
+            (
+                word if keep_whitespace else word.rstrip(),
+                offsets[2 * i],
+                offsets[2 * i + 1]
+            )
+            for i, word in enumerate(sentence, boundaries[j])
+        ]
+        for j, sentence in enumerate(sentences)
+    ]
+
+
+def sent_tokenize_spans(text, keep_whitespace=False, normalize_ascii=True):
+    """
+    Same as `sent_tokenize`, but pair each token with its
+    position in `text` (unaffected by `normalize_ascii`).
+
+    Arguments:
+    ----------
+        text : str, input string to tokenize
+        keep_whitespace : bool, whether to strip out spaces
+            and newlines.
+        normalize_ascii : bool, perform some replacements
+            on rare characters so that they become
+            easier to process in a ascii pipeline
+            (canonicalize dashes, replace œ -> oe, etc..)
+
+    Returns:
+    --------
+        list<list<tuple<str, int, int>>> : sentences, holding each
+            token with its start and end character offsets in `text`.
+    """
+    sentences, offsets, boundaries = _sent_tokenize_with_offsets(
+        text, keep_whitespace, normalize_ascii
+    )
+    return spans_from_offsets(sentences, offsets, boundaries, keep_whitespace)
+
+
+def _parse_template(template):
+    # split a replacement template into literal strings
+    # and group references (ints or names):
+    parts = []
+    position = 0
+    for match in template_group_reference.finditer(template):
+        if match.start() > position:
+            parts.append((False, template[position:match.start()]))
+        name = match.group(1) or match.group(2)
+        parts.append((True, int(name) if name.isdigit() else name))
+        position = match.end()
+    if position < len(template):
+        parts.append((False, template[position:]))
+    return parts
+
+
+def _next_group_start(match, parts, index):
+    # start of the first matched group referenced by parts[index:]
+    # (or the end of the match):
+    for is_group, part in parts[index:]:
+        if is_group:
+            group_start = match.start(part)
+            if group_start != -1:
+                return group_start
+    return match.end()
+
+
+def substitute_with_offsets(regex, replacement, text, starts, ends):
+    """
+    Same as `regex.sub(replacement, text)`, while keeping track
+    of the span of the original document that each character
+    comes from. Characters copied from the text (outside of
+    matches, or through a group of the replacement) keep their
+    span, while inserted characters cover the part of the match
+    between the neighboring group references of the template
+    (or the whole match when that part is empty).
+
+    Arguments:
+    ----------
+        regex : re.Expression
+        replacement : str, template (with \\g<name> or \\1 group
+            references), or function returning one of the groups
+            of the match (or the whole match) or a new string. A
+            function with a `template` attribute returns either the
+            whole match or the expansion of that template.
+        text : str
+        starts : array<int>, start in the original document for
+            each character of text, plus one final entry (the
+            length of the document).
+        ends : array<int>, end in the original document for each
+            character of text, plus one final entry.
+
+    Returns:
+    --------
+        tuple<str, array<int>, array<int>> : the new text, and the
+            starts and ends of its characters.
+    """
+    function = replacement if callable(replacement) else None
+    template = replacement if function is None else getattr(function, "template", None)
+    template = None if template is None else _parse_template(template)
+    pieces = []
+    new_starts = array(starts.typecode)
+    new_ends = array(ends.typecode)
+    position = 0
+    for match in regex.finditer(text):
+        start, end = match.span()
+        pieces.append(text[position:start])
+        new_starts.extend(starts[position:start])
+        new_ends.extend(ends[position:start])
+        position = end
+        if function is not None:
+            value = function(match)
+        if function is not None and (template is None or value == match.group(0)):
+            parts = [(False, value)]
+            for group in range(1, regex.groups + 1):
+                if match.group(group) == value:
+                    parts = [(True, group)]
+                    break
+            else:
+                if match.group(0) == value:
+                    parts = [(True, 0)]
+        else:
+            parts = template
+        previous_end = start
+        for i, (is_group, part) in enumerate(parts):
+            if is_group:
+                group_start, group_end = match.span(part)
+                if group_start == -1:
+                    continue
+                pieces.append(text[group_start:group_end])
+                new_starts.extend(starts[group_start:group_end])
+                new_ends.extend(ends[group_start:group_end])
+                previous_end = group_end
+            elif len(part) > 0:
+                span_start, span_end = previous_end, _next_group_start(match, parts, i + 1)
+                if span_end <= span_start:
+                    span_start, span_end = start, end
+                pieces.append(part)
+                new_starts.extend(array(starts.typecode, [starts[span_start]]) * len(part))
+                new_ends.extend(
+                    array(
+                        ends.typecode,
+                        [ends[span_end - 1] if span_end > span_start else starts[span_start]]
+                    ) * len(part)
+                )
+    pieces.append(text[position:])
+    new_starts.extend(starts[position:])
+    new_ends.extend(ends[position:])
+    return u"".join(pieces), new_starts, new_ends
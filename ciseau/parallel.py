@@ -0,0 +1,491 @@
+"""
+Tokenize many documents using a pool of worker processes.
+
+Usage
+-----
+
+> for sentences in ciseau.sent_tokenize_many(documents, processes=8):
+>     ...
+
+Documents are grouped into batches before being sent to the
+workers, and results are streamed back as a generator. Pass
+an existing `multiprocessing.Pool` with `pool=` to reuse the
+same workers across calls.
+
+`sent_tokenize_compact_many` only sends back where each token and
+sentence starts, written by the workers to shared memory, and
+returns `CompactSentences` over the texts held by the parent.
+"""
+import multiprocessing
+import os
+import sys
+from array import array
+from collections import deque
+from functools import partial
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    # Python < 3.8: offsets are sent back through the result pipe
+    shared_memory = None
+if shared_memory is not None and os.name == "posix":
+    # shared memory blocks are registered with a resource tracker
+    # process, which unlinks those left over when it stops:
+    from multiprocessing import resource_tracker
+else:
+    resource_tracker = None
+
+from .word_tokenizer import tokenize, tokenize_batch, tokenized_text
+from .sentence_tokenizer import sent_tokenize, detect_sentence_boundaries
+from .compact import (
+    CompactSentences,
+    sent_tokenize_compact,
+    _array_frombytes,
+    _array_tobytes
+)
+from .offsets import offset_typecode
+from .wiki_markup_processing import (
+    to_raw_text,
+    to_raw_text_markupless,
+    to_raw_text_pairings
+)
+
+# upper bound on the number of characters sent to a worker at once,
+# so that a few large documents do not make up a huge batch:
+BATCH_CHARACTERS = 1 << 20
+# number of batches kept in flight for each worker process:
+BATCHES_PER_PROCESS = 4
+# how often unordered results are checked on Python 2 (seconds):
+POLL_INTERVAL = 0.01
+
+TOKENIZERS = {
+    "tokenize": tokenize,
+    "sent_tokenize": sent_tokenize,
+    "to_raw_text": to_raw_text,
+    "to_raw_text_markupless": to_raw_text_markupless,
+    "to_raw_text_pairings": to_raw_text_pairings
+}
+
+
+def _tokenize_batch(function_name, kwargs, texts):
+    if function_name == "tokenize":
+        # the regular expressions run once over all the texts:
+        return tokenize_batch(texts, **kwargs)
+    function = TOKENIZERS[function_name]
+    # generators (e.g. to_raw_text_pairings) cannot be sent back
+    # to the parent process, so materialize their output:
+    return [list(function(text, **kwargs)) for text in texts]
+
+
+def batch_texts(texts, chunksize):
+    """
+    Group an iterable of strings into lists of at most
+    `chunksize` strings (and roughly `BATCH_CHARACTERS`
+    characters).
+
+    Arguments
+    ---------
+        texts : iterable<str>
+        chunksize : int, maximum number of strings per batch.
+
+    Returns
+    -------
+        generator<list<str>>
+    """
+    batch = []
+    batch_characters = 0
+    for text in texts:
+        batch.append(text)
+        batch_characters += len(text)
+        if len(batch) >= chunksize or batch_characters >= BATCH_CHARACTERS:
+            yield batch
+            batch = []
+            batch_characters = 0
+    if len(batch) > 0:
+        yield batch
+
+
+def _next_finished(submitted):
+    # Python 2 pools have no error_callback, and a batch that cannot be
+    # sent calls no callback at all, so the results are polled instead:
+    while True:
+        for index, result in enumerate(submitted):
+            if result.ready():
+                del submitted[index]
+                return result
+        submitted[0].wait(POLL_INTERVAL)
+
+
+def _map_batches(pool, function, batches, ordered, max_pending):
+    if ordered:
+        pending = deque()
+        for batch in batches:
+            pending.append(pool.apply_async(function, (batch,)))
+            if len(pending) >= max_pending:
+                yield pending.popleft().get()
+        while len(pending) > 0:
+            yield pending.popleft().get()
+    elif sys.version_info[0] < 3:
+        submitted = []
+        for batch in batches:
+            submitted.append(pool.apply_async(function, (batch,)))
+            while len(submitted) >= max_pending or any(result.ready() for result in submitted):
+                yield _next_finished(submitted).get()
+        while len(submitted) > 0:
+            yield _next_finished(submitted).get()
+    else:
+        finished = queue.Queue()
+        num_pending = 0
+        for batch in batches:
+            pool.apply_async(
+                function,
+                (batch,),
+                callback=lambda result: finished.put((True, result)),
+                error_callback=lambda error: finished.put((False, error))
+            )
+            num_pending += 1
+            while num_pending >= max_pending or not finished.empty():
+                success, result = finished.get()
+                num_pending -= 1
+                if not success:
+                    raise result
+                yield result
+        while num_pending > 0:
+            success, result = finished.get()
+            num_pending -= 1
+            if not success:
+                raise result
+            yield result
+
+
+def tokenize_many_with(function_name, texts, processes=None, chunksize=64,
+                       ordered=True, pool=None, **kwargs):
+    """
+    Apply one of the tokenization functions of ciseau to
+    each string of an iterable using worker processes.
+
+    Arguments
+    ---------
+        function_name : str, one of "tokenize", "sent_tokenize",
+            "to_raw_text", "to_raw_text_markupless", or
+            "to_raw_text_pairings".
+        texts : iterable<str>, documents to tokenize (consumed
+            lazily).
+        processes : int or None, number of worker processes to
+            start when no pool is given (defaults to the number
+            of cpus). With `processes=1` the documents are
+            tokenized in the current process.
+        chunksize : int, number of documents sent to a worker
+            at once.
+        ordered : bool, yield results in the order of the inputs
+            (otherwise in the order in which they complete).
+        pool : multiprocessing.Pool or None, reuse these workers
+            (left open after the call).
+        **kwargs : passed on to the tokenization function
+            (e.g. keep_whitespace, normalize_ascii).
+
+    Returns
+    -------
+        generator : the output of the tokenization function for
+            each document.
+    """
+    return map_batches(
+        partial(_tokenize_batch, function_name, kwargs), texts, processes=processes,
+        chunksize=chunksize, ordered=ordered, pool=pool
+    )
+
+
+def map_batches(worker, texts, processes=None, chunksize=64, ordered=True, pool=None):
+    """
+    Apply a function to batches of strings using worker
+    processes (see `tokenize_many_with`).
+
+    Arguments
+    ---------
+        worker : picklable function(list<str>) returning one
+            result per string.
+        texts : iterable<str>
+        processes : int or None, number of worker processes
+            (1 runs in the current process).
+        chunksize : int, number of strings per batch.
+        ordered : bool, yield results in the order of the inputs.
+        pool : multiprocessing.Pool or None, reuse these workers.
+
+    Returns
+    -------
+        generator : results of `worker` for each string.
+    """
+    batches = batch_texts(texts, chunksize)
+    if pool is None and processes == 1:
+        for batch in batches:
+            for result in worker(batch):
+                yield result
+        return
+
+    for results in _pool_map_batches(worker, batches, processes, ordered, pool):
+        for result in results:
+            yield result
+
+
+def _pool_map_batches(worker, batches, processes, ordered, pool):
+    # results of `worker` for each batch, from `pool` or from a pool
+    # of `processes` workers started (and stopped) here:
+    owns_pool = pool is None
+    if owns_pool:
+        pool = multiprocessing.Pool(processes)
+    try:
+        max_pending = BATCHES_PER_PROCESS * max(1, getattr(pool, "_processes", 1))
+        for results in _map_batches(pool, worker, batches, ordered, max_pending):
+            yield results
+    finally:
+        if owns_pool:
+            pool.terminate()
+            pool.join()
+
+
+def tokenize_many(texts, processes=None, chunksize=64, ordered=True,
+                  pool=None, normalize_ascii=True, max_length=None,
+                  abbreviations=None):
+    """
+    Parallel version of `tokenize` over an iterable of
+    strings (see `tokenize_many_with` for the arguments).
+
+    Returns
+    -------
+        generator<list<str>>
+    """
+    return tokenize_many_with(
+        "tokenize", texts, processes=processes, chunksize=chunksize,
+        ordered=ordered, pool=pool, normalize_ascii=normalize_ascii,
+        max_length=max_length, abbreviations=abbreviations
+    )
+
+
+def sent_tokenize_many(texts, processes=None, chunksize=64, ordered=True,
+                       pool=None, keep_whitespace=False, normalize_ascii=True,
+                       max_length=None, abbreviations=None):
+    """
+    Parallel version of `sent_tokenize` over an iterable of
+    strings (see `tokenize_many_with` for the arguments).
+
+    Returns
+    -------
+        generator<list<list<str>>>
+    """
+    return tokenize_many_with(
+        "sent_tokenize", texts, processes=processes, chunksize=chunksize,
+        ordered=ordered, pool=pool, keep_whitespace=keep_whitespace,
+        normalize_ascii=normalize_ascii, max_length=max_length,
+        abbreviations=abbreviations
+    )
+
+
+def _sent_tokenize_offsets_batch(kwargs, job):
+    # token and sentence boundaries of each text (see `CompactSentences`),
+    # written to the shared memory block `name` (or returned as bytes
+    # when it is None): the number of offsets and of boundaries of each
+    # text, then the offsets of all texts, then their boundaries:
+    key, name, typecode, texts = job
+    counts = array(typecode)
+    offsets = array(typecode)
+    boundaries = array(typecode)
+    for text in texts:
+        sentences = detect_sentence_boundaries(tokenize(text, **kwargs))
+        num_offsets = len(offsets)
+        num_boundaries = len(boundaries)
+        offsets.append(0)
+        boundaries.append(0)
+        position = 0
+        for sentence in sentences:
+            for token in sentence:
+                position += len(token)
+                offsets.append(position)
+            boundaries.append(len(offsets) - 1 - num_offsets)
+        counts.append(len(offsets) - num_offsets)
+        counts.append(len(boundaries) - num_boundaries)
+    if name is None:
+        return key, b"".join(map(_array_tobytes, (counts, offsets, boundaries)))
+    block = shared_memory.SharedMemory(name)
+    if resource_tracker is not None:
+        # attaching registers the block with the resource tracker of this
+        # worker (its own when it was forked before the one of the parent
+        # started), which would unlink it again when the worker stops. The
+        # parent registers it again before unlinking it (see `_release`):
+        resource_tracker.unregister(block._name, "shared_memory")
+    try:
+        position = 0
+        for values in (counts, offsets, boundaries):
+            size = len(values) * values.itemsize
+            block.buf[position:position + size] = memoryview(values).cast("B")
+            position += size
+    finally:
+        block.close()
+    return key, None
+
+
+def _read_compact_batch(data, typecode, texts, strip):
+    # `CompactSentences` of each text from the output of
+    # `_sent_tokenize_offsets_batch` (copied out of `data`):
+    itemsize = array(typecode).itemsize
+    counts = array(typecode)
+    _array_frombytes(counts, data[:2 * len(texts) * itemsize])
+    position = len(counts) * itemsize
+    offsets = array(typecode)
+    _array_frombytes(offsets, data[position:position + sum(counts[0::2]) * itemsize])
+    position += len(offsets) * itemsize
+    boundaries = array(typecode)
+    _array_frombytes(boundaries, data[position:position + sum(counts[1::2]) * itemsize])
+    results = []
+    offsets_start = 0
+    boundaries_start = 0
+    for index, text in enumerate(texts):
+        offsets_end = offsets_start + counts[2 * index]
+        boundaries_end = boundaries_start + counts[2 * index + 1]
+        results.append(CompactSentences(
+            text,
+            offsets[offsets_start:offsets_end],
+            boundaries[boundaries_start:boundaries_end],
+            strip
+        ))
+        offsets_start = offsets_end
+        boundaries_start = boundaries_end
+    return results
+
+
+def _release(block):
+    if block is not None:
+        if resource_tracker is not None:
+            resource_tracker.register(block._name, "shared_memory")
+        block.close()
+        block.unlink()
+
+
+def sent_tokenize_compact_many(texts, processes=None, chunksize=64, ordered=True,
+                               pool=None, keep_whitespace=False, normalize_ascii=True,
+                               max_length=None, abbreviations=None):
+    """
+    Parallel version of `sent_tokenize_compact` over an
+    iterable of strings (see `tokenize_many_with` for the
+    arguments).
+
+    Workers send back no strings: they write where each
+    token and sentence starts to a shared memory block
+    (4 bytes per token and per sentence for texts under
+    4GB), and each result is a `CompactSentences` over the
+    text held by this process (normalized again here when
+    `normalize_ascii` replaces characters).
+
+    Returns
+    -------
+        generator<CompactSentences>
+    """
+    kwargs = {
+        "normalize_ascii": normalize_ascii,
+        "max_length": max_length,
+        "abbreviations": abbreviations
+    }
+    if pool is None and processes == 1:
+        for text in texts:
+            yield sent_tokenize_compact(text, keep_whitespace, **kwargs)
+        return
+
+    # shared memory block and tokenized texts of the batches sent to the
+    # workers (blocks are created and unlinked by this process, so that
+    # none is left behind when the generator is closed early):
+    pending = {}
+
+    def jobs():
+        for key, batch in enumerate(batch_texts(texts, chunksize)):
+            tokenized = [tokenized_text(text, normalize_ascii) for text in batch]
+            # a text of n characters has at most n tokens (or a single
+            # empty one), so each text needs at most n + 2 offsets and
+            # as many sentence boundaries:
+            typecode = offset_typecode(max(map(len, tokenized)) + 2)
+            block = None
+            if shared_memory is not None:
+                block = shared_memory.SharedMemory(create=True, size=array(typecode).itemsize * (
+                    2 * len(batch) + 2 * sum(len(text) + 2 for text in tokenized)
+                ))
+            pending[key] = (block, typecode, tokenized)
+            yield key, None if block is None else block.name, typecode, batch
+
+    batches = _pool_map_batches(
+        partial(_sent_tokenize_offsets_batch, kwargs), jobs(), processes, ordered, pool
+    )
+    try:
+        for key, data in batches:
+            block, typecode, tokenized = pending.pop(key)
+            try:
+                results = _read_compact_batch(
+                    data if block is None else block.buf, typecode, tokenized,
+                    not keep_whitespace
+                )
+            finally:
+                _release(block)
+            for result in results:
+                yield result
+    finally:
+        batches.close()
+        for block, _, _ in pending.values():
+            _release(block)
+
+
+def to_raw_text_many(texts, processes=None, chunksize=64, ordered=True,
+                     pool=None, keep_whitespace=False, normalize_ascii=True,
+                     max_length=None):
+    """
+    Parallel version of `to_raw_text` over an iterable of
+    strings (see `tokenize_many_with` for the arguments).
+
+    Returns
+    -------
+        generator<list<list<str>>>
+    """
+    return tokenize_many_with(
+        "to_raw_text", texts, processes=processes, chunksize=chunksize,
+        ordered=ordered, pool=pool, keep_whitespace=keep_whitespace,
+        normalize_ascii=normalize_ascii, max_length=max_length
+    )
+
+
+def to_raw_text_markupless_many(texts, processes=None, chunksize=64, ordered=True,
+                                pool=None, keep_whitespace=False, normalize_ascii=True,
+                                max_length=None):
+    """
+    Parallel version of `to_raw_text_markupless` over an
+    iterable of strings (see `tokenize_many_with` for the
+    arguments).
+
+    Returns
+    -------
+        generator<list<list<str>>>
+    """
+    return tokenize_many_with(
+        "to_raw_text_markupless", texts, processes=processes, chunksize=chunksize,
+        ordered=ordered, pool=pool, keep_whitespace=keep_whitespace,
+        normalize_ascii=normalize_ascii, max_length=max_length
+    )
+
+
+def to_raw_text_pairings_many(texts, processes=None, chunksize=64, ordered=True,
+                              pool=None, keep_whitespace=False, normalize_ascii=True,
+                              max_length=None):
+    """
+    Parallel version of `to_raw_text_pairings` over an
+    iterable of strings (see `tokenize_many_with` for the
+    arguments).
+
+    Returns
+    -------
+        generator<list<list<str>>>
+    """
+    return tokenize_many_with(
+        "to_raw_text_pairings", texts, processes=processes, chunksize=chunksize,
+        ordered=ordered, pool=pool, keep_whitespace=keep_whitespace,
+        normalize_ascii=normalize_ascii, max_length=max_length
+    )
@@ -0,0 +1,200 @@
+"""
+Opt-in instrumentation of the tokenization pipeline.
+
+Usage
+-----
+
+> with ciseau.profile() as profile:
+>     ciseau.to_raw_text(article)
+> print(profile.table())
+
+While a profile is active, every regular expression pass of
+`tokenize` and every stage of `sent_tokenize` and `to_raw_text`
+records its wall time, the length of its input and the number
+of matches it found (passes of `tokenize` that are skipped on
+an input, as they cannot fire on it, record nothing). Results
+accumulate across calls until the profile is exited. When no
+profile is active, the pipeline only pays for one attribute
+lookup per function call.
+
+The active profile is shared by all threads of the process, and
+is not propagated to worker processes.
+"""
+import time
+from collections import OrderedDict
+
+# profile receiving the measurements (None when profiling is off):
+active = None
+
+# (Python 2 has no perf_counter):
+_perf_counter = getattr(time, "perf_counter", time.time)
+
+
+class StageStatistics(object):
+    __slots__ = ("calls", "seconds", "input_length", "matches", "alternatives")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.input_length = 0
+        self.matches = None
+        self.alternatives = None
+
+    def add_matches(self, matches, alternatives=None):
+        self.matches = (self.matches or 0) + matches
+        if alternatives is not None:
+            if self.alternatives is None:
+                self.alternatives = OrderedDict()
+            for name, count in alternatives.items():
+                self.alternatives[name] = self.alternatives.get(name, 0) + count
+
+    def as_dict(self):
+        out = OrderedDict([
+            ("calls", self.calls),
+            ("seconds", self.seconds),
+            ("input_length", self.input_length)
+        ])
+        if self.matches is not None:
+            out["matches"] = self.matches
+        if self.alternatives is not None:
+            out["alternatives"] = self.alternatives
+        return out
+
+
+class Profile(object):
+    """
+    Measurements of the pipeline stages, keyed by stage name
+    (e.g. 'tokenize/url_file_finder', 'to_raw_text/date_remover').
+    Time spent in a stage includes the stages it calls (e.g.
+    'sent_tokenize/tokenize' includes all 'tokenize/...' passes,
+    and the matches the profile counts for them).
+    """
+    def __init__(self):
+        self.stages = OrderedDict()
+        self._previous = None
+
+    def __enter__(self):
+        global active
+        self._previous = active
+        active = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global active
+        active = self._previous
+        self._previous = None
+
+    def stage(self, name):
+        """
+        Statistics for a stage, created on first use.
+        """
+        statistics = self.stages.get(name)
+        if statistics is None:
+            statistics = StageStatistics()
+            self.stages[name] = statistics
+        return statistics
+
+    def record(self, name, seconds, input_length, matches=None, alternatives=None):
+        statistics = self.stage(name)
+        statistics.calls += 1
+        statistics.seconds += seconds
+        statistics.input_length += input_length
+        if matches is not None:
+            statistics.add_matches(matches, alternatives)
+
+    def call(self, name, input_length, function, *args):
+        """
+        Call `function(*args)` and record its wall time.
+        """
+        t0 = _perf_counter()
+        result = function(*args)
+        self.record(name, _perf_counter() - t0, input_length)
+        return result
+
+    def mark(self, name, find_matches, mark, text, split_locations):
+        """
+        Run a split location pass `mark(text, split_locations)`,
+        recording its wall time along with the number of matches
+        of `find_matches(text)` (counted outside of the timed
+        region, and broken down by alternative for combined
+        expressions).
+        """
+        t0 = _perf_counter()
+        mark(text, split_locations)
+        seconds = _perf_counter() - t0
+        matches = None
+        alternatives = None
+        if find_matches is not None:
+            matches = 0
+            for match in find_matches(text):
+                matches += 1
+                group = match.lastgroup
+                if group is not None:
+                    if alternatives is None:
+                        alternatives = OrderedDict()
+                    alternatives[group] = alternatives.get(group, 0) + 1
+        self.record(name, seconds, len(text), matches, alternatives)
+
+    def substitute(self, name, regex, replacement, text):
+        """
+        Same as `regex.sub(replacement, text)`, recording the
+        wall time and the number of substitutions.
+        """
+        t0 = _perf_counter()
+        out, matches = regex.subn(replacement, text)
+        self.record(name, _perf_counter() - t0, len(text), matches)
+        return out
+
+    def as_dict(self):
+        return OrderedDict(
+            (name, statistics.as_dict()) for name, statistics in self.stages.items()
+        )
+
+    def to_json(self, **kwargs):
+        """
+        Measurements as a JSON string (keyword arguments are
+        passed on to `json.dumps`).
+        """
+        # imported here as most programs never export a profile:
+        import json
+        return json.dumps(self.as_dict(), **kwargs)
+
+    def table(self, sort_by_time=False):
+        """
+        Measurements as a human readable table, in pipeline
+        order or from the slowest stage to the fastest.
+        """
+        stages = list(self.stages.items())
+        if sort_by_time:
+            stages.sort(key=lambda item: item[1].seconds, reverse=True)
+        width = max([len("stage")] + [len(name) for name, _ in stages])
+        lines = ["%-*s %8s %12s %14s %10s" % (
+            width, "stage", "calls", "total ms", "input length", "matches"
+        )]
+        for name, statistics in stages:
+            lines.append("%-*s %8d %12.3f %14d %10s" % (
+                width,
+                name,
+                statistics.calls,
+                1e3 * statistics.seconds,
+                statistics.input_length,
+                "" if statistics.matches is None else statistics.matches
+            ))
+            if statistics.alternatives is not None:
+                for alternative, count in statistics.alternatives.items():
+                    lines.append("%-*s %8s %12s %14s %10d" % (
+                        width, "  " + str(alternative), "", "", "", count
+                    ))
+        return "\n".join(lines)
+
+
+def profile():
+    """
+    Record per-stage measurements for all tokenization calls
+    made inside a `with` block.
+
+    Returns
+    -------
+        Profile : context manager holding the measurements.
+    """
+    return Profile()
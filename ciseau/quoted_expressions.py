@@ -6,15 +6,65 @@ from .constants import (
     CONTINUE_PUNCT_SYMBOLS
 )
 
-def group_quoted_tokens(tokens):
-    sentences = []
-    opening_symbols = OPENING_SYMBOLS.copy()
-    closing_symbols = CLOSING_SYMBOLS.copy()
+def _ignore_symbol(closing_symbol, opening_symbols, closing_symbols):
+    # symbols without a closing symbol and its opening counterpart
+    # (new sets, leaving the shared ones untouched):
+    return (
+        opening_symbols - {CLOSE_2_OPEN[closing_symbol]},
+        closing_symbols - {closing_symbol}
+    )
+
+
+def find_quoted_sections(tokens, quotes_after=0):
+    """
+    Pair the opening and closing symbols (parentheses, brackets
+    and quotes) starting the tokens.
+
+    Arguments:
+    ----------
+        tokens : list<str>
+        quotes_after : int, number of tokens starting with '"'
+            that follow `tokens` (when they are part of a longer
+            list of tokens).
+
+    Returns:
+    --------
+        tuple<list<tuple<int, int>>, bool> : (start, end) of the
+            outermost quoted sections, in reverse order, and
+            whether every symbol was paired (none was left open,
+            or closed nothing or another symbol).
+    """
+    sections, balanced, _ = pair_symbols(tokens, quotes_after)
+    return sections, balanced
+
+
+def pair_symbols(tokens, quotes_after=0):
+    """
+    Same as `find_quoted_sections`, also returning the
+    index of the first token opening a symbol that is
+    left open (or None).
+    """
+    # most texts never ignore a symbol, so the constant sets are
+    # only copied when one is (see `_ignore_symbol`):
+    opening_symbols = OPENING_SYMBOLS
+    closing_symbols = CLOSING_SYMBOLS
 
     inside = []
+    # number of '"' symbols currently held in `inside`:
+    inside_double_quotes = 0
     observed_opens = 0
     open_closed_sections = []
 
+    # remaining_quotes[idx] counts the tokens starting with '"'
+    # located strictly after position idx:
+    remaining_quotes = [0] * len(tokens)
+    num_quotes = quotes_after
+    balanced = True
+    for idx in range(len(tokens) - 1, -1, -1):
+        remaining_quotes[idx] = num_quotes
+        if tokens[idx][0] == '"':
+            num_quotes += 1
+
     for idx, word in enumerate(tokens):
         token_stripped = word[0]
         if token_stripped in opening_symbols and token_stripped == '"':
@@ -38,8 +88,8 @@ def group_quoted_tokens(tokens):
                 else:
                     # we are not within a quoted section, we resort to counting
                     # to see what is the best opening-closing strategy
-                    num_expected_future_quotes = sum(symbol == '"' for symbol, _ in inside) + 1
-                    num_future_quotes = sum(token[0] == '"' for token in tokens[idx+1:])
+                    num_expected_future_quotes = inside_double_quotes + 1
+                    num_future_quotes = remaining_quotes[idx]
                     # find the right amount of quotes:
                     if num_expected_future_quotes == num_future_quotes:
                         is_open_symbol = True
@@ -77,39 +127,67 @@ def group_quoted_tokens(tokens):
 
         if is_open_symbol:
             inside.append((token_stripped, idx))
+            if token_stripped == '"':
+                inside_double_quotes += 1
             observed_opens += 1
         elif is_close_symbol:
             if len(inside) > 0:
                 if inside[-1][0] == CLOSE_2_OPEN[token_stripped]:
                     open_closed_sections.append((inside[-1][1], idx + 1))
-                    inside.pop()
+                    if inside.pop()[0] == '"':
+                        inside_double_quotes -= 1
                 else:
+                    balanced = False
                     if token_stripped in closing_symbols:
                         # this closing symbol seems to be ignored
-                        closing_symbols.remove(token_stripped)
-                        opening_symbols.remove(CLOSE_2_OPEN[token_stripped])
+                        opening_symbols, closing_symbols = _ignore_symbol(
+                            token_stripped, opening_symbols, closing_symbols
+                        )
                     # from now on ignore this symbol as start or end:
                     inside = [(symbol, start)
                               for symbol, start in inside
                               if symbol != CLOSE_2_OPEN[token_stripped]]
+                    if CLOSE_2_OPEN[token_stripped] == '"':
+                        inside_double_quotes = 0
             else:
+                balanced = False
                 if observed_opens > 0:
                     if token_stripped in closing_symbols:
                         # this closing symbol seems to be ignored
-                        closing_symbols.remove(token_stripped)
-                        opening_symbols.remove(CLOSE_2_OPEN[token_stripped])
+                        opening_symbols, closing_symbols = _ignore_symbol(
+                            token_stripped, opening_symbols, closing_symbols
+                        )
 
+    # keep only the outermost sections (walking backwards, any
+    # section that starts after the last kept one is nested inside it):
     earliest_start = len(tokens)
-    out_tokens = []
-    for start, end in open_closed_sections[::-1]:
-        if start > earliest_start:
-            continue
-        else:
-            if end != earliest_start:
-                out_tokens = tokens[end:earliest_start] + out_tokens
-            out_tokens = [tokens[start:end]] + out_tokens
+    outermost_sections = []
+    for start, end in reversed(open_closed_sections):
+        if start < earliest_start:
+            outermost_sections.append((start, end))
             earliest_start = start
-    if earliest_start > 0:
-        out_tokens = tokens[0:earliest_start] + out_tokens
+    return (
+        outermost_sections,
+        balanced and len(inside) == 0,
+        inside[0][1] if len(inside) > 0 else None
+    )
+
+
+def group_sections(tokens, sections):
+    """
+    Replace each quoted section (see `find_quoted_sections`)
+    by the list of its tokens.
+    """
+    # assemble the output in a single forward pass:
+    out_tokens = []
+    position = 0
+    for start, end in reversed(sections):
+        out_tokens.extend(tokens[position:start])
+        out_tokens.append(tokens[start:end])
+        position = end
+    out_tokens.extend(tokens[position:])
     return out_tokens
 
+
+def group_quoted_tokens(tokens):
+    return group_sections(tokens, find_quoted_sections(tokens)[0])
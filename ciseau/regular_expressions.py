@@ -4,41 +4,206 @@ import sys
 
 from .constants import dashes
 
+
+class LazyPattern(object):
+    """
+    Regular expression compiled on first use rather than when
+    its module is imported (which keeps `import ciseau` cheap in
+    short-lived processes). The first attribute lookup compiles
+    the expression and copies the attributes of the compiled
+    pattern (`search`, `sub`, `groupindex`, ...) onto this
+    object, so that later lookups cost the same as on a pattern
+    returned by `re.compile`.
+    """
+    def __init__(self, pattern, flags=0):
+        self.pattern = pattern
+        self._flags = flags
+
+    def __getattr__(self, name):
+        # only reached for attributes not copied yet:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        compiled = re.compile(self.pattern, self._flags)
+        for attribute in dir(compiled):
+            if not attribute.startswith("_"):
+                self.__dict__[attribute] = getattr(compiled, attribute)
+        return getattr(compiled, name)
+
+    def __reduce__(self):
+        return (LazyPattern, (self.pattern, self._flags))
+
+    def __repr__(self):
+        return "LazyPattern(%r)" % (self.pattern,)
+
+
+def lazy_compile(pattern, flags=0):
+    """
+    Same as `re.compile`, deferring the compilation to the
+    first use of the expression (see `LazyPattern`).
+    """
+    return LazyPattern(pattern, flags)
+
+
 dashes_no_repeats = dashes[:]
 dashes_no_repeats.remove("--+")
 
 matching_dashes = dashes_no_repeats + ["-+"]
 
-word_with_alpha_and_period   = re.compile("^([^\.]+)(\.\s*)$")
-one_letter_long_or_repeating = re.compile("^(?:(?:[a-z])|(?:[a-z](?:\.[a-z])+))$", re.IGNORECASE)
-no_punctuation               = re.compile("^\w+$")
-left_quote_shifter           = re.compile(u"((`‘(?!`))|(‘(?!‘))\s*)(?=.*\w)", re.UNICODE)
-left_quote_converter         = re.compile(u'([«"“]\s*)(?=.*\w)', re.UNICODE)
-left_single_quote_converter  = re.compile(u"(?:(\W|^))('\s*)(?=.*\w)", re.UNICODE)
-right_single_quote_converter = re.compile(u"(['’]+)(?=\W|$)\s*", re.UNICODE)
+word_with_alpha_and_period   = lazy_compile("^([^\.]+)(\.\s*)$")
+one_letter_long_or_repeating = lazy_compile("^(?:(?:[a-z])|(?:[a-z](?:\.[a-z])+))$", re.IGNORECASE)
+no_punctuation               = lazy_compile("^\w+$")
+left_quote_shifter           = lazy_compile(u"((`‘(?!`))|(‘(?!‘))\s*)(?=.*?\w)", re.UNICODE)
+left_quote_converter         = lazy_compile(u'([«"“]\s*)(?=.*?\w)', re.UNICODE)
+left_single_quote_converter  = lazy_compile(u"(?:(\W|^))('\s*)(?=.*?\w)", re.UNICODE)
+right_single_quote_converter = lazy_compile(u"(['’]+)(?=\W|$)\s*", re.UNICODE)
 
 if sys.version_info >= (3,3):
-    repeated_dash_converter = re.compile("--+")
-    dash_converter = re.compile("|".join(dashes_no_repeats))
+    repeated_dash_converter = lazy_compile("--+")
+    dash_converter = lazy_compile("|".join(dashes_no_repeats))
 else:
-    repeated_dash_converter = re.compile(u"--+")
-    dash_converter = re.compile(u"|".join(dashes_no_repeats))
+    repeated_dash_converter = lazy_compile(u"--+")
+    dash_converter = lazy_compile(u"|".join(dashes_no_repeats))
 
-simple_dash_finder           = re.compile("(-\s*)")
-advanced_dash_finder         = re.compile("(" + "|".join(matching_dashes) + ")\s*")
-multi_single_quote_finder    = re.compile("('{2,})\s*")
-url_file_finder              = re.compile("(?:[-a-zA-Z0-9@%._\+~#=]{2,256}://)?"
+simple_dash_finder           = lazy_compile("(-\s*)")
+advanced_dash_finder         = lazy_compile("(" + "|".join(matching_dashes) + ")\s*")
+multi_single_quote_finder    = lazy_compile("('{2,})\s*")
+url_file_finder              = lazy_compile("(?:[-a-zA-Z0-9@%._\+~#=]{2,256}://)?"
                                           "(?:www\.)?[-a-zA-Z0-9@:%\._\+~#=]{2,"
                                           "256}\.[a-z]{2,6}[-a-zA-Z0-9@:%_\+.~#"
                                           "?&//=]*\s*")
-numerical_expression         = re.compile(u"(\d+(?:,\d+)*(?:\.\d+)*(?![a-zA-ZÀ-ż])\s*)")
-remaining_quote_converter    = re.compile(u'(.)(?=["“”»])')
-shifted_ellipses             = re.compile("([\.\!\?¿¡]{2,})\s*")
-shifted_standard_punctuation = re.compile(u"([\(\[\{\}\]\)\!¡\?¿#\$%;~&+=<>|/:,—…])\s*")
-period_mover                 = re.compile(u"([a-zA-ZÀ-ż]{2})([\./])\s+([a-zA-ZÀ-ż]{2})")
-pure_whitespace              = re.compile("\s+")
-english_specific_appendages = re.compile(u"(\w)(?=['’]([dms])\\b)", re.UNICODE)
-english_nots = re.compile(u"(.)(?=n['’]t\\b)", re.UNICODE)
-english_contractions = re.compile(u"(.)(?=['’](ve|ll|re)\\b)")
-french_appendages = re.compile(u"(\\b[tjnlsmdclTJNLSMLDC]|qu)['’](?=[^tdms])")
-word_with_period = re.compile("[^\s\.]+\.{0,1}")
+# Every match of url_file_finder holds a '.' followed by two lowercase
+# letters and preceded by two host characters (see `iter_urls`):
+url_anchor_finder            = lazy_compile(r"\.(?<=[-a-zA-Z0-9@:%\._\+~#=]{2}\.)[a-z]{2}")
+# characters that can belong to a host name (resp. a scheme), matched
+# over the reversed text to find where a run of them ends:
+url_host_characters          = lazy_compile(r"[-a-zA-Z0-9@:%\._\+~#=]*")
+url_scheme_characters        = lazy_compile(r"[-a-zA-Z0-9@%._\+~#=]*")
+numerical_expression         = lazy_compile(u"(\d+(?:,\d+)*(?:\.\d+)*(?![a-zA-ZÀ-ż])\s*)")
+remaining_quote_converter    = lazy_compile(u'(.)(?=["“”»])')
+shifted_ellipses             = lazy_compile("([\.\!\?¿¡]{2,})\s*")
+shifted_standard_punctuation = lazy_compile(u"([\(\[\{\}\]\)\!¡\?¿#\$%;~&+=<>|/:,—…])\s*")
+period_mover                 = lazy_compile(u"([a-zA-ZÀ-ż]{2})([\./])\s+([a-zA-ZÀ-ż]{2})")
+pure_whitespace              = lazy_compile("\s+")
+english_specific_appendages = lazy_compile(u"(\w)(?=['’]([dms])\\b)", re.UNICODE)
+english_nots = lazy_compile(u"(.)(?=n['’]t\\b)", re.UNICODE)
+english_contractions = lazy_compile(u"(.)(?=['’](ve|ll|re)\\b)")
+french_appendages = lazy_compile(u"(\\b[tjnlsmdclTJNLSMLDC]|qu)['’](?=[^tdms])")
+word_with_period = lazy_compile("[^\s\.]+\.{0,1}")
+# the matches of `word_with_period` that end with a period, or begin
+# after one (or at the start of the text), see `protect_shorthand`:
+shorthand_candidate_finder = lazy_compile(r"(?<![^\s.])[^\s.]+\.|(?<![^.])[^\s.]+")
+# characters whose ascii normalization changes the length of the text:
+length_changing_characters = lazy_compile(u"[œæ]|--+")
+non_ascii_characters = lazy_compile(u"[^\x00-\x7f]+")
+period = lazy_compile(r"\.")
+word_character = lazy_compile(r"\w", re.UNICODE)
+# a rough split on whitespace and punctuation (see `coarse_tokenize`):
+coarse_token_finder = lazy_compile(r"\s+|\w+\s*|[^\w\s]\s*", re.UNICODE)
+# group references in a replacement template (\g<name>, \g<1>, \1):
+template_group_reference = lazy_compile(r"\\g<(\w+)>|\\(\d+)")
+
+
+
+def combine_expressions(alternatives):
+    """
+    Build a single regular expression out of several alternatives
+    so that all of them are found in one scan over a string. Each
+    alternative is a (name, first_characters, rest) triplet: the
+    character class its matches start with, and the pattern that
+    follows this first character. The union of first characters
+    is placed up front, which lets the regex engine skip quickly
+    over characters that start no match. Alternatives are tried
+    in the order given, and `match.lastgroup` names the one that
+    fired.
+
+    Arguments
+    ---------
+        alternatives : list<tuple<str, str, str>>
+
+    Returns
+    -------
+        LazyPattern
+    """
+    return lazy_compile(
+        u"[%s](?:%s)" % (
+            u"".join(first for _, first, _ in alternatives),
+            u"|".join(
+                u"(?P<%s>(?<=[%s])%s)" % (name, first, rest)
+                for name, first, rest in alternatives
+            )
+        ),
+        re.UNICODE
+    )
+
+
+# Split locations are found in a handful of scans. Each alternative
+# below reproduces the positions where one of the expressions above
+# places its split markers.
+
+# Matches end where a split should occur:
+split_end_finder = combine_expressions([
+    # pure_whitespace:
+    ("whitespace", u"\\s", u"\\s*"),
+    # left_quote_shifter (whose lookahead "(?=.*?\\w)" is checked
+    # by the caller, see `mark_split_ends`):
+    ("left_quote_shift", u"‘", u"(?:(?<=`‘)|(?![‘\\s]))"),
+    # left_quote_converter (a split after trailing
+    # whitespace is already added by `whitespace`):
+    ("left_quote", u'«"“', u"(?!\\s)"),
+    # french_appendages:
+    ("french_appendage", u"'’", u"(?:(?<=\\b[tjnlsmdclTJNLSMLDC]['’])|(?<=qu['’]))(?=[^tdms])")
+])
+
+# Matches start where a split should occur (after any character
+# other than a newline):
+split_start_finder = combine_expressions([
+    # remaining_quote_converter:
+    ("remaining_quote", u'"“”»', u"(?<=.[\"“”»])"),
+    # english_nots:
+    ("english_not", u"n", u"(?<=.n)['’]t\\b"),
+    # english_contractions:
+    ("english_contraction", u"'’", u"(?<=.['’])(?:ve|ll|re)\\b"),
+    # english_specific_appendages:
+    ("english_appendage", u"'’", u"(?<=\\w['’])[dms]\\b")
+])
+
+# left_single_quote_converter consumes the character preceding the
+# quote, which therefore cannot serve another match. This variant
+# starts on the quote itself and leaves that check to the caller
+# (a leading quote still yields to a second quote that it precedes),
+# along with the final lookahead "(?=.*?\\w)":
+left_single_quote_finder = lazy_compile(
+    u"'(?:(?<=^')(?!'\\s*(?=.*?\\w))|(?<=\\W'))\\s*",
+    re.UNICODE
+)
+# The lookahead "(?=.*?\\w)" (a word follows on the same line) scans
+# the rest of the line each time it is tried, which is quadratic in
+# runs of quotes. The alternatives of these expressions that need it
+# are checked with a `WordLookahead` instead:
+LEFT_QUOTE_ALTERNATIVES = ("left_quote_shift", "left_quote")
+
+# Matches of the remaining expressions are marked at both ends, and
+# their inner characters are protected. These passes commute: a
+# character ends up unsplittable if it lies inside any match, and
+# split if it begins or ends one. Expressions that can never hide a
+# differently bounded match of one another are thus scanned together
+# (where they overlap, ellipses take precedence over single marks):
+def _punctuation_finder(dash_first_characters, dash_rest):
+    return combine_expressions([
+        # right_single_quote_converter:
+        ("right_single_quote", u"'’", u"['’]*(?=\\W|$)\\s*"),
+        # simple_dash_finder or advanced_dash_finder:
+        ("dash", dash_first_characters, dash_rest),
+        # numerical_expression:
+        ("numerical", u"\\d", u"\\d*(?:,\\d+)*(?:\\.\\d+)*(?![a-zA-ZÀ-ż])\\s*"),
+        # shifted_ellipses:
+        ("ellipses", u"\\.\\!\\?¿¡", u"[\\.\\!\\?¿¡]+\\s*"),
+        # shifted_standard_punctuation:
+        ("standard_punctuation", u"\\(\\[\\{\\}\\]\\)\\!¡\\?¿#\\$%;~&+=<>|/:,—…", u"\\s*")
+    ])
+
+punctuation_finder = _punctuation_finder(u"\\-", u"\\s*")
+advanced_punctuation_finder = _punctuation_finder(
+    u"".join(dashes_no_repeats) + u"\\-",
+    u"(?:(?<=-)-*)?\\s*"
+)
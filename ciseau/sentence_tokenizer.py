@@ -6,6 +6,7 @@ from .constants import (
     CONTINUE_PUNCT_SYMBOLS
 )
 from .word_tokenizer import tokenize
+from . import profiling
 
 def is_end_symbol(symbol):
     return (
@@ -38,7 +39,32 @@ def detect_sentence_boundaries(tokens):
         list<list<str>> : original list subdivided into multiple
             lists according to (detected) sentence boundaries.
     """
-    tokenized = group_quoted_tokens(tokens)
+    profile = profiling.active
+    if profile is None:
+        tokenized = group_quoted_tokens(tokens)
+    else:
+        tokenized = profile.call(
+            "detect_sentence_boundaries/group_quoted_tokens",
+            len(tokens),
+            group_quoted_tokens,
+            tokens
+        )
+    return split_sentences(tokenized)
+
+
+def split_sentences(tokenized):
+    """
+    Sentence boundary detection of `detect_sentence_boundaries`,
+    once quoted sections are grouped (see `group_quoted_tokens`).
+
+    Arguments:
+    ----------
+        tokenized : list<str or list<str>>
+
+    Returns:
+    --------
+        list<list<str>>
+    """
     words = []
     sentences = []
     for i in range(len(tokenized)):
@@ -113,7 +139,8 @@ def remove_whitespace(sentences):
     return [[w.rstrip() for w in sent] for sent in sentences]
 
 
-def sent_tokenize(text, keep_whitespace=False, normalize_ascii=True):
+def sent_tokenize(text, keep_whitespace=False, normalize_ascii=True, max_length=None,
+                  abbreviations=None):
     """
     Perform sentence + word tokenization on the input text
     using regular expressions and english/french specific
@@ -128,18 +155,53 @@ def sent_tokenize(text, keep_whitespace=False, normalize_ascii=True):
             on rare characters so that they become
             easier to process in a ascii pipeline
             (canonicalize dashes, replace œ -> oe, etc..)
+        max_length : int or None, longer strings are only
+            split along whitespace and punctuation (see
+            `tokenize`).
+        abbreviations : AbbreviationLexicon or None, words
+            that keep their period (see `tokenize`).
     Returns:
     --------
         list<list<str>> : sentences with their content held
             in a list of strings for each token.
     """
+    profile = profiling.active
+    if profile is not None:
+        return _profiled_sent_tokenize(
+            profile, text, keep_whitespace, normalize_ascii, max_length, abbreviations
+        )
     sentences = detect_sentence_boundaries(
         tokenize(
             text,
-            normalize_ascii
+            normalize_ascii,
+            max_length,
+            abbreviations
         )
     )
     if not keep_whitespace:
         sentences = remove_whitespace(sentences)
     return sentences
 
+
+def _profiled_sent_tokenize(profile, text, keep_whitespace, normalize_ascii, max_length,
+                            abbreviations):
+    # same as `sent_tokenize`, timing each stage:
+    tokens = profile.call(
+        "sent_tokenize/tokenize", len(text), tokenize, text, normalize_ascii, max_length,
+        abbreviations
+    )
+    sentences = profile.call(
+        "sent_tokenize/detect_sentence_boundaries",
+        len(tokens),
+        detect_sentence_boundaries,
+        tokens
+    )
+    if not keep_whitespace:
+        sentences = profile.call(
+            "sent_tokenize/remove_whitespace",
+            len(tokens),
+            remove_whitespace,
+            sentences
+        )
+    return sentences
+
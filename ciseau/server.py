@@ -0,0 +1,303 @@
+"""
+Local tokenization server (sidecar) over HTTP or stdin/stdout.
+
+Usage
+-----
+
+> ciseau-server --port 8080 -j 4
+> curl -d '{"text": "Mr. Smith agreed."}' localhost:8080/sent_tokenize
+#=> {"result": [["Mr.", "Smith", "agreed", "."]]}
+
+> echo '{"id": 1, "function": "tokenize", "text": "Hi there."}' | ciseau-server
+#=> {"id": 1, "result": ["Hi ", "there", "."]}
+
+Requests go through a `ciseau.aio.TokenizationService`, which
+batches concurrent requests. Without `--port`, each line of stdin
+is a JSON request, and its response is written on a line of stdout
+as soon as it is ready (responses carry the "id" of their request,
+and may come out of order). Over HTTP, requests are POSTed as JSON
+to /tokenize, /sent_tokenize or /to_raw_text.
+
+Requests hold the "text" to tokenize, and optionally the arguments
+of the function (e.g. "keep_whitespace": true). Failed requests
+get an "error" message instead of a "result".
+"""
+import argparse
+import asyncio
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from .aio import TokenizationService
+
+# arguments accepted by each function, with their type:
+FUNCTIONS = {
+    "tokenize": {"normalize_ascii": bool, "max_length": int},
+    "sent_tokenize": {"keep_whitespace": bool, "normalize_ascii": bool, "max_length": int},
+    "to_raw_text": {"keep_whitespace": bool, "normalize_ascii": bool, "max_length": int}
+}
+# largest HTTP request body accepted:
+MAX_BODY = 64 << 20
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found",
+                405: "Method Not Allowed", 413: "Payload Too Large"}
+
+
+def parse_request(request, function_name=None):
+    """
+    Read a JSON request (see the module documentation).
+
+    Arguments
+    ---------
+        request : dict
+        function_name : str or None, function to call (otherwise
+            read from the "function" key of the request).
+
+    Returns
+    -------
+        tuple<str, str, dict> : function name, text and arguments.
+    """
+    if not isinstance(request, dict):
+        raise ValueError("a request must be a JSON object")
+    if function_name is None:
+        function_name = request.get("function", "sent_tokenize")
+    if function_name not in FUNCTIONS:
+        raise ValueError("unknown function %r (expected one of %s)" % (
+            function_name, ", ".join(sorted(FUNCTIONS))
+        ))
+    text = request.get("text")
+    if not isinstance(text, str):
+        raise ValueError("a request must hold a \"text\" string")
+    kwargs = {}
+    for name, value in request.items():
+        if name in ("id", "function", "text"):
+            continue
+        expected = FUNCTIONS[function_name].get(name)
+        if expected is None:
+            raise ValueError("unknown argument %r for %s" % (name, function_name))
+        if not isinstance(value, expected) and not (name == "max_length" and value is None):
+            raise ValueError("%r must be a %s" % (name, expected.__name__))
+        kwargs[name] = value
+    return function_name, text, kwargs
+
+
+async def answer(service, request, function_name=None):
+    """
+    Response to a request, as a dict holding its "result" or
+    an "error" message.
+    """
+    try:
+        function_name, text, kwargs = parse_request(request, function_name)
+        return {"result": await service.submit(function_name, text, **kwargs)}
+    except ValueError as error:
+        return {"error": str(error)}
+
+
+async def serve_lines(service, fin, fout, max_pending=1024):
+    """
+    Answer the JSON requests read from each line of `fin`,
+    writing each response on a line of `fout`.
+
+    Arguments
+    ---------
+        service : TokenizationService
+        fin : binary or text file object
+        fout : text file object
+        max_pending : int, number of requests read ahead of
+            their responses.
+    """
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(max_pending)
+    tasks = set()
+
+    async def respond(line):
+        try:
+            try:
+                request = json.loads(line)
+            except ValueError as error:
+                response = {"error": "invalid JSON: %s" % (error,)}
+            else:
+                response = await answer(service, request)
+                if isinstance(request, dict) and "id" in request:
+                    response["id"] = request["id"]
+            fout.write(json.dumps(response, ensure_ascii=False) + "\n")
+            fout.flush()
+        finally:
+            slots.release()
+
+    # a thread reads the input, which may be a file or a terminal
+    # (which the event loop cannot watch):
+    with ThreadPoolExecutor(1) as reader:
+        while True:
+            await slots.acquire()
+            line = await loop.run_in_executor(reader, fin.readline)
+            if not line:
+                slots.release()
+                break
+            if not line.strip():
+                slots.release()
+                continue
+            task = loop.create_task(respond(line))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if len(tasks) > 0:
+            await asyncio.wait(list(tasks))
+
+
+async def _read_http_request(reader):
+    # (method, path, headers, body) of the next request, or None at
+    # the end of the connection:
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+    parts = request_line.decode("latin-1").split()
+    if len(parts) != 3:
+        raise ValueError("malformed request line")
+    method, path, version = parts
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if not line.strip():
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", "0"))
+    if length > MAX_BODY:
+        return method, path, version, headers, None
+    body = await reader.readexactly(length)
+    return method, path, version, headers, body
+
+
+def _http_response(status, response, keep_alive):
+    body = json.dumps(response, ensure_ascii=False).encode("utf-8")
+    head = (
+        "HTTP/1.1 %d %s\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        "Content-Length: %d\r\n"
+        "Connection: %s\r\n\r\n"
+    ) % (status, HTTP_REASONS[status], len(body), "keep-alive" if keep_alive else "close")
+    return head.encode("latin-1") + body
+
+
+async def handle_http(service, reader, writer):
+    """
+    Answer the HTTP requests of a connection (see the
+    module documentation).
+    """
+    try:
+        while True:
+            try:
+                request = await _read_http_request(reader)
+            except (ValueError, asyncio.IncompleteReadError):
+                writer.write(_http_response(400, {"error": "malformed request"}, False))
+                break
+            if request is None:
+                break
+            method, path, version, headers, body = request
+            keep_alive = (
+                version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+            )
+            function_name = path.split("?")[0].strip("/")
+            if body is None:
+                status, response, keep_alive = 413, {"error": "request is too large"}, False
+            elif function_name not in FUNCTIONS:
+                status, response = 404, {"error": "unknown path %r" % (path,)}
+            elif method != "POST":
+                status, response = 405, {"error": "use POST"}
+            else:
+                try:
+                    response = await answer(service, json.loads(body.decode("utf-8")),
+                                            function_name)
+                except ValueError as error:
+                    response = {"error": "invalid JSON: %s" % (error,)}
+                status = 400 if "error" in response else 200
+            writer.write(_http_response(status, response, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="ciseau-server",
+        description="Serve tokenization requests over HTTP, or JSON lines on stdin."
+    )
+    parser.add_argument(
+        "--port", type=int, default=None,
+        help="serve HTTP on this port (default: read requests from stdin)."
+    )
+    parser.add_argument(
+        "--host", default="127.0.0.1",
+        help="address to listen on with --port (default: 127.0.0.1)."
+    )
+    parser.add_argument(
+        "-j", "--processes", type=int, default=None,
+        help="number of worker processes (default: number of cpus)."
+    )
+    parser.add_argument(
+        "--threads", type=int, default=None,
+        help="run batches in this many threads instead of processes."
+    )
+    parser.add_argument(
+        "--max-batch-size", type=int, default=64,
+        help="number of requests sent to a worker at once (default: 64)."
+    )
+    parser.add_argument(
+        "--max-wait", type=float, default=2.0,
+        help="milliseconds a request waits for others to join its batch (default: 2)."
+    )
+    parser.add_argument(
+        "--max-pending", type=int, default=4096,
+        help="number of requests waiting or running at once (default: 4096)."
+    )
+    return parser
+
+
+async def serve(args):
+    executor = ThreadPoolExecutor(args.threads) if args.threads is not None else None
+    service = TokenizationService(
+        executor, processes=args.processes, max_batch_size=args.max_batch_size,
+        max_wait=args.max_wait / 1000.0, max_pending=args.max_pending
+    )
+    try:
+        if args.port is None:
+            await serve_lines(service, sys.stdin, sys.stdout, args.max_pending)
+        else:
+            server = await asyncio.start_server(
+                lambda reader, writer: handle_http(service, reader, writer),
+                args.host, args.port
+            )
+            async with server:
+                await server.serve_forever()
+    finally:
+        await service.close()
+        if executor is not None:
+            executor.shutdown()
+
+
+def main(argv=None):
+    """
+    Entry point of the `ciseau-server` command.
+
+    Arguments
+    ---------
+        argv : list<str> or None, command line arguments
+            (defaults to `sys.argv[1:]`).
+
+    Returns
+    -------
+        int : exit status.
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
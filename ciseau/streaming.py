@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+Sentence tokenization of inputs that do not fit in memory.
+
+Usage
+-----
+
+> with open("dump.txt") as fin:
+>     for sentence in ciseau.iter_sentences(fin):
+>         ...
+
+"""
+import codecs
+
+from .word_tokenizer import tokenize
+from .quoted_expressions import pair_symbols, group_sections
+from .sentence_tokenizer import sent_tokenize, split_sentences, remove_whitespace
+from .regular_expressions import length_changing_characters
+
+text_type = type(u"")
+
+
+def normalized_to_raw_offset(text, offset):
+    """
+    Convert a character offset in the ascii-normalized
+    version of `text` (as tokenized with `normalize_ascii=True`)
+    into the corresponding offset in `text`.
+
+    Arguments
+    ---------
+        text : str, text before normalization.
+        offset : int, offset into the normalized text.
+
+    Returns
+    -------
+        int : offset into `text`.
+    """
+    # normalized position minus raw position:
+    shift = 0
+    for match in length_changing_characters.finditer(text):
+        if match.start() + shift >= offset:
+            break
+        if match.group(0)[0] == "-":
+            # a run of dashes becomes a single dash:
+            shift += 1 - len(match.group(0))
+        else:
+            # œ -> oe, æ -> ae:
+            shift += 1
+    return offset - shift
+
+
+def read_chunks(source, chunk_size):
+    """
+    Yield successive pieces of text from a string, a file
+    object, or an iterable of strings. Bytes are decoded
+    as utf-8 (multi-byte characters may span chunks).
+
+    Arguments
+    ---------
+        source : str, bytes, file object, or iterable of
+            str/bytes chunks.
+        chunk_size : int, number of characters (or bytes)
+            per read.
+
+    Returns
+    -------
+        generator<str>
+    """
+    if isinstance(source, (bytes, text_type)):
+        chunks = (
+            source[start:start + chunk_size]
+            for start in range(0, len(source), chunk_size)
+        )
+    elif hasattr(source, "read"):
+        chunks = iter(lambda: source.read(chunk_size), source.read(0))
+    else:
+        chunks = source
+    decoder = None
+    for chunk in chunks:
+        if isinstance(chunk, bytes):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder("utf-8")()
+            chunk = decoder.decode(chunk)
+        if len(chunk) > 0:
+            yield chunk
+    if decoder is not None:
+        chunk = decoder.decode(b"", True)
+        if len(chunk) > 0:
+            yield chunk
+
+
+def _sentence_index(sentences, token_index):
+    # index of the sentence holding a token:
+    num_tokens = 0
+    for index, sentence in enumerate(sentences):
+        num_tokens += len(sentence)
+        if num_tokens > token_index:
+            return index
+    return len(sentences)
+
+
+def iter_sentences(source, keep_whitespace=False, normalize_ascii=True,
+                   chunk_size=1 << 16, tail_sentences=2, max_buffer_size=1 << 22):
+    """
+    Perform sentence + word tokenization on a text that
+    is read incrementally, yielding each sentence as soon
+    as it is final. Only a tail of the text (the last
+    `tail_sentences` sentences found so far) is kept between
+    reads, so that abbreviations, quotes and the next word
+    can still be inspected across chunk boundaries. A quote
+    or bracket left open holds back the sentences from the
+    one where it opens until it is closed.
+
+    Output matches `sent_tokenize` on the whole text, except
+    for closing symbols left unpaired (forgotten once their
+    sentence is yielded), for straight quotes with spaces on
+    both sides (which `sent_tokenize` pairs by counting the
+    quotes that follow them in the whole text), and for
+    sentences or unclosed sections longer than
+    `max_buffer_size`, which are cut. Only the sentence
+    boundaries can differ: the tokens are always the same.
+
+    Arguments
+    ---------
+        source : str, bytes, file object, or iterable of str/bytes
+            chunks.
+        keep_whitespace : bool, whether to strip out spaces
+            and newlines.
+        normalize_ascii : bool, perform some replacements
+            on rare characters so that they become
+            easier to process in a ascii pipeline
+            (canonicalize dashes, replace œ -> oe, etc..)
+        chunk_size : int, amount of text read at once.
+        tail_sentences : int, number of sentences held back
+            until more text is read.
+        max_buffer_size : int, maximum number of characters
+            kept in memory.
+
+    Returns
+    -------
+        generator<list<str>> : sentences with their content held
+            in a list of strings for each token.
+    """
+    tail_sentences = max(1, tail_sentences)
+    buffer = u""
+    # length the buffer must reach before it is tokenized again:
+    min_size = chunk_size
+    for chunk in read_chunks(source, chunk_size):
+        buffer += chunk
+        if len(buffer) < min_size:
+            continue
+        tokens = tokenize(buffer, normalize_ascii)
+        sections, _, unclosed = pair_symbols(tokens)
+        sentences = split_sentences(group_sections(tokens, sections))
+        num_final = len(sentences) - tail_sentences
+        if unclosed is not None:
+            num_final = min(num_final, _sentence_index(sentences, unclosed) - tail_sentences)
+        if num_final > 0:
+            final_sentences = sentences[:num_final]
+        elif len(buffer) > max_buffer_size:
+            if len(sentences) > 1:
+                final_sentences = sentences[:-1]
+            elif len(sentences[0]) > 1:
+                # no sentence boundary in sight: cut the
+                # sentence before its last word.
+                final_sentences = [sentences[0][:-1]]
+            else:
+                # a single word: cut it.
+                final_sentences = [[sentences[0][0][:max_buffer_size]]]
+        else:
+            # wait until the buffer doubles (rather than tokenizing
+            # it again after each read while a quote is left open):
+            min_size = min(2 * len(buffer), max_buffer_size + 1)
+            continue
+        consumed = sum(len(word) for sentence in final_sentences for word in sentence)
+        if normalize_ascii:
+            consumed = normalized_to_raw_offset(buffer, consumed)
+        buffer = buffer[consumed:]
+        min_size = chunk_size
+        if not keep_whitespace:
+            final_sentences = remove_whitespace(final_sentences)
+        for sentence in final_sentences:
+            yield sentence
+
+    for sentence in sent_tokenize(buffer, keep_whitespace, normalize_ascii):
+        yield sentence
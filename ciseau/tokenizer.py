@@ -0,0 +1,161 @@
+"""
+Tokenization with a fixed configuration.
+
+Usage
+-----
+
+> tokenizer = ciseau.Tokenizer(normalize_ascii=False, abbreviations=lexicon)
+> tokenizer.sent_tokenize("Mr. Smith agreed.")
+> for sentences in tokenizer.sent_tokenize_many(documents, processes=8):
+>     ...
+
+A `Tokenizer` selects its regular expression passes and
+abbreviations once, instead of on every call, and holds no
+global state: tokenizers with different configurations can be
+used side by side. It pickles as its configuration (a lexicon
+loaded from a file pickles as its path), which keeps sending it
+to worker processes cheap.
+"""
+from functools import partial
+
+from . import profiling
+from .word_tokenizer import tokenize, tokenize_batch, select_split_passes
+from .sentence_tokenizer import sent_tokenize, detect_sentence_boundaries, remove_whitespace
+from .parallel import map_batches
+
+
+def _tokenizer_batch(tokenizer, method_name, texts):
+    if method_name == "tokenize":
+        return tokenizer.tokenize_batch(texts)
+    method = getattr(tokenizer, method_name)
+    return [method(text) for text in texts]
+
+
+class Tokenizer(object):
+    """
+    Word and sentence tokenizer with a fixed configuration.
+
+    Arguments
+    ---------
+        normalize_ascii : bool, perform some replacements
+            on rare characters (see `tokenize`).
+        keep_whitespace : bool, whether `sent_tokenize` keeps
+            the spaces and newlines of its tokens.
+        max_length : int or None, longer strings are only
+            split along whitespace and punctuation (see
+            `tokenize`).
+        abbreviations : AbbreviationLexicon or None, words
+            that keep their period (None uses the english
+            abbreviations).
+    """
+    def __init__(self, normalize_ascii=True, keep_whitespace=False, max_length=None,
+                 abbreviations=None):
+        self.normalize_ascii = normalize_ascii
+        self.keep_whitespace = keep_whitespace
+        self.max_length = max_length
+        self.abbreviations = abbreviations
+        self._passes = select_split_passes(normalize_ascii, abbreviations)
+
+    @property
+    def config(self):
+        """
+        Arguments of this tokenizer, as a dict (so that
+        `Tokenizer(**tokenizer.config)` is a copy of it).
+        """
+        return {
+            "normalize_ascii": self.normalize_ascii,
+            "keep_whitespace": self.keep_whitespace,
+            "max_length": self.max_length,
+            "abbreviations": self.abbreviations
+        }
+
+    def __getstate__(self):
+        return self.config
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __repr__(self):
+        return "Tokenizer(%s)" % (
+            ", ".join("%s=%r" % (name, value) for name, value in sorted(self.config.items())),
+        )
+
+    def tokenize(self, text):
+        """
+        Same as `ciseau.tokenize` with this configuration.
+
+        Arguments
+        ---------
+            text : str
+
+        Returns
+        -------
+            list<str>
+        """
+        return tokenize(text, self.normalize_ascii, self.max_length, self.abbreviations,
+                        self._passes)
+
+    def tokenize_batch(self, texts):
+        """
+        Same as `ciseau.tokenize_batch` with this configuration.
+
+        Arguments
+        ---------
+            texts : list<str>
+
+        Returns
+        -------
+            list<list<str>>
+        """
+        return tokenize_batch(texts, self.normalize_ascii, self.max_length, self.abbreviations,
+                              self._passes)
+
+    def sent_tokenize(self, text):
+        """
+        Same as `ciseau.sent_tokenize` with this configuration.
+
+        Arguments
+        ---------
+            text : str
+
+        Returns
+        -------
+            list<list<str>>
+        """
+        if profiling.active is not None:
+            return sent_tokenize(text, self.keep_whitespace, self.normalize_ascii,
+                                 self.max_length, self.abbreviations)
+        sentences = detect_sentence_boundaries(self.tokenize(text))
+        if not self.keep_whitespace:
+            sentences = remove_whitespace(sentences)
+        return sentences
+
+    def tokenize_many(self, texts, processes=None, chunksize=64, ordered=True, pool=None):
+        """
+        Parallel version of `tokenize` over an iterable of
+        strings (see `ciseau.parallel.tokenize_many_with` for
+        the arguments).
+
+        Returns
+        -------
+            generator<list<str>>
+        """
+        return map_batches(
+            partial(_tokenizer_batch, self, "tokenize"), texts, processes=processes,
+            chunksize=chunksize, ordered=ordered, pool=pool
+        )
+
+    def sent_tokenize_many(self, texts, processes=None, chunksize=64, ordered=True, pool=None):
+        """
+        Parallel version of `sent_tokenize` over an iterable of
+        strings (see `ciseau.parallel.tokenize_many_with` for
+        the arguments).
+
+        Returns
+        -------
+            generator<list<list<str>>>
+        """
+        return map_batches(
+            partial(_tokenizer_batch, self, "sent_tokenize"), texts, processes=processes,
+            chunksize=chunksize, ordered=ordered, pool=pool
+        )
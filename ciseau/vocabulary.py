@@ -0,0 +1,190 @@
+"""
+Token ids: tokenize straight into arrays of vocabulary ids.
+
+Usage
+-----
+
+> vocabulary = ciseau.Vocabulary(["<unk>", "the", "cat", "sat", "."])
+> ids, boundaries = ciseau.sent_tokenize_ids("The cat sat. The dog sat.", vocabulary,
+>                                            unknown_id=0, lowercase=True)
+> ids, boundaries
+#=> (array('i', [1, 2, 3, 4, 1, 0, 3, 4]), array('I', [0, 4, 8]))
+> vocabulary.save("vocabulary.bin")
+> vocabulary = ciseau.Vocabulary.load("vocabulary.bin")
+
+Ids are written to an `array('i')` as tokens come out of the
+tokenizer, without building lists of stripped (or lowercased)
+strings. Arrays support the buffer protocol, so
+`numpy.frombuffer(ids, dtype=numpy.int32)` views them without a
+copy. Any mapping with a `get` method works as a vocabulary (e.g.
+a dict of token -> id); a `Vocabulary` is a frozen `HashTable`
+(see `ciseau.hash_table`, its magic is "CSVO" and it stores an
+int32 id before each token) that maps its file in memory when
+loaded, so that large vocabularies open instantly and are shared
+by worker processes.
+"""
+import struct
+from array import array
+from itertools import repeat
+
+try:
+    # lazy map on Python 2 (which also stops at the shortest iterable):
+    from itertools import imap as map
+except ImportError:
+    pass
+
+from .hash_table import HashTable, build_table
+from .offsets import offset_typecode, text_type
+from .word_tokenizer import tokenize
+from .sentence_tokenizer import detect_sentence_boundaries
+
+MAGIC = b"CSVO"
+VERSION = 1
+ID = struct.Struct("<i")
+
+
+class Vocabulary(HashTable):
+    """
+    Frozen mapping of tokens to integer ids.
+
+    Arguments
+    ---------
+        tokens : dict<str, int> mapping each token to its id,
+            or iterable<str> of tokens (numbered from 0 in order).
+    """
+    MAGIC = MAGIC
+    VERSION = VERSION
+    VALUE = ID
+    NAME = "vocabulary"
+    # frequent tokens make up most of any text:
+    RECENT_LOOKUPS = 1 << 16
+
+    def __init__(self, tokens=()):
+        if hasattr(tokens, "items"):
+            items = tokens.items()
+        else:
+            items = ((token, token_id) for token_id, token in enumerate(tokens))
+        entries = {}
+        for token, token_id in items:
+            key = token.encode("utf-8")
+            if key in entries:
+                raise ValueError("duplicate token %r in vocabulary" % (token,))
+            if len(key) > 0xffff:
+                raise ValueError("token is too long: %r" % (key[:32],))
+            if not -(1 << 31) <= token_id < (1 << 31):
+                raise ValueError("id of %r does not fit in 32 bits: %r" % (token, token_id))
+            entries[key] = token_id
+        self._set_table(build_table(MAGIC, VERSION, entries, ID))
+        self.path = None
+
+    def get(self, token, default=None):
+        """
+        Id of a token, or `default` when it is not part
+        of the vocabulary.
+        """
+        found = self._get(token)
+        return default if found is False else found
+
+    def __getitem__(self, token):
+        token_id = self.get(token)
+        if token_id is None:
+            raise KeyError(token)
+        return token_id
+
+    def __contains__(self, token):
+        return self.get(token) is not None
+
+    def items(self):
+        """
+        Generator of (token, id) pairs.
+        """
+        return self._entries()
+
+    def __iter__(self):
+        for token, _ in self._entries():
+            yield token
+
+    def __repr__(self):
+        return "Vocabulary(%d tokens%s)" % (
+            self._num_entries, "" if self.path is None else ", path=%r" % (self.path,)
+        )
+
+
+def _token_ids(tokens, vocabulary, unknown_id, lowercase):
+    # ids of the tokens without their whitespace (as an iterable, so
+    # that no list of stripped tokens is built):
+    words = map(text_type.rstrip, tokens)
+    if lowercase:
+        words = map(text_type.lower, words)
+    if unknown_id is None:
+        # out of vocabulary tokens are left out:
+        return (token_id for token_id in map(vocabulary.get, words) if token_id is not None)
+    return map(vocabulary.get, words, repeat(unknown_id))
+
+
+def tokenize_ids(text, vocabulary, unknown_id=None, lowercase=False, normalize_ascii=True,
+                 max_length=None, abbreviations=None):
+    """
+    Same as `tokenize` (without whitespace), but return
+    the id of each token in a vocabulary.
+
+    Arguments
+    ---------
+        text : str
+        vocabulary : Vocabulary or dict<str, int>
+        unknown_id : int or None, id of the tokens missing from
+            the vocabulary (None leaves them out).
+        lowercase : bool, look up the lowercased tokens.
+        normalize_ascii : bool, perform some replacements
+            on rare characters (see `tokenize`).
+        max_length : int or None, longer strings are only
+            split along whitespace and punctuation.
+        abbreviations : AbbreviationLexicon or None, words
+            that keep their period (see `tokenize`).
+
+    Returns
+    -------
+        array<int> : ids (typecode 'i').
+    """
+    return array("i", _token_ids(
+        tokenize(text, normalize_ascii, max_length, abbreviations),
+        vocabulary, unknown_id, lowercase
+    ))
+
+
+def sent_tokenize_ids(text, vocabulary, unknown_id=None, lowercase=False, normalize_ascii=True,
+                      max_length=None, abbreviations=None):
+    """
+    Same as `sent_tokenize`, but return the id of each token
+    in a vocabulary, along with the index of the first token
+    of each sentence.
+
+    Arguments
+    ---------
+        text : str
+        vocabulary : Vocabulary or dict<str, int>
+        unknown_id : int or None, id of the tokens missing from
+            the vocabulary (None leaves them out).
+        lowercase : bool, look up the lowercased tokens.
+        normalize_ascii : bool, perform some replacements
+            on rare characters (see `sent_tokenize`).
+        max_length : int or None, longer strings are only
+            split along whitespace and punctuation.
+        abbreviations : AbbreviationLexicon or None, words
+            that keep their period (see `tokenize`).
+
+    Returns
+    -------
+        tuple<array<int>, array<int>> : ids (typecode 'i'),
+            and sentence boundaries: sentence `i` holds ids
+            `boundaries[i]` up to `boundaries[i + 1]`.
+    """
+    sentences = detect_sentence_boundaries(
+        tokenize(text, normalize_ascii, max_length, abbreviations)
+    )
+    ids = array("i")
+    boundaries = array(offset_typecode(sum(map(len, sentences))), [0])
+    for sentence in sentences:
+        ids.extend(_token_ids(sentence, vocabulary, unknown_id, lowercase))
+        boundaries.append(len(ids))
+    return ids, boundaries
@@ -0,0 +1,163 @@
+"""
+Read Wikipedia XML dumps (e.g. `enwiki-latest-pages-articles.xml.bz2`)
+and tokenize their articles.
+
+Usage
+-----
+
+> for title, sentences in ciseau.wiki.iter_dump("pages-articles.xml.bz2"):
+>     ...
+
+Pages are parsed one at a time and discarded once yielded, so
+memory use does not grow with the size of the dump.
+"""
+import bz2
+import gzip
+from collections import deque
+from xml.etree import ElementTree
+
+from .parallel import tokenize_many_with, TOKENIZERS
+
+ARTICLE_NAMESPACES = (0,)
+
+
+def open_dump(path):
+    """
+    Open a dump for reading in binary mode, decompressing it
+    on the fly if its name ends with '.bz2' or '.gz'.
+
+    Arguments
+    ---------
+        path : str
+
+    Returns
+    -------
+        file object
+    """
+    if path.endswith(".bz2"):
+        return bz2.BZ2File(path, "rb")
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def _local_name(tag):
+    # drop the xml namespace: '{http://www.mediawiki.org/...}page' -> 'page'
+    return tag.rsplit("}", 1)[-1]
+
+
+def _is_redirect(text):
+    return text[:9].upper() == "#REDIRECT"
+
+
+def iter_pages(source, namespaces=ARTICLE_NAMESPACES, skip_redirects=True):
+    """
+    Stream the pages of a MediaWiki XML dump.
+
+    Arguments
+    ---------
+        source : str or file object, path to the dump (optionally
+            compressed with bz2 or gzip), or an open binary file.
+        namespaces : iterable<int> or None, only keep pages from
+            these namespaces (0 holds the articles). None keeps
+            all pages.
+        skip_redirects : bool, leave out redirect pages.
+
+    Returns
+    -------
+        generator<tuple<str, str>> : the title and the wikitext
+            of the latest revision of each page.
+    """
+    if namespaces is not None:
+        namespaces = set(namespaces)
+    owns_file = not hasattr(source, "read")
+    fin = open_dump(source) if owns_file else source
+    try:
+        root = None
+        title = None
+        namespace = None
+        redirect = False
+        text = None
+        for event, element in ElementTree.iterparse(fin, events=("start", "end")):
+            if root is None:
+                root = element
+            if event == "start":
+                continue
+            name = _local_name(element.tag)
+            if name == "title":
+                title = element.text or ""
+            elif name == "ns":
+                namespace = int(element.text)
+            elif name == "redirect":
+                redirect = True
+            elif name == "text":
+                text = element.text or ""
+            elif name == "page":
+                keep = (
+                    (namespaces is None or namespace in namespaces) and
+                    not (skip_redirects and (redirect or _is_redirect(text or "")))
+                )
+                if keep:
+                    yield title, text or ""
+                title = None
+                namespace = None
+                redirect = False
+                text = None
+                # drop the parsed page (and the reference the root
+                # keeps to it) so that memory stays constant:
+                element.clear()
+                root.clear()
+    finally:
+        if owns_file:
+            fin.close()
+
+
+def iter_dump(source, function_name="to_raw_text", processes=1, chunksize=16,
+              pool=None, namespaces=ARTICLE_NAMESPACES, skip_redirects=True,
+              keep_whitespace=False, normalize_ascii=True):
+    """
+    Stream the articles of a MediaWiki XML dump, stripped of
+    their markup and tokenized into sentences.
+
+    Arguments
+    ---------
+        source : str or file object, path to the dump (optionally
+            compressed with bz2 or gzip), or an open binary file.
+        function_name : str, tokenization function applied to the
+            wikitext ("to_raw_text", "to_raw_text_markupless",
+            "to_raw_text_pairings", "sent_tokenize" or "tokenize").
+        processes : int or None, number of worker processes (None
+            uses all cpus, 1 tokenizes in the current process).
+        chunksize : int, number of pages sent to a worker at once.
+        pool : multiprocessing.Pool or None, reuse these workers.
+        namespaces : iterable<int> or None, only keep pages from
+            these namespaces (None keeps all pages).
+        skip_redirects : bool, leave out redirect pages.
+        keep_whitespace : bool, should the output retain the
+            whitespace of the input.
+        normalize_ascii : bool, perform some replacements
+            on rare characters (see `sent_tokenize`).
+
+    Returns
+    -------
+        generator<tuple<str, list<list<str>>>> : the title of each
+            page along with its sentences, in the order of the dump.
+    """
+    if function_name not in TOKENIZERS:
+        raise ValueError(
+            "function_name must be one of %r (got %r)" % (sorted(TOKENIZERS), function_name)
+        )
+    kwargs = {"normalize_ascii": normalize_ascii}
+    if function_name != "tokenize":
+        kwargs["keep_whitespace"] = keep_whitespace
+    titles = deque()
+
+    def texts():
+        for title, text in iter_pages(source, namespaces, skip_redirects):
+            titles.append(title)
+            yield text
+
+    for result in tokenize_many_with(function_name, texts(), processes=processes,
+                                     chunksize=chunksize, ordered=True, pool=pool,
+                                     **kwargs):
+        yield titles.popleft(), result
@@ -1,25 +1,49 @@
-import re
+from array import array
+from . import profiling
 from .sentence_tokenizer import sent_tokenize
-
-bracket_parser           = re.compile("\[\[(?P<name>[^\]\|]+)(?:\|[\W]*(?P<trigger>[^\]\#\|]+)(?:\#[^\]\|]+)?)*\]\]")
-squiggly_bracket_parser  = re.compile("{{([^}]+)}}")
-table_parser             = re.compile("{\|[^}]+\|}")
-mvar_parser              = re.compile("{{\d*mvar\d*\|([^}]+)}}")
-remove_emphasis          = re.compile("'{2,5}([^']+)'{2,5}")
+from .offsets import (
+    offset_typecode,
+    substitute_with_offsets,
+    _parse_template,
+    spans_from_offsets,
+    _sent_tokenize_with_offsets
+)
+from .regular_expressions import lazy_compile
+
+bracket_parser           = lazy_compile("\[\[(?P<name>[^\]\|]+)(?:\|[\W]*(?P<trigger>[^\]\#\|]+)(?:\#[^\]\|]+)?)*\]\]")
+# The expressions below that scan for the end of some markup also
+# match markup that is never closed (group `unclosed`), which
+# `leave_unclosed` leaves as-is. Without it the search would retry,
+# and rescan the same text, from each opening bracket that follows:
+squiggly_bracket_parser  = lazy_compile(r"{{(?:([^}]+)}}|(?P<unclosed>[^}]*))")
+table_parser             = lazy_compile(r"{\|(?:[^}]+\|}|(?P<unclosed>[^}]*))")
+mvar_parser              = lazy_compile(r"{{\d*mvar\d*\|(?:([^}]+)}}|(?P<unclosed>[^}]*))")
+remove_emphasis          = lazy_compile("'{2,5}([^']+)'{2,5}")
 
 # handles links that don't have a pipe sign"
-double_bracket_parser    = re.compile("\[\[|\]\]")
+double_bracket_parser    = lazy_compile("\[\[|\]\]")
 # normalizes: 01/02/2003, 2005-06-07, and 2001 type dates to 7777
-date_remover              = re.compile("((\d{4}(?:[-/]\d{2}[-/]\d{2})?)|(\d{2}(?:[-/]\d{2}[-/]\d{4})))(?=[^\d]|$)")
-remove_emphasis_asterix   = re.compile("\*{2,5}([^\*]+)\*{2,5}")
-remove_emphasis_slash     = re.compile("/{2,5}([^/]+)/{2,5}")
-remove_emphasis_low_ticks = re.compile(",{2,5}([^,]+),{2,5}")
-remove_emphasis_heading   = re.compile("={2,5}([^=]+)={2,5}")
-remove_emphasis_strikethrough = re.compile("~{2}([^~]+)~{2}")
-remove_emphasis_underline = re.compile("_{2}([^_]+)_{2}")
-remove_bullets_nbsps      = re.compile("(&amp;nbsp;|&nbsp;|[\^\n]\*{1,}|[\^\n]\#{1,}|[\^\n]:{1,})") # remove lists, bullet points, and html no breakspace
-remove_wikipedia_link     = re.compile("\[\W*http[^\] ]+\b*(?P<anchor>[^\]]+)\]")
-markup_normalizer         = re.compile("[',/\*_=-]{2,5}")
+# (the common leading digits are factored out so that the
+# search can skip quickly to the next digit)
+date_remover              = lazy_compile("\d\d(?:\d\d(?:[-/]\d{2}[-/]\d{2})?|[-/]\d{2}[-/]\d{4})(?!\d)")
+remove_emphasis_asterix   = lazy_compile("\*{2,5}([^\*]+)\*{2,5}")
+remove_emphasis_slash     = lazy_compile("/{2,5}([^/]+)/{2,5}")
+remove_emphasis_low_ticks = lazy_compile(",{2,5}([^,]+),{2,5}")
+remove_emphasis_heading   = lazy_compile("={2,5}([^=]+)={2,5}")
+remove_emphasis_strikethrough = lazy_compile("~{2}([^~]+)~{2}")
+remove_emphasis_underline = lazy_compile("_{2}([^_]+)_{2}")
+# remove lists, bullet points, and html no breakspace
+# (written to start with a character class so that the search
+# can skip quickly to the next candidate):
+remove_bullets_nbsps      = lazy_compile("[&\^\n](?:(?<=&)(?:amp;)?nbsp;|(?<=[\^\n])(?:\*+|\#+|:+))")
+# an external link "[http://... anchor]" is replaced by its anchor. When
+# a link cannot match (no anchor, or no closing bracket), the text that
+# would be scanned again from any later '[' is consumed as `unclosed`:
+remove_wikipedia_link     = lazy_compile(
+    r"\[(?=\W|http)\W*(?:http(?=[^\] ][^\]])(?=[^\]]*\])[^\] ]+\x08*(?P<anchor>[^\]]+)\]|"
+    r"(?P<unclosed>(?:http(?=[^\] ][^\]])[^\]]*)?))"
+)
+markup_normalizer         = lazy_compile("[',/\*_=-]{2,5}")
 markup_removes            = [
     remove_emphasis,
     remove_emphasis_heading,
@@ -31,29 +55,181 @@ markup_removes            = [
 ]
 replacer                  = lambda matches: matches.group('trigger') if matches.group('trigger') != None else matches.group('name')
 anchor_replacer           = lambda matches: matches.group('anchor') if matches.group('anchor') else ''
-html_remover              = re.compile("<[^>]+>")
-internal_html_remover     = re.compile("{{[^(}})]+}}")
-math_source_sections      = re.compile("<(math|source|code|sub|sup)[^>]*>([^<]"
-                                       "*)</(math|source|code|sub|sup)>")
-greater_than              = re.compile("(\W)>(\W)")
-less_than                 = re.compile("<([^\w/])")
-single_internal_link      = re.compile("\[\[([^\]\|]+)\]\]")
-category_internal_link    = re.compile("\[\[Category:([^\]\|]+)\]\]")
+html_remover              = lazy_compile(r"<(?:[^>]+>|(?P<unclosed>[^>]*))")
+internal_html_remover     = lazy_compile("{{[^(}})]+}}")
+math_source_sections      = lazy_compile(r"<(?:(math|source|code|sub|sup)[^>]*>([^<]"
+                                       r"*)</(math|source|code|sub|sup)>|"
+                                       r"(?P<unclosed>(?:math|source|code|sub|sup)[^>]*))")
+# a '>' between two non-word characters. As with the expression
+# "(\W)>(\W)", each escape consumes both of its neighbors, so a '>'
+# right after an escaped one (e.g. in ' >> ' or ' > > ') is left as-is:
+greater_than              = lazy_compile(r">(?<=\W>)(\W(?:>(?=\W))?)")
+less_than                 = lazy_compile("<([^\w/])")
+single_internal_link      = lazy_compile(r"\[\[(?:([^\]\|]+)\]\]|(?P<unclosed>[^\]\|]*))")
+category_internal_link    = lazy_compile(r"\[\[Category:(?:([^\]\|]+)\]\]|(?P<unclosed>[^\]\|]*))")
 
 # handles links that always have a pipe sign e.g. "[[the girl|Angelina Jolie]]"
-anchortag_internal_link   = re.compile("\[\[(?P<target>[^\]\|]+)\|[\W]*("
-                                       "?P<anchor>[^\]\#\|]+)(?:\#[^\]\|]+)?\]\]")
-url_remover               = re.compile("http://[a-zA-Z\.&/]+")
+# (the leading non-word characters of the anchor are skipped up to a word,
+# or up to the last character before a ']', '#' or '|': the anchor would
+# end at the same place from any other position, and fail the same way.
+# Likewise, a '#' followed by another one in these characters is skipped
+# when the text after both ends at the same ']' or '|')
+anchortag_internal_link   = lazy_compile(r"\[\[(?:(?P<target>[^\]\|]+)\|[\W]*"
+                                       r"(?=\w|[^\]\#\|][\]\|]|[^\]\#\|]\#(?![^\]\|\w]*?[^\]\#\|\w]\#[^\]\|]))("
+                                       r"?P<anchor>[^\]\#\|]+)(?:\#[^\]\|]+)?\]\]|"
+                                       r"(?P<unclosed>[^\]\|]*))")
+url_remover               = lazy_compile("http://[a-zA-Z\.&/]+")
 empty_space = " "
 empty_string = ""
 
 
+def leave_unclosed(replacement):
+    """
+    Replacement for the expressions that also match unclosed
+    markup (group `unclosed`): such matches are left as-is,
+    and the others are replaced by `replacement`.
+
+    Arguments
+    ---------
+        replacement : str, template (with \\g<name> or \\1 group
+            references), or function of the match.
+
+    Returns
+    -------
+        function : replacement function for `re.sub` (holding
+            the template as its `template` attribute, see
+            `substitute_with_offsets`).
+    """
+    if callable(replacement):
+        expand = replacement
+    else:
+        parts = _parse_template(replacement)
+        if len(parts) == 1 and parts[0][0]:
+            # a single group reference:
+            group = parts[0][1]
+            expand = lambda match: match.group(group)
+        elif any(is_group for is_group, _ in parts):
+            expand = lambda match: match.expand(replacement)
+        else:
+            expand = lambda match: replacement
+
+    def replace(match):
+        if match.group("unclosed") is not None:
+            return match.group(0)
+        return expand(match)
+    if not callable(replacement):
+        replace.template = replacement
+    return replace
+
+
+# substitutions (name, regex, replacement) applied in order by `to_raw_text`:
+raw_text_steps = [
+    ("url_remover", url_remover, "url"),
+    ("mvar_parser", mvar_parser, leave_unclosed("\g<1>")),
+    ("squiggly_bracket_parser", squiggly_bracket_parser, leave_unclosed(empty_space)),
+    ("table_parser", table_parser, leave_unclosed(empty_space)),
+    ("category_internal_link", category_internal_link, leave_unclosed("\n\g<1> .\n")),
+    ("single_internal_link", single_internal_link, leave_unclosed("\g<1>")),
+    ("anchortag_internal_link", anchortag_internal_link, leave_unclosed("\g<anchor>")),
+    ("double_bracket_parser", double_bracket_parser, empty_space),
+    ("markup_normalizer", markup_normalizer, empty_string),
+    ("remove_wikipedia_link", remove_wikipedia_link, leave_unclosed(anchor_replacer)),
+    ("remove_bullets_nbsps", remove_bullets_nbsps, empty_space),
+    ("date_remover", date_remover, "7777"),
+    ("greater_than", greater_than, "&gt;\g<1>"),
+    ("less_than", less_than, "&lt;\g<1>"),
+    ("math_source_sections", math_source_sections, leave_unclosed(empty_space)),
+    ("html_remover", html_remover, leave_unclosed(empty_space))
+]
+# substitutions applied in order by `to_raw_text_markupless`:
+raw_text_markupless_steps = [
+    ("url_remover", url_remover, "url"),
+    ("date_remover", date_remover, "7777")
+]
+# substitutions applied in order by `to_raw_text_pairings`:
+raw_text_pairings_steps = [
+    ("mvar_parser", mvar_parser, leave_unclosed("\g<1>")),
+    ("squiggly_bracket_parser", squiggly_bracket_parser, leave_unclosed(empty_space)),
+    ("table_parser", table_parser, leave_unclosed(empty_space)),
+    ("markup_normalizer", markup_normalizer, empty_string),
+    ("remove_wikipedia_link", remove_wikipedia_link, leave_unclosed(anchor_replacer)),
+    ("remove_bullets_nbsps", remove_bullets_nbsps, empty_space),
+    ("greater_than", greater_than, "&gt;\g<1>"),
+    ("less_than", less_than, "&lt;\g<1>"),
+    ("math_source_sections", math_source_sections, leave_unclosed(empty_space)),
+    ("html_remover", html_remover, leave_unclosed(empty_space))
+]
+
+
+def apply_steps(steps, text, stage="apply_steps"):
+    """
+    Apply a list of (name, regex, replacement) substitutions in order.
+
+    Arguments
+    ---------
+        steps : list<tuple<str, re.Expression, str or function>>
+        text : str
+        stage : str, prefix of the step names when profiling
+            (see `ciseau.profile`).
+
+    Returns
+    -------
+        str : text after all substitutions.
+    """
+    profile = profiling.active
+    if profile is None:
+        for _, regex, replacement in steps:
+            text = regex.sub(replacement, text)
+    else:
+        for name, regex, replacement in steps:
+            text = profile.substitute(stage + "/" + name, regex, replacement, text)
+    return text
+
+
+def sent_tokenize_spans_after_steps(steps, text, keep_whitespace=False, normalize_ascii=True):
+    """
+    Apply a list of (name, regex, replacement) substitutions in order,
+    then tokenize the result into sentences, and pair each token
+    with the span of `text` it comes from.
+
+    Arguments
+    ---------
+        steps : list<tuple<str, re.Expression, str or function>>
+        text : str
+        keep_whitespace : bool, whether to strip out spaces
+            and newlines.
+        normalize_ascii : bool, perform some replacements
+            on rare characters (see `sent_tokenize`).
+
+    Returns
+    -------
+        list<list<tuple<str, int, int>>> : sentences, holding each
+            token with its start and end character offsets in `text`.
+    """
+    typecode = offset_typecode(len(text))
+    starts = array(typecode, range(len(text) + 1))
+    ends = array(typecode, range(1, len(text) + 1))
+    ends.append(len(text))
+    out = text
+    for _, regex, replacement in steps:
+        out, starts, ends = substitute_with_offsets(regex, replacement, out, starts, ends)
+    sentences, offsets, boundaries = _sent_tokenize_with_offsets(
+        out, keep_whitespace, normalize_ascii
+    )
+    for i in range(0, len(offsets), 2):
+        start = offsets[i]
+        end = offsets[i + 1]
+        offsets[i] = starts[start]
+        offsets[i + 1] = ends[end - 1] if end > start else starts[start]
+    return spans_from_offsets(sentences, offsets, boundaries, keep_whitespace)
+
+
 def remove_dates(text):
     return date_remover.sub("7777", text)
 
 
 def remove_html(text):
-    return html_remover.sub(empty_space, text)
+    return html_remover.sub(leave_unclosed(empty_space), text)
 
 
 def remove_markup(text):
@@ -67,7 +243,7 @@ def reintroduce_less_than(text):
 
 def reintroduce_greater_than(text):
     #return text
-    return greater_than.sub("\g<1>&gt;\g<2>", text)
+    return greater_than.sub("&gt;\g<1>", text)
 
 
 def reintroduce_less_than_greater_than(text):
@@ -75,16 +251,19 @@ def reintroduce_less_than_greater_than(text):
 
 
 def remove_math_sections(text):
-    return math_source_sections.sub(empty_space, reintroduce_less_than_greater_than(text))
+    return math_source_sections.sub(
+        leave_unclosed(empty_space),
+        reintroduce_less_than_greater_than(text)
+    )
 
 
 def _remove_brackets(text):
     return anchortag_internal_link.sub(
-        "\g<anchor>",
+        leave_unclosed("\g<anchor>"),
         single_internal_link.sub(
-            "\g<1>",
+            leave_unclosed("\g<1>"),
             category_internal_link.sub(
-                "\n\g<1> .\n",
+                leave_unclosed("\n\g<1> .\n"),
                 text
             )
         )
@@ -92,15 +271,15 @@ def _remove_brackets(text):
 
 
 def _remove_table(text):
-    return table_parser.sub(empty_space, text)
+    return table_parser.sub(leave_unclosed(empty_space), text)
 
 
 def _remove_squiggly_bracket(text):
-    return squiggly_bracket_parser.sub(empty_space, text)
+    return squiggly_bracket_parser.sub(leave_unclosed(empty_space), text)
 
 
 def _remove_mvar(text):
-    return mvar_parser.sub("\g<1>", text)
+    return mvar_parser.sub(leave_unclosed("\g<1>"), text)
 
 
 def remove_remaining_double_brackets(text):
@@ -115,7 +294,7 @@ def remove_brackets(text):
     return remove_remaining_double_brackets(_remove_brackets(text))
 
 
-def to_raw_text_markupless(text, keep_whitespace=False, normalize_ascii=True):
+def to_raw_text_markupless(text, keep_whitespace=False, normalize_ascii=True, max_length=None):
     """
     A generator to convert raw text segments, without xml to a
     list of words without any markup.
@@ -127,6 +306,9 @@ def to_raw_text_markupless(text, keep_whitespace=False, normalize_ascii=True):
         keep_whitespace : bool, should the output retain the
             whitespace of the input (so that char offsets in the
             output correspond to those in the input).
+        max_length : int or None, longer texts (once stripped
+           of markup) are only split along whitespace and
+           punctuation (see `tokenize`).
 
     Returns
     -------
@@ -134,13 +316,14 @@ def to_raw_text_markupless(text, keep_whitespace=False, normalize_ascii=True):
             within each sentence a list of the words separated.
     """
     return sent_tokenize(
-        remove_dates(_remove_urls(text)),
+        apply_steps(raw_text_markupless_steps, text, "to_raw_text_markupless"),
         keep_whitespace,
-        normalize_ascii
+        normalize_ascii,
+        max_length
     )
 
 
-def to_raw_text(text, keep_whitespace=False, normalize_ascii=True):
+def to_raw_text(text, keep_whitespace=False, normalize_ascii=True, max_length=None):
     """
     A generator to convert raw text segments, with xml, and other
     non-textual content to a list of words without any markup.
@@ -152,30 +335,21 @@ def to_raw_text(text, keep_whitespace=False, normalize_ascii=True):
        keep_whitespace : bool, should the output retain the
           whitespace of the input (so that char offsets in the
           output correspond to those in the input).
+       max_length : int or None, longer texts (once stripped
+          of markup) are only split along whitespace and
+          punctuation (see `tokenize`).
 
     Returns
     -------
         generator<list<list<str>>>, a generator for sentences, with
             within each sentence a list of the words separated.
     """
-    out = text
-    out = _remove_urls(text)
-    out = _remove_mvar(out)
-    out = _remove_squiggly_bracket(out)
-    out = _remove_table(out)
-    out = _remove_brackets(out)
-    out = remove_remaining_double_brackets(out)
-    out = remove_markup(out)
-    out = remove_wikipedia_link.sub(anchor_replacer, out)
-    out = remove_bullets_nbsps.sub(empty_space, out)
-    out = remove_dates(out)
-    out = remove_math_sections(out)
-    out = remove_html(out)
-    out = sent_tokenize(out, keep_whitespace, normalize_ascii)
+    out = apply_steps(raw_text_steps, text, "to_raw_text")
+    out = sent_tokenize(out, keep_whitespace, normalize_ascii, max_length)
     return out
 
 
-def to_raw_text_pairings(text, keep_whitespace=False, normalize_ascii=True):
+def to_raw_text_pairings(text, keep_whitespace=False, normalize_ascii=True, max_length=None):
     """
     A generator to convert raw text segments, with xml, and other
     non-textual content to a list of words without any markup.
@@ -188,20 +362,59 @@ def to_raw_text_pairings(text, keep_whitespace=False, normalize_ascii=True):
        keep_whitespace : bool, should the output retain the
           whitespace of the input (so that char offsets in the
           output correspond to those in the input).
+       max_length : int or None, longer texts (once stripped
+          of markup) are only split along whitespace and
+          punctuation (see `tokenize`).
 
     Returns
     -------
         generator<list<list<str>>>, a generator for sentences, with
             within each sentence a list of the words separated.
     """
-    out = text
-    out = _remove_mvar(out)
-    out = _remove_squiggly_bracket(out)
-    out = _remove_table(out)
-    out = remove_markup(out)
-    out = remove_wikipedia_link.sub(anchor_replacer, out)
-    out = remove_bullets_nbsps.sub(empty_space, out)
-    out = remove_math_sections(out)
-    out = remove_html(out)
-    for sentence in sent_tokenize(out, keep_whitespace, normalize_ascii):
+    out = apply_steps(raw_text_pairings_steps, text, "to_raw_text_pairings")
+    for sentence in sent_tokenize(out, keep_whitespace, normalize_ascii, max_length):
         yield sentence
+
+
+def to_raw_text_spans(text, keep_whitespace=False, normalize_ascii=True):
+    """
+    Same as `to_raw_text`, but pair each word with the span
+    of the input it was extracted from (e.g. the anchor of a
+    link points inside the link's markup, and `7777` covers
+    the whole date it replaces).
+
+    Arguments
+    ---------
+       text: str, input text to tokenize, strip of markup.
+       keep_whitespace : bool, should the output retain the
+          whitespace of the input.
+
+    Returns
+    -------
+        list<list<tuple<str, int, int>>>, sentences, holding each
+            word with its start and end character offsets in `text`.
+    """
+    return sent_tokenize_spans_after_steps(
+        raw_text_steps, text, keep_whitespace, normalize_ascii
+    )
+
+
+def to_raw_text_markupless_spans(text, keep_whitespace=False, normalize_ascii=True):
+    """
+    Same as `to_raw_text_markupless`, but pair each word with
+    the span of the input it was extracted from.
+
+    Arguments
+    ---------
+        text: str, input text to tokenize, strip of markup.
+        keep_whitespace : bool, should the output retain the
+            whitespace of the input.
+
+    Returns
+    -------
+        list<list<tuple<str, int, int>>>, sentences, holding each
+            word with its start and end character offsets in `text`.
+    """
+    return sent_tokenize_spans_after_steps(
+        raw_text_markupless_steps, text, keep_whitespace, normalize_ascii
+    )
@@ -1,108 +1,115 @@
 # -*- coding: utf-8 -*-
-import re
+import sys
+from functools import partial
+from . import profiling
 from .constants import (
     PUNCT_SYMBOLS,
-    ABBR,
+    ABBREVIATIONS,
     MONTHS,
     UNDECIDED,
     SHOULD_SPLIT,
-    SHOULD_NOT_SPLIT
+    SHOULD_NOT_SPLIT,
+    SHOULD_SPLIT_BYTE,
+    SHOULD_NOT_SPLIT_BYTE
 )
 from .regular_expressions import (
     word_with_period,
+    shorthand_candidate_finder,
     no_punctuation,
-    numerical_expression,
     repeated_dash_converter,
     dash_converter,
-    pure_whitespace,
-    left_quote_shifter,
-    left_quote_converter,
     one_letter_long_or_repeating,
-    left_single_quote_converter,
-    remaining_quote_converter,
-    english_nots,
-    english_contractions,
-    english_specific_appendages,
-    french_appendages,
-    right_single_quote_converter,
-    simple_dash_finder,
-    advanced_dash_finder,
+    split_end_finder,
+    split_start_finder,
+    left_single_quote_finder,
+    multi_single_quote_finder,
     url_file_finder,
-    shifted_ellipses,
-    shifted_standard_punctuation,
-    multi_single_quote_finder
+    url_anchor_finder,
+    url_host_characters,
+    url_scheme_characters,
+    punctuation_finder,
+    advanced_punctuation_finder,
+    word_character,
+    coarse_token_finder,
+    non_ascii_characters,
+    period,
+    LEFT_QUOTE_ALTERNATIVES
 )
 
 
-def protect_shorthand(text, split_locations):
+def protect_shorthand(text, split_locations, abbreviations=ABBREVIATIONS, start=0, end=None):
     """
     Annotate locations in a string that contain
     periods as being true periods or periods
     that are a part of shorthand (and thus should
     not be treated as punctuation marks).
 
+    Only the words that end with a period, or follow
+    one, are examined: the others start after whitespace,
+    where the previous passes already decided to split.
+
     Arguments:
     ----------
         text : str
-        split_locations : list<int>, same length as text.
+        split_locations : bytearray, same length as text.
+        abbreviations : set<str> or AbbreviationLexicon,
+            lowercased abbreviations (without their period).
+        start : int, position where the text to examine
+            begins in `text` (e.g. one of the texts joined
+            by `tokenize_batch`).
+        end : int or None, position where it ends (defaults
+            to the end of `text`).
     """
-    word_matches = list(re.finditer(word_with_period, text))
-    total_words = len(word_matches)
-
-    for i, match in enumerate(word_matches):
+    if end is None:
+        end = len(text)
+    for match in shorthand_candidate_finder.finditer(text, start, end):
         match_start = match.start()
         match_end = match.end()
-        for char_pos in range(match_start, match_end):
-            if split_locations[char_pos] == SHOULD_SPLIT and match_end - char_pos > 1:
-                match_start = char_pos
-        word = text[match_start:match_end]
+        # the word starts after the last split it contains:
+        last_split = split_locations.rfind(SHOULD_SPLIT_BYTE, match_start, match_end - 1)
+        if last_split != -1:
+            match_start = last_split
 
-        if not word.endswith('.'):
+        period_pos = match_end - 1
+        if text[period_pos] != '.':
             # ensure that words contained within other words:
             # e.g. 'chocolate.Mountains of'  -> 'chocolate. Mountains of'
-            if (not word[0].isdigit() and
+            if (not text[match_start].isdigit() and
                 split_locations[match_start] == UNDECIDED):
                 split_locations[match_start] = SHOULD_SPLIT
             continue
-        period_pos = match_end - 1
-        # this is not the last word, abbreviation
-        # is not the final period of the sentence,
-        # moreover:
-        word_is_in_abbr = word[:-1].lower() in ABBR
-        is_abbr_like = (
-            word_is_in_abbr or
-            one_letter_long_or_repeating.match(word[:-1]) is not None
-        )
-        is_digit = False if is_abbr_like else word[:-1].isdigit()
-
-        is_last_word = i == (total_words - 1)
-        is_ending = is_last_word and (match_end == len(text) or text[match_end:].isspace())
-        is_not_ending = not is_ending
-        abbreviation_and_not_end = (
-            len(word) > 1 and
-            is_abbr_like and
-            is_not_ending
-        )
-
-        if abbreviation_and_not_end and (
-                (not is_last_word and word_matches[i+1].group(0)[0].islower()) or
-                (not is_last_word and word_matches[i+1].group(0) in PUNCT_SYMBOLS) or
-                word[0].isupper() or
-                word_is_in_abbr or
-                len(word) == 2):
+        stem = text[match_start:period_pos]
+        is_in_abbreviations = stem.lower() in abbreviations
+        if is_in_abbreviations or (
+                len(stem) == 1 and one_letter_long_or_repeating.match(stem) is not None):
+            # this is not the last word, abbreviation
+            # is not the final period of the sentence,
+            # moreover:
+            next_word = word_with_period.search(text, match_end, end)
+            is_ending = next_word is None and (
+                match_end == end or text[match_end:end].isspace()
+            )
             # next word is lowercase (e.g. not a new sentence?), or next word
             # is punctuation or next word is totally uppercase (e.g. 'Mister.
             # ABAGNALE called to the stand')
-            if split_locations[period_pos] == SHOULD_SPLIT and period_pos + 1 < len(split_locations):
-                split_locations[period_pos + 1] = SHOULD_SPLIT
-            split_locations[period_pos] = SHOULD_NOT_SPLIT
-        elif (is_digit and
-              len(word[:-1]) <= 2 and
-              not is_last_word and
-              word_matches[i+1].group(0).lower() in MONTHS):
+            is_shorthand = not is_ending and (
+                (next_word is not None and (
+                    next_word.group(0)[0].islower() or
+                    next_word.group(0) in PUNCT_SYMBOLS)) or
+                stem[0].isupper() or
+                is_in_abbreviations or
+                len(stem) == 1
+            )
+        elif len(stem) <= 2 and stem.isdigit():
             # a date or weird number with a period:
-            if split_locations[period_pos] == SHOULD_SPLIT and period_pos + 1 < len(split_locations):
-                split_locations[period_pos + 1] = SHOULD_SPLIT
+            next_word = word_with_period.search(text, match_end, end)
+            is_shorthand = next_word is not None and next_word.group(0).lower() in MONTHS
+        else:
+            is_shorthand = False
+
+        if is_shorthand:
+            if split_locations[period_pos] == SHOULD_SPLIT and match_end < len(split_locations):
+                split_locations[match_end] = SHOULD_SPLIT
             split_locations[period_pos] = SHOULD_NOT_SPLIT
         elif split_locations[period_pos] == UNDECIDED:
             # split this period into its own segment:
@@ -111,13 +118,13 @@ def protect_shorthand(text, split_locations):
 
 def split_with_locations(text, locations):
     """
-    Use an integer list to split the string
-    contained in `text`.
+    Use an array of split decisions to split the
+    string contained in `text`.
 
     Arguments:
     ----------
         text : str, same length as locations.
-        locations : list<int>, contains values
+        locations : bytearray, contains values
             'SHOULD_SPLIT', 'UNDECIDED', and
             'SHOULD_NOT_SPLIT'. Will create
             strings between each 'SHOULD_SPLIT'
@@ -129,11 +136,11 @@ def split_with_locations(text, locations):
             in locations.
     """
     start = 0
-    for pos, decision in enumerate(locations):
-        if decision == SHOULD_SPLIT:
-            if start != pos:
-                yield text[start:pos]
-            start = pos
+    pos = locations.find(SHOULD_SPLIT_BYTE, 1)
+    while pos != -1:
+        yield text[start:pos]
+        start = pos
+        pos = locations.find(SHOULD_SPLIT_BYTE, pos + 1)
     if start != len(text):
         yield text[start:]
 
@@ -147,14 +154,167 @@ def mark_regex(regex, text, split_locations):
     ---------
         regex : re.Expression
         text : str, same length as split_locations
-        split_locations : list<int>, split decisions.
+        split_locations : bytearray, split decisions.
+    """
+    for match in regex.finditer(text):
+        end_match = match.end()
+        if end_match < len(split_locations):
+            split_locations[end_match] = SHOULD_SPLIT
+
+
+def mark_start_regex(regex, text, split_locations):
+    """
+    Regex that adds a 'SHOULD_SPLIT' marker at the start
+    location of each matching group of the given regex.
+
+    Arguments
+    ---------
+        regex : re.Expression
+        text : str, same length as split_locations
+        split_locations : bytearray, split decisions.
     """
     for match in regex.finditer(text):
+        split_locations[match.start()] = SHOULD_SPLIT
+
+
+class WordLookahead(object):
+    """
+    Tells whether a word character follows a position on the
+    same line, like the lookahead "(?=.*?\\w)". Positions must be
+    queried in increasing order, which takes linear time overall
+    (instead of rescanning the line for each query).
+
+    Arguments
+    ---------
+        text : str
+    """
+    def __init__(self, text):
+        self.text = text
+        self.next_word = -1
+        self.next_newline = -1
+
+    def __call__(self, position):
+        if self.next_word < position:
+            match = word_character.search(self.text, position)
+            self.next_word = len(self.text) if match is None else match.start()
+        if self.next_newline < position:
+            self.next_newline = self.text.find("\n", position)
+            if self.next_newline == -1:
+                self.next_newline = len(self.text)
+        return self.next_word < self.next_newline
+
+
+def mark_split_ends(text, split_locations):
+    """
+    Adds a 'SHOULD_SPLIT' marker at the end location of each
+    match of `split_end_finder`, provided that left quotes are
+    followed by a word on their line.
+
+    Arguments
+    ---------
+        text : str, same length as split_locations
+        split_locations : bytearray, split decisions.
+    """
+    word_follows = WordLookahead(text)
+    for match in split_end_finder.finditer(text):
         end_match = match.end()
+        if match.lastgroup in LEFT_QUOTE_ALTERNATIVES and not word_follows(end_match):
+            continue
         if end_match < len(split_locations):
             split_locations[end_match] = SHOULD_SPLIT
 
 
+def mark_left_single_quotes(text, split_locations):
+    """
+    Adds a 'SHOULD_SPLIT' marker after each left single
+    quote (and its trailing whitespace). A quote opens a
+    segment if it begins the text, or follows a non-word
+    character that is not the previous such quote or its
+    whitespace, and is followed by a word on its line.
+
+    Arguments
+    ---------
+        text : str, same length as split_locations
+        split_locations : bytearray, split decisions.
+    """
+    word_follows = WordLookahead(text)
+    end_match = 0
+    for match in left_single_quote_finder.finditer(text):
+        begin_match = match.start()
+        if (begin_match == 0 or begin_match > end_match) and word_follows(match.end()):
+            end_match = match.end()
+            if end_match < len(split_locations):
+                split_locations[end_match] = SHOULD_SPLIT
+
+
+# farthest the host name of a match of `url_file_finder` can start
+# before the anchor it relies on:
+URL_HOST_REACH = 256 + len("www.")
+
+
+def _url_search_start(text, reversed_text, dot, position):
+    """
+    Earliest position where a match of `url_file_finder` relying
+    on the anchor at `dot` may start. A match always starts there
+    or at most 256 + len('://') + len('www.') characters later.
+    """
+    length = len(text)
+    # host names hold the anchor and end there, looked for in a
+    # window as they are limited to 256 characters (the run of
+    # host characters ending at the anchor is matched backwards):
+    window_start = max(position, dot - URL_HOST_REACH - 1)
+    run = url_host_characters.match(reversed_text, length - dot, length - window_start)
+    host_start = dot - (run.end() - run.start())
+    # a scheme ending with '://' right before the host:
+    if host_start - 5 >= position and text[host_start - 3:host_start] == "://":
+        scheme_end = host_start - 3
+        window_start = max(position, scheme_end - 257)
+        run = url_scheme_characters.match(
+            reversed_text, length - scheme_end, length - window_start
+        )
+        scheme_start = max(scheme_end - (run.end() - run.start()), scheme_end - 256)
+        if scheme_start <= scheme_end - 2:
+            return scheme_start
+    # possibly a host name starting with 'www.' beyond the 256 characters:
+    return max(position, host_start, dot - URL_HOST_REACH)
+
+
+def iter_urls(text):
+    """
+    Find the same matches as `url_file_finder.finditer(text)`,
+    in linear time. The expression tries its bounded repetitions
+    `{2,256}` at each position of the text, although a match
+    must contain an anchor: a '.' followed by two lowercase
+    letters and preceded by two characters of a host name.
+    The search thus only starts shortly before these anchors.
+    Since a match extends to the end of the url-like characters
+    following its start, the earliest start is all that needs
+    to be found.
+
+    Arguments
+    ---------
+        text : str
+
+    Returns
+    -------
+        generator<re.Match>
+    """
+    position = 0
+    reversed_text = None
+    for anchor in url_anchor_finder.finditer(text):
+        dot = anchor.start()
+        if dot - 2 < position:
+            # this anchor lies within the previous url
+            continue
+        if reversed_text is None:
+            reversed_text = text[::-1]
+        match = url_file_finder.search(
+            text, _url_search_start(text, reversed_text, dot, position)
+        )
+        yield match
+        position = match.end()
+
+
 def mark_begin_end_regex(regex, text, split_locations):
     """
     Regex that adds a 'SHOULD_SPLIT' marker at the end
@@ -167,14 +327,28 @@ def mark_begin_end_regex(regex, text, split_locations):
     ---------
         regex : re.Expression
         text : str, same length as split_locations
-        split_locations : list<int>, split decisions.
+        split_locations : bytearray, split decisions.
     """
-    for match in regex.finditer(text):
+    mark_begin_end(regex.finditer(text), split_locations)
+
+
+def mark_begin_end(matches, split_locations):
+    """
+    Same as `mark_begin_end_regex`, for already found matches.
+
+    Arguments
+    ---------
+        matches : iterable<re.Match>
+        split_locations : bytearray, split decisions.
+    """
+    for match in matches:
         end_match = match.end()
         begin_match = match.start()
 
-        for i in range(begin_match+1, end_match):
-            split_locations[i] = SHOULD_NOT_SPLIT
+        if end_match - begin_match > 1:
+            split_locations[begin_match+1:end_match] = (
+                SHOULD_NOT_SPLIT_BYTE * (end_match - begin_match - 1)
+            )
         if end_match < len(split_locations):
             if split_locations[end_match] == UNDECIDED:
                 split_locations[end_match] = SHOULD_SPLIT
@@ -182,7 +356,184 @@ def mark_begin_end_regex(regex, text, split_locations):
             split_locations[begin_match] = SHOULD_SPLIT
 
 
-def tokenize(text, normalize_ascii=True):
+def mark_urls(text, split_locations):
+    """
+    Mark the matches of `url_file_finder` (see `iter_urls`)
+    as unsplittable segments.
+
+    Arguments
+    ---------
+        text : str, same length as split_locations
+        split_locations : bytearray, split decisions.
+    """
+    mark_begin_end(iter_urls(text), split_locations)
+
+
+if sys.version_info >= (3, 7):
+    def is_ascii(text):
+        return text.isascii()
+else:
+    def is_ascii(text):
+        return non_ascii_characters.search(text) is None
+
+
+def normalize_text(text):
+    """
+    Standardize rare characters to ascii: œ -> oe,
+    æ -> ae, and runs of dashes become a single dash.
+    Note: this will no longer respect input-to-output
+    character positions.
+
+    Arguments:
+    ----------
+        text : str
+
+    Returns:
+    --------
+        str : normalized text.
+    """
+    # normalize these greco-roman characters to ascii:
+    text = text.replace(u"œ", "oe").replace(u"æ", "ae")
+    # normalize dashes:
+    return repeated_dash_converter.sub("-", text)
+
+
+def _split_passes(punctuation):
+    # Each pass is (name, function(text) telling whether the pass can
+    # change any split location, function(text) finding the matches the
+    # pass relies on or None, function(text, split_locations)), run in
+    # order by `find_split_locations`. Passes are skipped on texts that
+    # hold none of their first characters (e.g. quotes, or the '.' of
+    # urls and shorthand), which is the case of most short sentences.
+    return [
+        # 4. Mark split locations found by a few combined regular
+        # expressions. These split on whitespace, quotes, and
+        # english/french appendages, e.g.:
+        # regex can't fix this -> regex ca n't fix this
+        # you'll dig this -> you 'll dig this
+        # the rhino's horns -> the rhino 's horns
+        # qu'a tu fais au rhino -> qu ' a tu fais au rhino,
+        ("split_end_finder", split_end_finder.search, split_end_finder.finditer,
+         mark_split_ends),
+        ("split_start_finder", split_start_finder.search, split_start_finder.finditer,
+         partial(mark_start_regex, split_start_finder)),
+        ("left_single_quote_finder", left_single_quote_finder.search,
+         left_single_quote_finder.finditer, mark_left_single_quotes),
+        # 5. Mark begin and end locations for other regular expressions:
+        # the rhino--truck -> the rhino -- truck
+        # the #rhino! -> the # rhino ! ;
+        # the rino[sic] -> the rino [ sic ]
+        ("multi_single_quote_finder", multi_single_quote_finder.search,
+         multi_single_quote_finder.finditer,
+         partial(mark_begin_end_regex, multi_single_quote_finder)),
+        ("url_file_finder", url_anchor_finder.search, iter_urls, mark_urls),
+        ("punctuation_finder", punctuation.search, punctuation.finditer,
+         partial(mark_begin_end_regex, punctuation)),
+        # 6. Remove splitting on exceptional uses of periods:
+        # I'm with Mr. -> I 'm with Mr. , I'm with Mister. -> I 'm with Mister .
+        # (without periods, words already start after whitespace)
+        ("protect_shorthand", period.search, None, protect_shorthand)
+    ]
+
+split_passes = _split_passes(punctuation_finder)
+# without ascii normalization, non-ascii dashes are punctuation too:
+advanced_split_passes = _split_passes(advanced_punctuation_finder)
+
+
+def select_split_passes(normalize_ascii=True, abbreviations=None):
+    """
+    Passes run by `find_split_locations` for a configuration.
+
+    Arguments:
+    ----------
+        normalize_ascii : bool, whether texts are normalized
+            (only ascii dashes are then considered).
+        abbreviations : AbbreviationLexicon or None, words
+            that keep their period (None uses the english
+            abbreviations of `constants.ABBR`).
+
+    Returns:
+    --------
+        list<tuple> : (name, can_fire, find_matches, mark)
+            for each pass.
+    """
+    passes = split_passes if normalize_ascii else advanced_split_passes
+    if abbreviations is None:
+        return passes
+    # same passes, detecting shorthand with other abbreviations:
+    return [
+        (name, can_fire, find_matches,
+         partial(protect_shorthand, abbreviations=abbreviations)
+         if name == "protect_shorthand" else mark)
+        for name, can_fire, find_matches, mark in passes
+    ]
+
+
+def find_split_locations(text, normalize_ascii=True, abbreviations=None, passes=None):
+    """
+    Decide where a string should be split into tokens.
+
+    Arguments:
+    ----------
+        text : str, already normalized if `normalize_ascii`
+            is True.
+        normalize_ascii : bool, whether text was normalized
+            (only ascii dashes are then considered).
+        abbreviations : AbbreviationLexicon or None, words
+            that keep their period (None uses the english
+            abbreviations of `constants.ABBR`).
+        passes : list<tuple> or None, output of
+            `select_split_passes` for the two previous
+            arguments (to avoid selecting them again).
+
+    Returns:
+    --------
+        bytearray : split decisions, same length as text.
+    """
+    # 3. let's construct a byte array of the possible split locations
+    # (all of them start out as UNDECIDED):
+    split_locations = bytearray(len(text))
+
+    # 4-6. run the passes over the text:
+    if passes is None:
+        passes = select_split_passes(normalize_ascii, abbreviations)
+    profile = profiling.active
+    if profile is None:
+        for _, can_fire, _, mark in passes:
+            if can_fire(text):
+                mark(text, split_locations)
+    else:
+        for name, can_fire, find_matches, mark in passes:
+            if can_fire(text):
+                profile.mark("tokenize/" + name, find_matches, mark, text, split_locations)
+    return split_locations
+
+
+def coarse_tokenize(text, normalize_ascii=True):
+    """
+    Convert a single string into a list of substrings
+    split along whitespace and punctuation only: runs of
+    alphanumeric characters form words, and every other
+    character stands alone. Whitespace is attached to
+    the previous token, as in `tokenize`.
+
+    Arguments:
+    ----------
+        text : str
+        normalize_ascii : bool, perform some replacements
+            on non-ascii characters to canonicalize the
+            string (defaults to True).
+
+    Returns:
+    --------
+        list<str>, list of substring tokens.
+    """
+    if normalize_ascii:
+        text = dash_converter.sub("-", normalize_text(text))
+    return coarse_token_finder.findall(text)
+
+
+def tokenize(text, normalize_ascii=True, max_length=None, abbreviations=None, passes=None):
     """
     Convert a single string into a list of substrings
     split along punctuation and word boundaries. Keep
@@ -195,6 +546,16 @@ def tokenize(text, normalize_ascii=True):
         normalize_ascii : bool, perform some replacements
             on non-ascii characters to canonicalize the
             string (defaults to True).
+        max_length : int or None, strings longer than this
+            are only split along whitespace and punctuation
+            (see `coarse_tokenize`), bounding the time spent
+            on any single input.
+        abbreviations : AbbreviationLexicon or None, words
+            that keep their period, e.g. 'approx.' (None uses
+            the english abbreviations of `constants.ABBR`).
+        passes : list<tuple> or None, output of
+            `select_split_passes(normalize_ascii, abbreviations)`
+            (see `ciseau.Tokenizer`).
 
     Returns:
     --------
@@ -203,58 +564,152 @@ def tokenize(text, normalize_ascii=True):
     # 1. If there's no punctuation, return immediately
     if no_punctuation.match(text):
         return [text]
+    if max_length is not None and len(text) > max_length:
+        return coarse_tokenize(text, normalize_ascii)
     # 2. let's standardize the input text to ascii (if desired)
     # Note: this will no longer respect input-to-output character positions
-    if normalize_ascii:
-        # normalize these greco-roman characters to ascii:
-        text = text.replace(u"œ", "oe").replace(u"æ", "ae")
-        # normalize dashes:
-        text = repeated_dash_converter.sub("-", text)
-    # 3. let's construct an integer array of the possible split locations:
-    split_locations = [UNDECIDED] * len(text)
-
-    regexes = (
-        pure_whitespace,
-        left_quote_shifter,
-        left_quote_converter,
-        left_single_quote_converter,
-        remaining_quote_converter,
-        # regex can't fix this -> regex ca n't fix this
-        english_nots,
-        # you'll dig this -> you 'll dig this
-        english_contractions,
-        # the rhino's horns -> the rhino 's horns
-        english_specific_appendages,
-        # qu'a tu fais au rhino -> qu ' a tu fais au rhino,
-        french_appendages
-    )
-    # 4. Mark end locations for specific regular expressions:
-    for regex in regexes:
-        mark_regex(regex, text, split_locations)
-
-    begin_end_regexes = (
-        multi_single_quote_finder,
-        right_single_quote_converter,
-        # use dashes as the breakpoint:
-        # the rhino--truck -> the rhino -- truck
-        simple_dash_finder if normalize_ascii else advanced_dash_finder,
-        numerical_expression,
-        url_file_finder,
-        shifted_ellipses,
-        # the #rhino! -> the # rhino ! ;
-        # the rino[sic] -> the rino [ sic ]
-        shifted_standard_punctuation
-    )
-
-    # 5. Mark begin and end locations for other regular expressions:
-    for regex in begin_end_regexes:
-        mark_begin_end_regex(regex, text, split_locations)
+    # (ascii text only needs its repeated dashes collapsed):
+    ascii_only = is_ascii(text)
+    if normalize_ascii and (not ascii_only or "--" in text):
+        text = normalize_text(text)
+    # 3-6. find the split locations:
+    split_locations = find_split_locations(text, normalize_ascii, abbreviations, passes)
 
-    # 6. Remove splitting on exceptional uses of periods:
-    # I'm with Mr. -> I 'm with Mr. , I'm with Mister. -> I 'm with Mister .
-    protect_shorthand(text, split_locations)
-
-    if normalize_ascii:
+    if normalize_ascii and not ascii_only:
         text = dash_converter.sub("-", text)
     # 7. Return the split string using the integer list:
     return list(split_with_locations(text, split_locations))
+
+
+def tokenized_text(text, normalize_ascii=True):
+    """
+    Text that the tokens returned by `tokenize` add up to:
+    the input, after the replacements of `normalize_ascii`.
+
+    Arguments:
+    ----------
+        text : str
+        normalize_ascii : bool, see `tokenize`.
+
+    Returns:
+    --------
+        str
+    """
+    if not normalize_ascii or no_punctuation.match(text):
+        return text
+    if not is_ascii(text):
+        return dash_converter.sub("-", normalize_text(text))
+    if "--" in text:
+        return normalize_text(text)
+    return text
+
+
+# joins the texts of `tokenize_batch`: no expression matches across
+# "\x00" (which is neither whitespace, punctuation nor part of a word
+# or url), and the newline ends the line for the expressions looking
+# ahead for a word (or behind for any character):
+BATCH_SEPARATOR = u"\x00\n"
+
+
+def _protect_shorthand_batch(protect_shorthand, ends, text, split_locations):
+    # `protect_shorthand` over each of the texts joined by `tokenize_batch`
+    # that holds a period (its expression has no first character to look
+    # for, and would otherwise scan every text):
+    start = 0
+    for end in ends:
+        if text.find(".", start, end) != -1:
+            protect_shorthand(text, split_locations, start=start, end=end)
+        start = end + len(BATCH_SEPARATOR)
+
+
+def tokenize_batch(texts, normalize_ascii=True, max_length=None, abbreviations=None,
+                   passes=None):
+    """
+    Same as `[tokenize(text) for text in texts]`, faster
+    on many short strings (e.g. queries or titles): the texts
+    are joined with a separator, and each pass runs once over
+    the joined text (instead of paying for every pass, and
+    every call, on each text).
+
+    Arguments:
+    ----------
+        texts : list<str>
+        normalize_ascii : bool, perform some replacements
+            on non-ascii characters to canonicalize the
+            strings (defaults to True).
+        max_length : int or None, strings longer than this
+            are only split along whitespace and punctuation
+            (see `tokenize`).
+        abbreviations : AbbreviationLexicon or None, words
+            that keep their period (see `tokenize`).
+        passes : list<tuple> or None, output of
+            `select_split_passes(normalize_ascii, abbreviations)`.
+
+    Returns:
+    --------
+        list<list<str>> : tokens of each text.
+    """
+    results = [None] * len(texts)
+    batch = []
+    for i, text in enumerate(texts):
+        # texts that `tokenize` returns early, and texts starting with a
+        # single quote (whose expression anchors to the start of the text):
+        if (no_punctuation.match(text) or text[:1] == "'" or
+                (max_length is not None and len(text) > max_length)):
+            results[i] = tokenize(text, normalize_ascii, max_length, abbreviations, passes)
+        else:
+            batch.append(i)
+    joined = BATCH_SEPARATOR.join([texts[i] for i in batch])
+    if joined.count(BATCH_SEPARATOR[0]) != max(len(batch) - 1, 0):
+        # the separator itself occurs in some texts:
+        unsafe = [i for i in batch if BATCH_SEPARATOR[0] in texts[i]]
+        for i in unsafe:
+            results[i] = tokenize(texts[i], normalize_ascii, max_length, abbreviations, passes)
+        batch = [i for i in batch if results[i] is None]
+        joined = BATCH_SEPARATOR.join([texts[i] for i in batch])
+    if len(batch) == 0:
+        return results
+
+    ascii_only = is_ascii(joined)
+    # end of each text in the joined text:
+    if normalize_ascii and (not ascii_only or "--" in joined):
+        joined = normalize_text(joined)
+        ends = []
+        position = joined.find(BATCH_SEPARATOR)
+        while position != -1:
+            ends.append(position)
+            position = joined.find(BATCH_SEPARATOR, position + len(BATCH_SEPARATOR))
+        ends.append(len(joined))
+    else:
+        ends = []
+        position = 0
+        for i in batch:
+            position += len(texts[i])
+            ends.append(position)
+            position += len(BATCH_SEPARATOR)
+
+    if passes is None:
+        passes = select_split_passes(normalize_ascii, abbreviations)
+    passes = [
+        (name, can_fire, find_matches,
+         partial(_protect_shorthand_batch, mark, ends) if name == "protect_shorthand" else mark)
+        for name, can_fire, find_matches, mark in passes
+    ]
+    split_locations = find_split_locations(joined, normalize_ascii, abbreviations, passes)
+    if normalize_ascii and not ascii_only:
+        joined = dash_converter.sub("-", joined)
+
+    # split each text (as `split_with_locations` does):
+    start = 0
+    for i, end in zip(batch, ends):
+        tokens = []
+        pos = split_locations.find(SHOULD_SPLIT_BYTE, start + 1, end)
+        while pos != -1:
+            tokens.append(joined[start:pos])
+            start = pos
+            pos = split_locations.find(SHOULD_SPLIT_BYTE, pos + 1, end)
+        if start != end:
+            tokens.append(joined[start:end])
+        results[i] = tokens
+        start = end + len(BATCH_SEPARATOR)
+    return results
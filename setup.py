@@ -1,9 +1,15 @@
 import os
+import sys
 from setuptools import setup, find_packages
 
 def readfile(fname):
     return open(os.path.join(os.path.dirname(__file__), fname)).read()
 
+console_scripts = ['ciseau = ciseau.cli:main']
+if sys.version_info >= (3, 7):
+    # the server is built on ciseau.aio, which needs Python 3.7:
+    console_scripts.append('ciseau-server = ciseau.server:main')
+
 setup(
     name='ciseau',
     version='1.0.1',
@@ -30,5 +36,8 @@ setup(
     setup_requires = [],
     install_requires=[
     ],
+    entry_points={
+        'console_scripts': console_scripts,
+    },
     include_package_data=True,
 )
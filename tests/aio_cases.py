@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of `ciseau.aio` and `ciseau.server`, loaded by test_aio.py on
+Python 3.7 and later (older versions cannot parse async functions).
+"""
+import asyncio
+import http.client
+import io
+import json
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from ciseau import tokenize, sent_tokenize, to_raw_text
+from ciseau.aio import TokenizationService
+from ciseau.server import handle_http, parse_request, serve_lines
+
+TEXTS = [
+    u"Mr. Smith went to Paris. He liked it!",
+    u"See [[France|the country]] in 2019.\nIt's “big”.",
+    u""
+]
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class TokenizationServiceTests(unittest.TestCase):
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(2)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_same_as_functions(self):
+        async def main():
+            async with TokenizationService(self.executor) as service:
+                return await asyncio.gather(
+                    *[service.tokenize(text) for text in TEXTS],
+                    *[service.sent_tokenize(text, keep_whitespace=True) for text in TEXTS],
+                    *[service.to_raw_text(text) for text in TEXTS]
+                )
+        self.assertEqual(
+            run(main()),
+            [tokenize(text) for text in TEXTS] +
+            [sent_tokenize(text, keep_whitespace=True) for text in TEXTS] +
+            [to_raw_text(text) for text in TEXTS]
+        )
+
+    def test_batching(self):
+        service = TokenizationService(self.executor, max_batch_size=16, max_wait=0.05)
+
+        async def main():
+            results = await asyncio.gather(*[service.tokenize(TEXTS[0]) for _ in range(40)])
+            await service.close()
+            return results
+        self.assertEqual(run(main()), [tokenize(TEXTS[0])] * 40)
+        self.assertEqual(service.num_requests, 40)
+        # two full batches, and the last one sent after `max_wait`:
+        self.assertEqual(service.num_batches, 3)
+        with self.assertRaises(ValueError):
+            TokenizationService(self.executor, max_batch_size=0)
+
+    def test_cancellation_and_backpressure(self):
+        service = TokenizationService(self.executor, max_wait=0.05, max_pending=2)
+
+        async def main():
+            tasks = [asyncio.ensure_future(service.tokenize(text)) for text in TEXTS]
+            await asyncio.sleep(0)
+            # the third request waits for one of the first two:
+            self.assertEqual(service.num_requests, 2)
+            tasks[0].cancel()
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            await service.close()
+            return results
+        results = run(main())
+        self.assertIsInstance(results[0], asyncio.CancelledError)
+        self.assertEqual(results[1:], [tokenize(text) for text in TEXTS[1:]])
+        self.assertEqual(service.num_requests, 3)
+        with self.assertRaises(RuntimeError):
+            run(service.tokenize(TEXTS[0]))
+
+    def test_several_event_loops(self):
+        service = TokenizationService(self.executor, max_pending=2)
+
+        async def main():
+            # more requests than `max_pending`, so that they wait for each other:
+            return await asyncio.gather(*[service.tokenize(text) for text in TEXTS * 3])
+        for _ in range(2):
+            self.assertEqual(run(main()), [tokenize(text) for text in TEXTS * 3])
+
+    def test_executor_errors(self):
+        executor = ThreadPoolExecutor(1)
+        executor.shutdown()
+        service = TokenizationService(executor, max_wait=0.01)
+
+        async def main():
+            # sent by the timer, and once the batch is full:
+            results = await asyncio.wait_for(asyncio.gather(
+                service.tokenize(TEXTS[0]), service.tokenize(TEXTS[1]), return_exceptions=True
+            ), 5)
+            results.append(await asyncio.wait_for(asyncio.gather(
+                *[service.tokenize(TEXTS[0]) for _ in range(service.max_batch_size)],
+                return_exceptions=True
+            ), 5))
+            return results
+        results = run(main())
+        self.assertIsInstance(results[0], RuntimeError)
+        self.assertIsInstance(results[1], RuntimeError)
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results[2]))
+
+
+class ServerTests(unittest.TestCase):
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(2)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_parse_request(self):
+        self.assertEqual(
+            parse_request({"id": 3, "function": "tokenize", "text": "Hi.", "max_length": 10}),
+            ("tokenize", "Hi.", {"max_length": 10})
+        )
+        for request in ([], {"text": 1}, {"function": "split", "text": ""},
+                        {"text": "", "abbreviations": []}, {"text": "", "keep_whitespace": 1}):
+            with self.assertRaises(ValueError):
+                parse_request(request)
+
+    def test_serve_lines(self):
+        fin = io.StringIO(
+            u"".join(json.dumps({"id": i, "text": text}) + u"\n" for i, text in enumerate(TEXTS)) +
+            u"\n{\n" + json.dumps({"id": "x", "function": "tokenize", "text": 2}) + u"\n"
+        )
+        fout = io.StringIO()
+
+        async def main():
+            async with TokenizationService(self.executor) as service:
+                await serve_lines(service, fin, fout)
+        run(main())
+        responses = [json.loads(line) for line in fout.getvalue().splitlines()]
+        self.assertEqual(len(responses), len(TEXTS) + 2)
+        results = {response["id"]: response for response in responses if "id" in response}
+        for i, text in enumerate(TEXTS):
+            self.assertEqual(results[i]["result"], sent_tokenize(text))
+        self.assertIn("error", results["x"])
+
+    def test_http(self):
+        def client(port):
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+            responses = []
+            for method, path, body in [("POST", "/to_raw_text", {"text": TEXTS[1]}),
+                                       ("POST", "/tokenize", {"text": TEXTS[0]}),
+                                       ("POST", "/split", {"text": TEXTS[0]}),
+                                       ("GET", "/tokenize", None),
+                                       ("POST", "/tokenize", {"text": None})]:
+                connection.request(method, path, json.dumps(body) if body else None)
+                response = connection.getresponse()
+                responses.append((response.status, json.loads(response.read().decode("utf-8"))))
+            connection.close()
+            return responses
+
+        async def main():
+            async with TokenizationService(self.executor) as service:
+                server = await asyncio.start_server(
+                    lambda reader, writer: handle_http(service, reader, writer),
+                    "127.0.0.1", 0
+                )
+                port = server.sockets[0].getsockname()[1]
+                try:
+                    return await asyncio.get_running_loop().run_in_executor(None, client, port)
+                finally:
+                    server.close()
+                    await server.wait_closed()
+        responses = run(main())
+        self.assertEqual(responses[0], (200, {"result": to_raw_text(TEXTS[1])}))
+        self.assertEqual(responses[1], (200, {"result": tokenize(TEXTS[0])}))
+        self.assertEqual([status for status, _ in responses[2:]], [404, 405, 400])
+
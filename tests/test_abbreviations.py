@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from ciseau import AbbreviationLexicon, tokenize, sent_tokenize, sent_tokenize_many
+from ciseau.constants import ABBREVIATIONS
+
+
+class AbbreviationLexiconTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_lookup(self):
+        lexicon = AbbreviationLexicon(["approx", "Abs.", " Oper ", "ph.d", "z. B.", u"Straße"])
+        self.assertEqual(sorted(lexicon), ["abs", "approx", "oper", u"straße"])
+        self.assertEqual(len(lexicon), 4)
+        for word in ("approx", "abs", "oper", u"straße"):
+            self.assertIn(word, lexicon)
+        for word in ("Abs", "ph", "", "approximately", "mr"):
+            self.assertNotIn(word, lexicon)
+        # a lexicon of many abbreviations:
+        words = ["w%d" % (i,) for i in range(20000)]
+        lexicon = AbbreviationLexicon(words)
+        self.assertTrue(all(word in lexicon for word in words))
+        self.assertFalse(any(("x%d" % (i,)) in lexicon for i in range(20000)))
+
+    def test_save_and_load(self):
+        path = os.path.join(self.directory, "legal.abbr")
+        AbbreviationLexicon(["approx", "cf"]).save(path)
+        lexicon = AbbreviationLexicon.load(path)
+        self.assertEqual(lexicon.path, path)
+        self.assertEqual(sorted(lexicon), ["approx", "cf"])
+        self.assertIn("cf", pickle.loads(pickle.dumps(lexicon)))
+        copy = AbbreviationLexicon.from_bytes(lexicon.to_bytes())
+        self.assertIn("approx", pickle.loads(pickle.dumps(copy)))
+        with self.assertRaises(ValueError):
+            AbbreviationLexicon.from_bytes(b"not a lexicon at all")
+
+    def test_tokenize(self):
+        text = u"See approx. ten cases. Mr. Smith agreed."
+        self.assertEqual(
+            tokenize(text),
+            [u"See ", u"approx", u". ", u"ten ", u"cases", u". ", u"Mr. ", u"Smith ", u"agreed", u"."]
+        )
+        lexicon = AbbreviationLexicon(["approx"])
+        self.assertEqual(
+            tokenize(text, abbreviations=lexicon),
+            [u"See ", u"approx. ", u"ten ", u"cases", u". ", u"Mr", u". ", u"Smith ", u"agreed", u"."]
+        )
+        # the english abbreviations give the default behavior:
+        english = AbbreviationLexicon(ABBREVIATIONS)
+        self.assertEqual(tokenize(text, abbreviations=english), tokenize(text))
+        extended = AbbreviationLexicon(list(ABBREVIATIONS) + ["approx"])
+        self.assertEqual(
+            sent_tokenize(text, abbreviations=extended),
+            [["See", "approx.", "ten", "cases", "."], ["Mr.", "Smith", "agreed", "."]]
+        )
+        self.assertEqual(
+            list(sent_tokenize_many([text] * 3, processes=2, abbreviations=extended)),
+            [sent_tokenize(text, abbreviations=extended)] * 3
+        )
@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+import sys
+import unittest
+
+if sys.version_info >= (3, 7):
+    from aio_cases import TokenizationServiceTests, ServerTests
+else:
+    @unittest.skip("ciseau.aio requires Python 3.7 or later")
+    class AioTests(unittest.TestCase):
+        def test_aio(self):
+            pass
+
+
+if __name__ == "__main__":
+    unittest.main()
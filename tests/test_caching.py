@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+import unittest
+from ciseau import (
+    AbbreviationLexicon,
+    TokenizationCache,
+    tokenize,
+    sent_tokenize,
+    to_raw_text
+)
+
+
+class TokenizationCacheTests(unittest.TestCase):
+    def test_results_match_uncached(self):
+        cache = TokenizationCache(max_entries=10)
+        text = u"Mr. Joe was late. He said so."
+        for _ in range(2):
+            self.assertEqual(cache.tokenize(text), tuple(tokenize(text)))
+            self.assertEqual(
+                cache.sent_tokenize(text, keep_whitespace=True),
+                tuple(tuple(sentence) for sentence in sent_tokenize(text, keep_whitespace=True))
+            )
+            self.assertEqual(
+                cache.to_raw_text(u"[[Paris|The city]] is big."),
+                tuple(tuple(sentence) for sentence in to_raw_text(u"[[Paris|The city]] is big."))
+            )
+        # options are part of the key:
+        self.assertNotEqual(cache.sent_tokenize(text), cache.sent_tokenize(text, keep_whitespace=True))
+        statistics = cache.statistics()
+        self.assertEqual(statistics["hits"], 4)
+        self.assertEqual(statistics["misses"], 4)
+        self.assertEqual(statistics["entries"], 4)
+        self.assertIsInstance(cache.sent_tokenize(text)[0], tuple)
+
+    def test_abbreviations(self):
+        cache = TokenizationCache(max_entries=10)
+        lexicon = AbbreviationLexicon(["approx"])
+        text = u"See approx. ten cases. Mr. Smith agreed."
+        for _ in range(2):
+            self.assertEqual(
+                cache.tokenize(text, abbreviations=lexicon),
+                tuple(tokenize(text, abbreviations=lexicon))
+            )
+            self.assertEqual(
+                cache.sent_tokenize(text, abbreviations=lexicon),
+                tuple(tuple(sentence) for sentence in sent_tokenize(text, abbreviations=lexicon))
+            )
+        self.assertNotEqual(cache.tokenize(text), cache.tokenize(text, abbreviations=lexicon))
+        self.assertEqual(cache.statistics()["entries"], 3)
+        # unhashable collections of abbreviations are keyed by their content:
+        self.assertEqual(
+            cache.tokenize(text, abbreviations=["approx"]),
+            tuple(tokenize(text, abbreviations={"approx"}))
+        )
+        self.assertEqual(cache.tokenize(text, abbreviations={"approx"}),
+                         cache.tokenize(text, abbreviations=["approx"]))
+        self.assertEqual(cache.statistics()["entries"], 4)
+
+    def test_eviction(self):
+        cache = TokenizationCache(max_entries=2)
+        cache.tokenize(u"a b.")
+        cache.tokenize(u"c d.")
+        cache.tokenize(u"a b.")
+        cache.tokenize(u"e f.")
+        # "c d." was the least recently used:
+        self.assertEqual(cache.statistics()["evictions"], 1)
+        cache.tokenize(u"a b.")
+        self.assertEqual(cache.hits, 2)
+        cache.tokenize(u"c d.")
+        self.assertEqual(cache.misses, 4)
+
+        cache = TokenizationCache(max_entries=None, max_bytes=2000)
+        for i in range(20):
+            cache.sent_tokenize(u"Sentence number %d here." % i)
+        self.assertLessEqual(cache.bytes, 2000)
+        self.assertGreater(cache.evictions, 0)
+        # results larger than the budget are not kept:
+        cache.clear()
+        cache.tokenize(u"word " * 1000)
+        self.assertEqual(len(cache), 0)
+        self.assertRaises(ValueError, TokenizationCache, None, None)
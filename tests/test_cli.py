@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+import bz2
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from ciseau import sent_tokenize, to_raw_text, tokenize_spans
+from ciseau.cli import main
+
+DOCUMENTS = [
+    u"Mr. Smith went to Paris. He liked it!",
+    u"See [[France|the country]] in 2019.\nIt's “big”."
+]
+
+
+class CommandLineTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for i, document in enumerate(DOCUMENTS):
+            with io.open(os.path.join(self.directory, "doc%d.txt" % (i,)), "w", encoding="utf-8") as fout:
+                fout.write(document)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def run_cli(self, *args):
+        path = os.path.join(self.directory, "out")
+        self.assertEqual(main(list(args) + ["--output", path]), 0)
+        with io.open(path, encoding="utf-8") as fin:
+            return fin.read()
+
+    def test_formats(self):
+        pattern = os.path.join(self.directory, "doc*.txt")
+        self.assertEqual(
+            self.run_cli(pattern),
+            u"".join(
+                u"".join(u" ".join(sentence) + u"\n" for sentence in sent_tokenize(document)) + u"\n"
+                for document in DOCUMENTS
+            )
+        )
+        self.assertEqual(
+            [json.loads(line) for line in self.run_cli("--mode", "wiki", "--format", "jsonl", pattern).splitlines()],
+            [to_raw_text(document) for document in DOCUMENTS]
+        )
+        self.assertEqual(
+            self.run_cli("--mode", "words", "--format", "offsets", pattern).split(u"\n\n")[0],
+            u"\n".join(
+                u"%s\t%d\t%d" % (word.rstrip(), start, start + len(word.rstrip()))
+                for word, start, end in tokenize_spans(DOCUMENTS[0])
+            )
+        )
+
+    def test_word_offsets_ignore_normalization(self):
+        path = os.path.join(self.directory, "oeuvre.txt")
+        with io.open(path, "w", encoding="utf-8") as fout:
+            fout.write(u"The œuvre of Cæsar --- ends.")
+        self.assertEqual(
+            self.run_cli("--mode", "words", "--format", "offsets", path),
+            u"The\t0\t3\noeuvre\t4\t9\nof\t10\t12\nCaesar\t13\t18\n-\t19\t22\n"
+            u"ends\t23\t27\n.\t27\t28\n\n"
+        )
+
+    def test_lines_and_processes(self):
+        path = os.path.join(self.directory, "lines.txt.bz2")
+        with bz2.BZ2File(path, "wb") as fout:
+            fout.write(u"\n".join(DOCUMENTS * 50).encode("utf-8"))
+        out = self.run_cli("--mode", "words", "--lines", path)
+        self.assertEqual(len(out.splitlines()), 150)
+        self.assertEqual(out.splitlines()[1], u"See [ [ France | the country ] ] in 2019 .")
+        self.assertEqual(self.run_cli("--mode", "words", "--lines", "-j", "2", "--chunksize", "7", path), out)
+
+    def test_abbreviations(self):
+        path = os.path.join(self.directory, "abbreviations.txt")
+        with io.open(path, "w", encoding="utf-8") as fout:
+            fout.write(u"approx.\ncf\n")
+        text_path = os.path.join(self.directory, "approx.txt")
+        with io.open(text_path, "w", encoding="utf-8") as fout:
+            fout.write(u"See approx. ten cases.")
+        self.assertEqual(self.run_cli("--mode", "words", text_path), u"See approx . ten cases .\n")
+        self.assertEqual(
+            self.run_cli("--mode", "words", "--abbreviations", path, text_path),
+            u"See approx. ten cases .\n"
+        )
+
+    def test_stdin(self):
+        environment = dict(os.environ)
+        environment["PYTHONPATH"] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        process = subprocess.Popen(
+            [sys.executable, "-m", "ciseau.cli", "--mode", "words", "--lines"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=environment
+        )
+        out, _ = process.communicate(u"\n".join(DOCUMENTS).encode("utf-8"))
+        self.assertEqual(process.returncode, 0)
+        self.assertEqual(out.decode("utf-8").splitlines()[0], u"Mr. Smith went to Paris . He liked it !")
+
+    def test_missing_input(self):
+        with self.assertRaises(SystemExit):
+            main([os.path.join(self.directory, "missing*.txt")])
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+import pickle
+import unittest
+from ciseau import CompactSentences, sent_tokenize_compact, sent_tokenize
+
+TEXTS = [
+    u"Mr. Smith went to Washington -- he said “no” at approx. 5 p.m.",
+    u"See the rhino's horns; it's big… Dr. Jones agreed.\n\nŒuvre — a word. Another one!",
+    u"",
+    u"   "
+]
+
+
+class CompactSentencesTests(unittest.TestCase):
+    def test_same_as_sent_tokenize(self):
+        for text in TEXTS:
+            for normalize_ascii in (True, False):
+                for keep_whitespace in (True, False):
+                    sentences = sent_tokenize_compact(
+                        text, keep_whitespace=keep_whitespace, normalize_ascii=normalize_ascii
+                    )
+                    expected = sent_tokenize(
+                        text, keep_whitespace=keep_whitespace, normalize_ascii=normalize_ascii
+                    )
+                    self.assertEqual(len(sentences), len(expected))
+                    self.assertEqual(list(sentences), expected)
+                    self.assertEqual(sentences.to_list(), expected)
+
+    def test_indexing(self):
+        sentences = sent_tokenize_compact(TEXTS[1])
+        expected = sent_tokenize(TEXTS[1])
+        self.assertEqual(sentences[0], expected[0])
+        self.assertEqual(sentences[-1], expected[-1])
+        self.assertEqual(sentences[1:], expected[1:])
+        self.assertEqual(sentences[::-1], expected[::-1])
+        self.assertEqual(sentences.num_tokens(), sum(len(sentence) for sentence in expected))
+        with self.assertRaises(IndexError):
+            sentences[len(expected)]
+
+    def test_views_share_storage(self):
+        stripped = sent_tokenize_compact(TEXTS[1])
+        spaced = stripped.with_whitespace()
+        self.assertIs(spaced.text, stripped.text)
+        self.assertIs(spaced.offsets, stripped.offsets)
+        self.assertEqual(list(spaced), sent_tokenize(TEXTS[1], keep_whitespace=True))
+        self.assertEqual(list(spaced.stripped()), list(stripped))
+        self.assertEqual(stripped.text, u"".join(sum(list(spaced), [])))
+
+    def test_serialization(self):
+        for text in TEXTS:
+            for keep_whitespace in (True, False):
+                sentences = sent_tokenize_compact(text, keep_whitespace=keep_whitespace)
+                copy = CompactSentences.from_bytes(sentences.to_bytes())
+                self.assertEqual(list(copy), list(sentences))
+                self.assertEqual(copy.strip, sentences.strip)
+                self.assertEqual(list(pickle.loads(pickle.dumps(sentences))), list(sentences))
+        data = sent_tokenize_compact(TEXTS[0]).to_bytes()
+        with self.assertRaises(ValueError):
+            CompactSentences.from_bytes(b"XXXX" + data[4:])
+        with self.assertRaises(ValueError):
+            CompactSentences.from_bytes(data[:-1])
+        with self.assertRaises(ValueError):
+            CompactSentences.from_bytes(data[:8])
+
+
+if __name__ == "__main__":
+    unittest.main()
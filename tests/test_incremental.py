@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import random
+import unittest
+from ciseau import sent_tokenize_document, retokenize, sent_tokenize
+
+ARTICLE = (
+    u"Paris is the capital of France. It is home to the Louvre (the most visited "
+    u"museum) and to Mr. Smith's bakery.\n\nThe city — on the Seine — hosts "
+    u"œuvres of all kinds. \"It never sleeps,\" said Dr. Jones. Visitors come "
+    u"from the U.S. and elsewhere. The end."
+)
+
+
+class IncrementalTests(unittest.TestCase):
+    def assertSameAsFullRun(self, document):
+        expected = sent_tokenize_document(
+            document.text, keep_whitespace=document.keep_whitespace,
+            normalize_ascii=document.normalize_ascii
+        )
+        self.assertEqual(document.sentences, expected.sentences)
+        self.assertEqual(
+            document.sentences,
+            sent_tokenize(document.text, keep_whitespace=document.keep_whitespace,
+                          normalize_ascii=document.normalize_ascii)
+        )
+        self.assertEqual(document.starts, expected.starts)
+
+    def test_edits(self):
+        document = sent_tokenize_document(ARTICLE)
+        position = ARTICLE.index("Louvre")
+        edited = retokenize(document, position, position + len("Louvre"), u"Orsay")
+        self.assertEqual(edited.text, ARTICLE.replace("Louvre", "Orsay"))
+        self.assertSameAsFullRun(edited)
+        # the previous document is left as it was:
+        self.assertEqual(document.sentences, sent_tokenize(ARTICLE))
+        # insertions splitting and joining sentences, at the edges of the text:
+        position = ARTICLE.index("hosts")
+        self.assertSameAsFullRun(document.edit(position, position, u"grows. It "))
+        position = ARTICLE.index(". Visitors")
+        self.assertSameAsFullRun(document.edit(position, position + 2, u" and "))
+        self.assertSameAsFullRun(document.edit(0, 0, u"Hello. "))
+        self.assertSameAsFullRun(document.edit(len(ARTICLE), len(ARTICLE), u" Really"))
+        self.assertSameAsFullRun(document.edit(0, len(ARTICLE), u""))
+        self.assertSameAsFullRun(sent_tokenize_document(u"").edit(0, 0, ARTICLE))
+
+    def test_quotes_and_brackets(self):
+        document = sent_tokenize_document(ARTICLE, keep_whitespace=True)
+        position = ARTICLE.index("(the")
+        self.assertSameAsFullRun(document.edit(position, position + 1, u""))
+        position = ARTICLE.index("It never")
+        self.assertSameAsFullRun(document.edit(position, position, u"\""))
+        position = ARTICLE.index("Visitors")
+        self.assertSameAsFullRun(document.edit(position, position, u"(Many!) "))
+
+    def test_random_edits(self):
+        rng = random.Random(0)
+        pieces = [u"a", u" ", u". ", u"(", u")", u"\"", u"Mr. ", u"\n", u". The ", u"--", u"œ"]
+        for normalize_ascii in (True, False):
+            document = sent_tokenize_document(ARTICLE * 3, normalize_ascii=normalize_ascii)
+            for _ in range(100):
+                start = rng.randint(0, len(document.text))
+                end = min(len(document.text), start + rng.choice([0, 1, 4]))
+                replacement = u"".join(rng.choice(pieces) for _ in range(rng.randint(0, 2)))
+                document = document.edit(start, end, replacement)
+                self.assertSameAsFullRun(document)
+
+    def test_invalid_edit(self):
+        document = sent_tokenize_document(ARTICLE)
+        with self.assertRaises(ValueError):
+            document.edit(5, 4, u"")
+        with self.assertRaises(ValueError):
+            document.edit(0, len(ARTICLE) + 1, u"")
+
+
+if __name__ == "__main__":
+    unittest.main()
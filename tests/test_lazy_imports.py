@@ -0,0 +1,52 @@
+import os
+import pickle
+import subprocess
+import sys
+import unittest
+
+import ciseau
+from ciseau.regular_expressions import lazy_compile, LazyPattern
+
+PACKAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def modules_loaded_by(code):
+    out = subprocess.check_output(
+        [sys.executable, "-c", code + "\nimport sys\nprint(' '.join(sys.modules))"],
+        cwd=PACKAGE_DIR
+    )
+    return set(out.decode("utf-8").split())
+
+
+class LazyImportTests(unittest.TestCase):
+    @unittest.skipIf(sys.version_info < (3, 7), "modules are imported eagerly")
+    def test_import_loads_nothing(self):
+        modules = modules_loaded_by("import ciseau")
+        self.assertNotIn("ciseau.word_tokenizer", modules)
+        self.assertNotIn("ciseau.wiki_markup_processing", modules)
+        modules = modules_loaded_by("import ciseau\nciseau.tokenize('Hi there.')")
+        self.assertIn("ciseau.word_tokenizer", modules)
+        for module in ("ciseau.wiki_markup_processing", "multiprocessing", "xml.etree.ElementTree"):
+            self.assertNotIn(module, modules)
+
+    def test_exports(self):
+        for name in ciseau.__all__:
+            self.assertTrue(callable(getattr(ciseau, name)))
+            self.assertIn(name, dir(ciseau))
+        with self.assertRaises(AttributeError):
+            ciseau.not_a_function
+        out = subprocess.check_output(
+            [sys.executable, "-c", "import ciseau\nprint(len(ciseau.constants.ABBREVIATIONS) > 0)"],
+            cwd=PACKAGE_DIR
+        )
+        self.assertEqual(out.strip(), b"True")
+
+    def test_lazy_pattern(self):
+        regex = lazy_compile(r"(?P<word>\w+)\s*")
+        self.assertNotIn("search", regex.__dict__)
+        self.assertEqual(regex.groupindex["word"], 1)
+        self.assertEqual(regex.sub(r"\g<word>", "a b  c"), "abc")
+        self.assertEqual(regex.pattern, r"(?P<word>\w+)\s*")
+        copy = pickle.loads(pickle.dumps(regex))
+        self.assertIsInstance(copy, LazyPattern)
+        self.assertEqual(copy.findall("a b"), ["a", "b"])
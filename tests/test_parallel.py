@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+import unittest
+import multiprocessing
+import threading
+from ciseau import (
+    tokenize,
+    sent_tokenize,
+    to_raw_text,
+    tokenize_many,
+    sent_tokenize_many,
+    sent_tokenize_compact_many,
+    to_raw_text_many
+)
+from ciseau import parallel
+
+DOCUMENTS = [
+    u"Mr. Joe was always late to his dates, appointments, etc.. He said so.",
+    u"The earthquake was felt in Beijing — 1,500 km (930 mi) away.",
+    u"",
+    u"Cat sat mat. Cat's named Cool.",
+    u"'''Paris''' is the [[capital city|capital]] of [[France]]. It is big."
+] * 7
+
+
+class ParallelTokenizationTests(unittest.TestCase):
+    def test_ordered_results_match_serial(self):
+        self.assertEqual(
+            list(sent_tokenize_many(DOCUMENTS, processes=2, chunksize=3)),
+            [sent_tokenize(doc) for doc in DOCUMENTS]
+        )
+        self.assertEqual(
+            list(tokenize_many(iter(DOCUMENTS), processes=2, chunksize=4,
+                               normalize_ascii=False)),
+            [tokenize(doc, normalize_ascii=False) for doc in DOCUMENTS]
+        )
+
+    def test_in_process(self):
+        self.assertEqual(
+            list(to_raw_text_many(DOCUMENTS, processes=1, keep_whitespace=True)),
+            [to_raw_text(doc, keep_whitespace=True) for doc in DOCUMENTS]
+        )
+
+    def test_reuse_pool_unordered(self):
+        pool = multiprocessing.Pool(2)
+        try:
+            for _ in range(2):
+                self.assertEqual(
+                    sorted(sent_tokenize_many(DOCUMENTS, pool=pool, chunksize=2,
+                                              ordered=False)),
+                    sorted(sent_tokenize(doc) for doc in DOCUMENTS)
+                )
+        finally:
+            pool.terminate()
+            pool.join()
+
+    def test_unpicklable_arguments_raise(self):
+        # the batches cannot be sent to the workers:
+        for ordered in (True, False):
+            with self.assertRaises(Exception):
+                list(sent_tokenize_many(DOCUMENTS, processes=2, chunksize=4, ordered=ordered,
+                                        abbreviations=threading.Lock()))
+
+    def test_compact_results_match_serial(self):
+        documents = DOCUMENTS + [u"Œuvres -- d'art æ. Fin", u"   ", u"word"]
+        for keep_whitespace in (False, True):
+            for normalize_ascii in (False, True):
+                self.assertEqual(
+                    [sentences.to_list() for sentences in sent_tokenize_compact_many(
+                        documents, processes=2, chunksize=3, keep_whitespace=keep_whitespace,
+                        normalize_ascii=normalize_ascii
+                    )],
+                    [sent_tokenize(doc, keep_whitespace=keep_whitespace,
+                                   normalize_ascii=normalize_ascii) for doc in documents]
+                )
+
+    def test_compact_reuse_pool_unordered(self):
+        pool = multiprocessing.Pool(2)
+        try:
+            self.assertEqual(
+                sorted(sentences.to_list() for sentences in sent_tokenize_compact_many(
+                    DOCUMENTS, pool=pool, chunksize=2, ordered=False, max_length=20
+                )),
+                sorted(sent_tokenize(doc, max_length=20) for doc in DOCUMENTS)
+            )
+            # blocks of the batches left in flight are removed:
+            results = sent_tokenize_compact_many(DOCUMENTS, pool=pool, chunksize=1)
+            self.assertEqual(next(results).to_list(), sent_tokenize(DOCUMENTS[0]))
+            results.close()
+        finally:
+            pool.terminate()
+            pool.join()
+
+    def test_compact_without_shared_memory(self):
+        shared_memory = parallel.shared_memory
+        parallel.shared_memory = None
+        try:
+            self.assertEqual(
+                [sentences.to_list() for sentences in sent_tokenize_compact_many(
+                    DOCUMENTS, processes=2, chunksize=4
+                )],
+                [sent_tokenize(doc) for doc in DOCUMENTS]
+            )
+        finally:
+            parallel.shared_memory = shared_memory
@@ -1,7 +1,24 @@
 # -*- coding: utf-8 -*-
+import io
 import unittest
 import sys
-from ciseau import tokenize, sent_tokenize
+from ciseau import tokenize, tokenize_batch, sent_tokenize
+from ciseau.quoted_expressions import group_quoted_tokens
+from ciseau.word_tokenizer import (
+    mark_begin_end_regex,
+    split_with_locations,
+    iter_urls,
+    coarse_tokenize
+)
+from ciseau.regular_expressions import numerical_expression, url_file_finder
+from ciseau.streaming import iter_sentences
+from ciseau.offsets import (
+    tokenize_offsets,
+    sent_tokenize_offsets,
+    tokenize_spans,
+    sent_tokenize_spans
+)
+from ciseau import profiling
 
 class TokenizationTests(unittest.TestCase):
     def test_quoted_expressions(self):
@@ -68,6 +85,17 @@ class TokenizationTests(unittest.TestCase):
             expression
         )
 
+    def test_periods_inside_words(self):
+        expression = [
+            "I ", "met ", "the ", "chocolate", ".", "Mountains ", "of ",
+            "Mr.", "Smith ", "on ", "5.", " ", "January ", "in ", "the ",
+            "U.S. ", "today", "."
+        ]
+        self.assertEqual(
+            tokenize("".join(expression)),
+            expression
+        )
+
     def test_em_dash(self):
         expression = [
             u"The ", u"earthquake ", u"was ",
@@ -83,6 +111,17 @@ class TokenizationTests(unittest.TestCase):
             expression
         )
 
+    def test_appendages_and_single_quotes(self):
+        expression = [
+            "Qu'il ", "l'", "a ", "dit", ": ", '"', "you", "'ll ", "see ",
+            "it", "'s ", "Joe", "'s ", "car", ", ", "is", "n't ", "it", "?",
+            '" ', "' ", "he ", "said ", "''", "twice", "''", "."
+        ]
+        self.assertEqual(
+            tokenize("".join(expression)),
+            expression
+        )
+
     def test_quoted_expressions_with_ascii(self):
         expression = [
             "Julius ", u"Cæsar ", "declared ", "-- ", "professed ", "- ",
@@ -334,3 +373,215 @@ class TokenizationTests(unittest.TestCase):
                 ),
                 expression
             )
+
+    def test_split_locations_bytearray(self):
+        text = "pay 1,000,000.50 now"
+        split_locations = bytearray(len(text))
+        mark_begin_end_regex(numerical_expression, text, split_locations)
+        self.assertEqual(split_locations[4:17], b"\x01" + b"\x02" * 12)
+        self.assertEqual(split_locations[17], 1)
+        self.assertEqual(
+            list(split_with_locations(text, split_locations)),
+            ["pay ", "1,000,000.50 ", "now"]
+        )
+
+    def test_group_quoted_tokens_keeps_outermost_sections(self):
+        tokens = [
+            "He ", "said ", "(", "quite ", '"', "loudly", '" ', "too", ") ",
+            "that ", '"', "it ", "works", '" ', "now", "."
+        ]
+        self.assertEqual(
+            group_quoted_tokens(tokens * 50),
+            [
+                "He ", "said ",
+                ["(", "quite ", '"', "loudly", '" ', "too", ") "],
+                "that ",
+                ['"', "it ", "works", '" '],
+                "now", "."
+            ] * 50
+        )
+
+    def test_iter_sentences(self):
+        text = (
+            u"Dr. Smith went to Washington. He met Mr. Jones -- "
+            u"the Cæsar of œuvres. \u201cWhat a day!\u201d said Jones. "
+            u"They left at 5 p.m. and came back at 6.30 on Jan. 3rd. "
+        ) * 20
+        for keep_whitespace in (True, False):
+            for normalize_ascii in (True, False):
+                expected = sent_tokenize(
+                    text,
+                    keep_whitespace=keep_whitespace,
+                    normalize_ascii=normalize_ascii
+                )
+                for source in (text, io.StringIO(text), io.BytesIO(text.encode("utf-8"))):
+                    self.assertEqual(
+                        list(iter_sentences(
+                            source,
+                            keep_whitespace=keep_whitespace,
+                            normalize_ascii=normalize_ascii,
+                            chunk_size=37
+                        )),
+                        expected
+                    )
+
+    def test_iter_sentences_bounded_buffer(self):
+        sentences = list(iter_sentences(u"word " * 2000, chunk_size=100, max_buffer_size=1000))
+        self.assertEqual(sum(len(sentence) for sentence in sentences), 2000)
+        self.assertTrue(max(len(sentence) for sentence in sentences) < 300)
+
+    def test_iter_sentences_open_quote(self):
+        text = u'He said: "I came. I saw. I conquered. I left." Then he went home. Ok.'
+        self.assertEqual(list(iter_sentences(text, chunk_size=8)), sent_tokenize(text))
+        self.assertEqual(
+            list(iter_sentences(text * 200, chunk_size=100)),
+            sent_tokenize(text * 200)
+        )
+
+    def test_iter_sentences_spaced_quotes(self):
+        # whether a quote with spaces on both sides opens or closes
+        # depends on the number of quotes after it in the whole text:
+        text = (
+            u'Some (words) here " then. More words here. Again more here " now. '
+            u'More words here. Last one " here. The end is here. Really the end. '
+        )
+        expected = sent_tokenize(text)
+        for chunk_size in (8, 16, 32, 64):
+            sentences = list(iter_sentences(text, chunk_size=chunk_size, tail_sentences=1))
+            self.assertEqual(sum(sentences, []), sum(expected, []))
+            self.assertTrue(all(len(sentence) > 0 for sentence in sentences))
+        self.assertEqual(list(iter_sentences(text * 3, chunk_size=1024)), sent_tokenize(text * 3))
+
+    def test_iter_sentences_single_word(self):
+        sentences = list(iter_sentences(u"x" * 5000, chunk_size=100, max_buffer_size=1000))
+        self.assertEqual(u"".join(sentence[0] for sentence in sentences), u"x" * 5000)
+        self.assertTrue(all(len(sentence) == 1 for sentence in sentences))
+        self.assertTrue(max(len(sentence[0]) for sentence in sentences) <= 1000)
+
+    def test_tokenize_offsets(self):
+        text = u"Cæsar's œuvre -- the ‘bold’ one -- cost 1,000 €. Dr. Who agreed."
+        tokens = tokenize(text, normalize_ascii=False)
+        offsets = tokenize_offsets(text, normalize_ascii=False)
+        self.assertEqual(
+            [text[offsets[i]:offsets[i + 1]] for i in range(0, len(offsets), 2)],
+            tokens
+        )
+        # positions refer to the input even after normalization:
+        offsets = tokenize_offsets(text)
+        self.assertEqual(len(offsets), 2 * len(tokenize(text)))
+        self.assertEqual(text[offsets[0]:offsets[1]], u"Cæsar")
+        # utf-8 buffers get byte offsets:
+        encoded = text.encode("utf-8")
+        offsets = tokenize_offsets(memoryview(encoded), keep_whitespace=False, normalize_ascii=False)
+        self.assertEqual(
+            [encoded[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(0, len(offsets), 2)],
+            [token.rstrip() for token in tokens]
+        )
+
+    def test_sent_tokenize_offsets(self):
+        text = u"Maslow’s theory is great. It also allows analysts to understand. Ok."
+        offsets, boundaries = sent_tokenize_offsets(text.encode("utf-8"), normalize_ascii=False)
+        encoded = text.encode("utf-8")
+        self.assertEqual(
+            [
+                [encoded[offsets[2 * i]:offsets[2 * i + 1]].decode("utf-8")
+                 for i in range(boundaries[j], boundaries[j + 1])]
+                for j in range(len(boundaries) - 1)
+            ],
+            sent_tokenize(text, normalize_ascii=False)
+        )
+
+    def test_spans_ignore_normalization(self):
+        text = u"The œuvre of Cæsar --- and others."
+        spans = tokenize_spans(text)
+        self.assertEqual([token for token, _, _ in spans], tokenize(text))
+        self.assertEqual(
+            [text[start:end] for _, start, end in spans],
+            [u"The ", u"œuvre ", u"of ", u"Cæsar ", u"--- ", u"and ", u"others", u"."]
+        )
+        self.assertEqual(
+            tokenize_spans(text, keep_whitespace=False)[1:5],
+            [(u"oeuvre", 4, 9), (u"of", 10, 12), (u"Caesar", 13, 18), (u"-", 19, 22)]
+        )
+        sentences = sent_tokenize_spans(text + u" Fine.")
+        self.assertEqual(
+            [[token for token, _, _ in sentence] for sentence in sentences],
+            sent_tokenize(text + u" Fine.")
+        )
+        self.assertEqual(sentences[1][0], (u"Fine", 35, 39))
+
+    def test_profile(self):
+        text = u"Dr. Smith visited http://example.com today. He left."
+        with profiling.profile() as profile:
+            sentences = sent_tokenize(text)
+            sent_tokenize(text)
+        self.assertIsNone(profiling.active)
+        self.assertEqual(sentences, sent_tokenize(text))
+        stages = profile.as_dict()
+        self.assertEqual(stages["sent_tokenize/tokenize"]["calls"], 2)
+        self.assertEqual(stages["sent_tokenize/tokenize"]["input_length"], 2 * len(text))
+        self.assertEqual(stages["tokenize/url_file_finder"]["matches"], 2)
+        self.assertIn("detect_sentence_boundaries/group_quoted_tokens", stages)
+        self.assertIn("tokenize/url_file_finder", profile.table())
+        # nothing is recorded once the profile is exited:
+        tokenize(text)
+        self.assertEqual(profile.as_dict()["tokenize/url_file_finder"]["calls"], 2)
+        # passes that cannot change any split location are skipped:
+        with profiling.profile() as profile:
+            tokenize(u"Hello world how are you")
+        self.assertEqual(list(profile.as_dict()), ["tokenize/split_end_finder"])
+
+    def test_iter_urls(self):
+        texts = [
+            u"See http://example.com/a?b=c and www.test.org. Done.",
+            u"a." * 300,
+            u"x" * 300 + u".com " + u"y" * 255 + u".com",
+            u"ftp://" + u"w" * 270 + u".org",
+            u"www." + u"h" * 256 + u".io/path www." + u"h" * 257 + u".io",
+            u"e.g. i.e. 1.5.co me@host.fr:80/x.html"
+        ]
+        for text in texts:
+            self.assertEqual(
+                [match.span() for match in iter_urls(text)],
+                [match.span() for match in url_file_finder.finditer(text)]
+            )
+
+    def test_max_length(self):
+        text = u"He said: \"I'd go -- now.\"  Then   left."
+        self.assertEqual(tokenize(text, max_length=len(text)), tokenize(text))
+        self.assertEqual(
+            tokenize(text, max_length=10),
+            [u"He ", u"said", u": ", u'"', u"I", u"'", u"d ", u"go ", u"- ",
+             u"now", u".", u'"  ', u"Then   ", u"left", u"."]
+        )
+        self.assertEqual(tokenize(text, max_length=10), coarse_tokenize(text))
+        self.assertEqual(u"".join(coarse_tokenize(u"  a\nb ", False)), u"  a\nb ")
+        self.assertEqual(
+            sent_tokenize(u"Cat sat. Dog ran.", max_length=5),
+            [[u"Cat", u"sat", u"."], [u"Dog", u"ran", u"."]]
+        )
+
+    def test_tokenize_batch(self):
+        texts = [
+            u"Mr. Smith went to Washington.",
+            u"Mr.",
+            u"n't we go?",
+            u"'tis the season",
+            u"'' 'x",
+            u"",
+            u"plainword",
+            u"See http://example.com/a?b=c and www.test.org",
+            u"œuvre -- “quoted” – dashes…",
+            u"a\x00b. c",
+            u"  'quoted' in the middle \n",
+            u"Jan. 5 vs. 5 Jan.",
+            u"l'ami qu'il",
+        ]
+        for normalize_ascii in (True, False):
+            for max_length in (None, 10):
+                self.assertEqual(
+                    tokenize_batch(texts, normalize_ascii, max_length),
+                    [tokenize(text, normalize_ascii, max_length) for text in texts]
+                )
+        self.assertEqual(tokenize_batch([]), [])
+        self.assertEqual(tokenize_batch([u""]), [[]])
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+import pickle
+import unittest
+from ciseau import Tokenizer, AbbreviationLexicon, tokenize, sent_tokenize, profile
+
+TEXTS = [
+    u"Mr. Smith went to Washington -- he said “no” at approx. 5 p.m.",
+    u"See the rhino's horns; it's big… Dr. Jones agreed.",
+    u"Œuvre — a word. Another one!"
+]
+
+
+class TokenizerTests(unittest.TestCase):
+    def test_same_as_functions(self):
+        lexicon = AbbreviationLexicon(["approx", "dr"])
+        for config in ({}, {"normalize_ascii": False}, {"keep_whitespace": True},
+                       {"abbreviations": lexicon}, {"max_length": 20}):
+            tokenizer = Tokenizer(**config)
+            self.assertEqual(tokenizer.tokenize_batch(TEXTS),
+                             [tokenizer.tokenize(text) for text in TEXTS])
+            for text in TEXTS:
+                self.assertEqual(
+                    tokenizer.tokenize(text),
+                    tokenize(text, tokenizer.normalize_ascii, tokenizer.max_length,
+                             tokenizer.abbreviations)
+                )
+                self.assertEqual(
+                    tokenizer.sent_tokenize(text),
+                    sent_tokenize(text, tokenizer.keep_whitespace, tokenizer.normalize_ascii,
+                                  tokenizer.max_length, tokenizer.abbreviations)
+                )
+            with profile():
+                self.assertEqual(tokenizer.sent_tokenize(TEXTS[0]),
+                                 Tokenizer(**tokenizer.config).sent_tokenize(TEXTS[0]))
+
+    def test_side_by_side(self):
+        english = Tokenizer()
+        legal = Tokenizer(abbreviations=AbbreviationLexicon(["approx"]))
+        self.assertIn(u"approx", english.tokenize(TEXTS[0]))
+        self.assertIn(u"approx. ", legal.tokenize(TEXTS[0]))
+        self.assertIn(u"Mr. ", english.tokenize(TEXTS[0]))
+        self.assertIn(u"Mr", legal.tokenize(TEXTS[0]))
+
+    def test_pickle_and_batches(self):
+        tokenizer = Tokenizer(keep_whitespace=True, abbreviations=AbbreviationLexicon(["approx"]))
+        copy = pickle.loads(pickle.dumps(tokenizer))
+        self.assertEqual(copy.config["keep_whitespace"], True)
+        self.assertEqual(copy.sent_tokenize(TEXTS[0]), tokenizer.sent_tokenize(TEXTS[0]))
+        self.assertEqual(
+            list(tokenizer.sent_tokenize_many(TEXTS * 5, processes=2, chunksize=3)),
+            [tokenizer.sent_tokenize(text) for text in TEXTS * 5]
+        )
+        self.assertEqual(
+            list(tokenizer.tokenize_many(TEXTS, processes=1)),
+            [tokenizer.tokenize(text) for text in TEXTS]
+        )
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+import unittest
+from ciseau import Vocabulary, tokenize_ids, sent_tokenize_ids, tokenize, sent_tokenize
+
+TEXT = u"The cat sat. The dog sat on the mat!"
+
+
+class VocabularyTests(unittest.TestCase):
+    def test_lookup(self):
+        vocabulary = Vocabulary(["<unk>", "the", u"Straße", "."])
+        self.assertEqual(len(vocabulary), 4)
+        self.assertEqual(vocabulary["<unk>"], 0)
+        self.assertEqual(vocabulary[u"Straße"], 2)
+        self.assertEqual(vocabulary.get("The"), None)
+        self.assertEqual(vocabulary.get("The", -1), -1)
+        self.assertNotIn("", vocabulary)
+        with self.assertRaises(KeyError):
+            vocabulary["cat"]
+        self.assertEqual(dict(vocabulary.items()), {"<unk>": 0, "the": 1, u"Straße": 2, ".": 3})
+        # ids of their own (stored in the table):
+        vocabulary = Vocabulary.from_bytes(Vocabulary({"a": -7, "b": 1 << 30}).to_bytes())
+        self.assertEqual(dict(vocabulary.items()), {"a": -7, "b": 1 << 30})
+        with self.assertRaises(ValueError):
+            Vocabulary(["a", "b", "a"])
+        with self.assertRaises(ValueError):
+            Vocabulary({"a": 1 << 40})
+
+    def test_token_ids(self):
+        tokens = sorted(set(token.lower() for token in tokenize(TEXT)[::2]))
+        for vocabulary in (Vocabulary(tokens), dict((token, i) for i, token in enumerate(tokens))):
+            ids, boundaries = sent_tokenize_ids(TEXT, vocabulary, unknown_id=-1, lowercase=True)
+            sentences = sent_tokenize(TEXT)
+            self.assertEqual(list(boundaries), [0, len(sentences[0]), len(sentences[0]) + len(sentences[1])])
+            self.assertEqual(
+                list(ids),
+                [vocabulary.get(token.lower(), -1) for sentence in sentences for token in sentence]
+            )
+            ids, boundaries = sent_tokenize_ids(TEXT, vocabulary)
+            self.assertEqual(
+                list(ids),
+                [vocabulary[token] for sentence in sentences for token in sentence
+                 if token in vocabulary]
+            )
+            self.assertEqual(boundaries[-1], len(ids))
+            self.assertEqual(
+                list(tokenize_ids(TEXT, vocabulary, unknown_id=-1)),
+                [vocabulary.get(token.rstrip(), -1) for token in tokenize(TEXT)]
+            )
+        self.assertEqual(tokenize_ids(TEXT, {}).typecode, "i")
+        self.assertEqual(list(sent_tokenize_ids(u"", {})[1]), [0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+import bz2
+import gzip
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from ciseau import to_raw_text
+from ciseau.wiki import iter_dump, iter_pages
+
+DUMP = u"""<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.10/" version="0.10" xml:lang="en">
+  <siteinfo>
+    <sitename>Wikipedia</sitename>
+    <namespaces>
+      <namespace key="0" case="first-letter" />
+    </namespaces>
+  </siteinfo>
+  <page>
+    <title>Paris</title>
+    <ns>0</ns>
+    <id>1</id>
+    <revision>
+      <id>10</id>
+      <text xml:space="preserve">'''Paris''' is the [[capital city|capital]] of [[France]]. It is big &amp; old.</text>
+    </revision>
+  </page>
+  <page>
+    <title>Capital of France</title>
+    <ns>0</ns>
+    <id>2</id>
+    <redirect title="Paris" />
+    <revision>
+      <id>11</id>
+      <text xml:space="preserve">#REDIRECT [[Paris]]</text>
+    </revision>
+  </page>
+  <page>
+    <title>Talk:Paris</title>
+    <ns>1</ns>
+    <id>3</id>
+    <revision>
+      <id>12</id>
+      <text xml:space="preserve">Is it big? Yes.</text>
+    </revision>
+  </page>
+  <page>
+    <title>Cæsar</title>
+    <ns>0</ns>
+    <id>4</id>
+    <revision>
+      <id>13</id>
+      <text xml:space="preserve">Cæsar was born in {{circa}} 100 BC. He died in Rome.</text>
+    </revision>
+  </page>
+</mediawiki>
+"""
+
+
+class WikiDumpTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write_dump(self, name, opener):
+        path = os.path.join(self.directory, name)
+        with opener(path, "wb") as fout:
+            fout.write(DUMP.encode("utf-8"))
+        return path
+
+    def test_iter_pages(self):
+        pages = list(iter_pages(io.BytesIO(DUMP.encode("utf-8"))))
+        self.assertEqual([title for title, _ in pages], [u"Paris", u"Cæsar"])
+        self.assertEqual(
+            [title for title, _ in iter_pages(io.BytesIO(DUMP.encode("utf-8")),
+                                              namespaces=None, skip_redirects=False)],
+            [u"Paris", u"Capital of France", u"Talk:Paris", u"Cæsar"]
+        )
+
+    def test_iter_dump_compressed(self):
+        expected = [
+            (title, to_raw_text(text))
+            for title, text in iter_pages(io.BytesIO(DUMP.encode("utf-8")))
+        ]
+        for name, opener in (("dump.xml.bz2", bz2.BZ2File), ("dump.xml.gz", gzip.open)):
+            path = self.write_dump(name, opener)
+            self.assertEqual(list(iter_dump(path)), expected)
+            self.assertEqual(list(iter_dump(path, processes=2, chunksize=1)), expected)
+        self.assertEqual(expected[0][1][0][-1], u".")
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+import os
+import unittest
+from ciseau import (
+    to_raw_text,
+    to_raw_text_markupless,
+    to_raw_text_pairings,
+    to_raw_text_spans,
+    to_raw_text_markupless_spans
+)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def load_golden_article():
+    with io.open(os.path.join(DATA_DIR, "wiki_article.txt"), encoding="utf-8") as fin:
+        text = fin.read()
+    with io.open(os.path.join(DATA_DIR, "wiki_article_expected.json"), encoding="utf-8") as fin:
+        expected = json.load(fin)
+    return text, expected
+
+
+class WikiMarkupTests(unittest.TestCase):
+    def test_golden_article(self):
+        text, expected = load_golden_article()
+        self.assertEqual(
+            to_raw_text(text, keep_whitespace=True),
+            expected["to_raw_text"]
+        )
+        self.assertEqual(
+            to_raw_text_markupless(text, keep_whitespace=True),
+            expected["to_raw_text_markupless"]
+        )
+        self.assertEqual(
+            list(to_raw_text_pairings(text, keep_whitespace=True)),
+            expected["to_raw_text_pairings"]
+        )
+
+    def test_to_raw_text_spans(self):
+        text = (
+            u"'''Paris''' is the [[capital city|capital]] of [[France]] "
+            u"since 1999-01-02<ref>{{cite}}</ref>. See [http://x.org the site]."
+        )
+        sentences = to_raw_text_spans(text)
+        self.assertEqual(
+            [[word for word, _, _ in sentence] for sentence in sentences],
+            to_raw_text(text)
+        )
+        self.assertEqual(
+            [text[start:end] for _, start, end in sentences[0]],
+            [u"Paris", u"is", u"the", u"capital", u"of", u"France",
+             u"since", u"1999-01-02", u"."]
+        )
+        self.assertEqual(
+            [(word, text[start:end]) for word, start, end in sentences[1]][2],
+            (u"url", u"http://x.org")
+        )
+
+    def test_to_raw_text_markupless_spans(self):
+        text = u"Born in 2005, see http://a.com/x for more."
+        self.assertEqual(
+            [(word, text[start:end]) for word, start, end in to_raw_text_markupless_spans(text)[0]][2:6],
+            [(u"7777", u"2005"), (u",", u","), (u"see", u"see"), (u"url", u"http://a.com/x")]
+        )
+
+    def test_unclosed_markup(self):
+        # markup that is never closed is left as-is:
+        text = u"a > b >> c > > d {{open [[x|  [http://y.org <sub z"
+        self.assertEqual(
+            to_raw_text(text, keep_whitespace=True),
+            [[u"a ", u"&", u"gt", u"; ", u"b ", u"&", u"gt", u";", u"> ", u"c ",
+              u"&", u"gt", u"; ", u"> ", u"d ", u"{", u"{", u"open  ", u"x", u"|  ",
+              u"[", u"url ", u"<", u"sub ", u"z"]]
+        )
+        self.assertEqual(
+            to_raw_text(u"[[a|b]] {{c}} [[d]] <e> f", keep_whitespace=True),
+            [[u"b   ", u"d   ", u"f"]]
+        )
+        text = u"See [[Category:Capitals]] and 1 > 2."
+        self.assertEqual(
+            [(word, text[start:end]) for sentence in to_raw_text_spans(text)
+             for word, start, end in sentence],
+            [(u"See", u"See"), (u"Capitals", u"Capitals"), (u".", u"]]"), (u"and", u"and"),
+             (u"1", u"1"), (u"&", u">"), (u"gt", u">"), (u";", u">"), (u"2", u"2"), (u".", u".")]
+        )